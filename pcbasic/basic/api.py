@@ -101,12 +101,35 @@ class Session(object):
         name = name.upper()
         self._impl.set_variable(name, value)
 
-    def get_variable(self, name):
-        """Get a variable in memory."""
+    def get_variable(self, name, as_numpy=False):
+        """Get a variable in memory; optionally, get arrays as NumPy arrays."""
         self.start()
         if isinstance(name, unicode):
             name = name.encode('ascii')
-        return self._impl.get_variable(name)
+        return self._impl.get_variable(name, as_numpy)
+
+    def get_text_screen(self, as_numpy=False):
+        """Get rows of characters and attributes on the visible page; optionally, as NumPy arrays."""
+        self.start()
+        return self._impl.get_text_screen(as_numpy)
+
+    def get_points(self, xs, ys, as_numpy=False):
+        """Get the attributes at logical coordinates, as POINT does; optionally, as a NumPy array.
+
+        Off-screen points are -1. Raises BASICError in text mode and for out-of-range coordinates.
+        """
+        self.start()
+        return self._impl.get_points(xs, ys, as_numpy)
+
+    def iter_output(self):
+        """Iterate over chunks of console output captured since the last call."""
+        self.start()
+        return self._impl.io_streams.read_captured()
+
+    def capture_frame(self, filename=None):
+        """Have the interface write the visible screen to an image file."""
+        self.start()
+        self._impl.display.capture_frame(filename)
 
     def interact(self):
         """Interactive interpreter session."""
@@ -67,6 +67,14 @@ VIDEO_COPY_PAGE = 28
 VIDEO_SET_CAPTION = 29
 # clipboard copy reply
 VIDEO_SET_CLIPBOARD_TEXT = 30
+# share pixel buffer with interface
+VIDEO_SET_FRAMEBUFFER = 31
+# shared pixel buffer has changed
+VIDEO_UPDATE_RECT = 32
+# write visible screen to an image file
+VIDEO_CAPTURE_FRAME = 33
+# put a run of halfwidth character glyphs in one attribute
+VIDEO_PUT_TEXT = 34
 
 # input queue signals
 # quit interpreter
@@ -103,6 +103,30 @@ class Device(object):
         return True
 
 
+class NoTapeDevice(Device):
+    """Cassette device (CASn:) without a tape attached."""
+
+    def __init__(self):
+        """Set up device."""
+        Device.__init__(self)
+        # WIDTH and LOC on CAS1: directly are ignored
+        self.device_file = DeviceSettings()
+
+    def open(
+            self, number, param, filetype, mode, access, lock,
+            reclen, seg, offset, length, field
+        ):
+        """Open a file on the device."""
+        raise error.BASICError(error.DEVICE_UNAVAILABLE)
+
+    def available(self):
+        """Device is available."""
+        return False
+
+    def quiet(self, is_quiet):
+        """Suppress Skipped and Found messages."""
+
+
 class SCRNDevice(Device):
     """Screen device (SCRN:) """
 
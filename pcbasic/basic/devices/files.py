@@ -17,7 +17,6 @@ from ..base import tokens as tk
 from .. import values
 from . import formatter
 from . import devicebase
-from . import cassette
 from . import disk
 from . import ports
 from . import parports
@@ -138,7 +137,7 @@ class Files(object):
             # KYBD: device needs display as it can set the screen width
             b'KYBD:': devicebase.KYBDDevice(keyboard, display),
             # cassette: needs text screen to display Found and Skipped messages
-            b'CAS1:': cassette.CASDevice(device_params.get(b'CAS1:', None), self._screen),
+            b'CAS1:': self._init_cassette(device_params.get(b'CAS1:', None)),
             # serial devices
             b'COM1:': ports.COMDevice(device_params.get(b'COM1:', None), queues, serial_in_size),
             b'COM2:': ports.COMDevice(device_params.get(b'COM2:', None), queues, serial_in_size),
@@ -156,6 +155,13 @@ class Files(object):
         # disks
         self._init_disk_devices(mount_dict, current_device, codepage, utf8, universal)
 
+    def _init_cassette(self, arg):
+        """Initialise cassette device; only load cassette support if a tape is attached."""
+        if not arg:
+            return devicebase.NoTapeDevice()
+        from . import cassette
+        return cassette.CASDevice(arg, self._screen)
+
     def close_devices(self):
         """Close device master files."""
         for d in self._devices.values():
@@ -11,11 +11,6 @@ import sys
 import os
 import io
 
-try:
-    import parallel
-except Exception:
-    parallel = None
-
 from ...compat import line_print
 from ..base import error
 from ..codepage import CONTROL
@@ -219,7 +214,10 @@ class ParallelStream(object):
 
     def __init__(self, port):
         """Initialise the ParallelStream."""
-        if not parallel:
+        # only import PyParallel when a physical port is attached
+        try:
+            import parallel
+        except Exception:
             raise IOError('`parallel` module not found. Parallel port communication not available.')
         try:
             self._parallel = parallel.Parallel(port)
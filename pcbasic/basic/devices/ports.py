@@ -16,17 +16,6 @@ from contextlib import contextmanager
 from ...compat import key_pressed
 from .devicebase import safe_io
 
-try:
-    import serial
-    # use the old VERSION constant as __version__ not defined in v2
-    if serial.VERSION < '3':
-        raise ImportError('PySerial version %s found but >= 3.0.0 required.' % serial.VERSION)
-    from serial import serialutil
-    logging_msg = ''
-except Exception as e:
-    serial = None
-    logging_msg = str(e)
-
 from ..base import error
 from .. import values
 from .devicebase import Device, DeviceSettings, TextFileBase, RealTimeInputMixin
@@ -36,6 +25,15 @@ from .devicebase import parse_protocol_string
 ###############################################################################
 # COM ports
 
+def _import_serial():
+    """Import PySerial; this is done on first use as it is slow to load."""
+    import serial
+    # use the old VERSION constant as __version__ not defined in v2
+    if serial.VERSION < '3':
+        raise ImportError('PySerial version %s found but >= 3.0.0 required.' % serial.VERSION)
+    return serial
+
+
 class COMDevice(Device):
     """Serial port device (COMn:)."""
 
@@ -170,10 +168,12 @@ class COMDevice(Device):
             elif addr == u'STDIO' or (not addr and val.upper() == u'STDIO'):
                 return SerialStdIO(val.upper() == u'CRLF')
             else:
-                if not serial:
+                try:
+                    serial = _import_serial()
+                except Exception as e:
                     logging.warning(
                         u'Could not attach %s to COM device. Module `serial` not available: %s',
-                        spec, logging_msg
+                        spec, e
                     )
                     return None
                 if addr in (u'SOCKET', u'RFC2217'):
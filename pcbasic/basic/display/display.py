@@ -43,12 +43,13 @@ class Palette(object):
         mode = self.mode
         if check_mode and not self.mode_allows_palette(mode):
             return
+        if self.palette[index] == colour:
+            return
         self.palette[index] = colour
         self.rgb_palette[index] = mode.colours[colour]
         if mode.colours1:
             self.rgb_palette1[index] = mode.colours1[colour]
-        self._queues.video.put(
-            signals.Event(signals.VIDEO_SET_PALETTE, (self.rgb_palette, self.rgb_palette1)))
+        self._send()
 
     def get_entry(self, index):
         """Retrieve the colour for a given attribute."""
@@ -64,8 +65,13 @@ class Palette(object):
             self.rgb_palette1 = [self.mode.colours1[i] for i in self.palette]
         else:
             self.rgb_palette1 = None
-        self._queues.video.put(
-            signals.Event(signals.VIDEO_SET_PALETTE, (self.rgb_palette, self.rgb_palette1)))
+        self._send()
+
+    def _send(self):
+        """Send a snapshot of the palette to the interface; the video queue keeps the latest."""
+        self._queues.video.put(signals.Event(signals.VIDEO_SET_PALETTE, (
+            list(self.rgb_palette), self.rgb_palette1 and list(self.rgb_palette1)
+        )))
 
     def mode_allows_palette(self, mode):
         """Check if the video mode allows palette change."""
@@ -157,9 +163,18 @@ class Display(object):
         self.drawing = graphics.Drawing(self.queues, input_methods, self._values, self._memory)
         # colour palette
         self.palette = Palette(self.queues, self.mode, self.capabilities, self._memory)
+        # pixel buffers by dimensions, number of pages and colour depth, reused on mode switches
+        self._pixel_buffers = {}
         # initialise a fresh textmode screen
         self._set_mode(self.mode, 0, 1, 0, 0)
 
+    def __getstate__(self):
+        """Pickle."""
+        pickle_dict = self.__dict__.copy()
+        # only the current buffer needs to be kept
+        pickle_dict['_pixel_buffers'] = {}
+        return pickle_dict
+
     ###########################################################################
     # video modes
 
@@ -244,14 +259,20 @@ class Display(object):
         self.palette.init_mode(self.mode)
         # set the colorswitch
         self._init_mode_colorburst(new_colorswitch)
-        # initialise pixel buffers
+        # initialise pixel buffers, or clear those of a mode with the same shape
         if not self.mode.is_text_mode:
-            self.pixels = PixelBuffer(
+            key = (
                 self.mode.pixel_width, self.mode.pixel_height,
                 self.mode.num_pages, self.mode.bitsperpixel
             )
+            try:
+                self.pixels = self._pixel_buffers[key]
+                self.pixels.clear()
+            except KeyError:
+                self.pixels = self._pixel_buffers[key] = PixelBuffer(*key)
         else:
             self.pixels = None
+        self.queues.set_pixels(self.pixels)
         # set active page & visible page, counting from 0.
         self.set_page(new_vpagenum, new_apagenum)
         # initialise text screen
@@ -351,6 +372,7 @@ class Display(object):
         """Completely resubmit the screen to the interface."""
         # set the screen mode
         self.queues.video.put(signals.Event(signals.VIDEO_SET_MODE, (self.mode,)))
+        self.queues.set_pixels(self.pixels)
         # set the visible and active pages
         self.queues.video.put(signals.Event(signals.VIDEO_SET_PAGE, (self.vpagenum, self.apagenum)))
         # rebuild palette
@@ -392,6 +414,10 @@ class Display(object):
         fore, _, _, _ = self.mode.split_attr(attr)
         self.queues.video.put(signals.Event(signals.VIDEO_SET_BORDER_ATTR, (fore,)))
 
+    def capture_frame(self, filename=None):
+        """Ask the interface to write the visible screen to an image file."""
+        self.queues.video.put(signals.Event(signals.VIDEO_CAPTURE_FRAME, (filename,)))
+
     ###########################################################################
     # memory operations
 
@@ -463,9 +489,15 @@ class Display(object):
         list(args)
         error.range_check(0, self.mode.num_pages-1, dst)
         self.text_screen.text.copy_page(src, dst)
-        if not self.mode.is_text_mode:
-            self.pixels.copy_page(src, dst)
         self.queues.video.put(signals.Event(signals.VIDEO_COPY_PAGE, (src, dst)))
+        if not self.mode.is_text_mode:
+            # only the changed area is copied; interfaces get it as pixels, not as a page copy
+            rect = self.pixels.copy_page(src, dst)
+            if rect:
+                x0, y0, x1, y1 = rect
+                self.queues.video.put(signals.Event(signals.VIDEO_PUT_RECT, (
+                    dst, x0, y0, x1, y1, self.pixels.pages[dst].get_rect(x0, y0, x1, y1)
+                )))
 
     def color_(self, args):
         """COLOR: set colour attributes."""
@@ -108,12 +108,19 @@ DEFAULT_FONT = {
 class Font(object):
     """Single-height bitfont."""
 
+    # maximum number of rasterised glyphs to keep
+    max_glyphs = 2048
+
     def __init__(self, height=8, fontdict=None):
         """Initialise the font."""
         self._height = height
         if height == 8 and not fontdict:
-            fontdict = DEFAULT_FONT
+            # copy as the RAM font may be changed
+            fontdict = dict(DEFAULT_FONT)
         self._fontdict = fontdict
+        # packed glyphs by (char, height, width)
+        # fullwidth chars are two bytes long and twice as wide
+        self._glyphs = LRUCache(self.max_glyphs)
 
     def get_byte(self, charvalue, offset):
         """Get byte sequency for character."""
@@ -121,11 +128,28 @@ class Font(object):
 
     def set_byte(self, charvalue, offset, byte):
         """Set byte sequency for character."""
-        old = self._fontdict[int2byte(charvalue)]
-        self._fontdict[int2byte(charvalue)] = old[:offset%8] + byte + old[offset%8+1:]
-        #self.screen.rebuild_glyph(charvalue)
+        char = int2byte(charvalue)
+        old = self._fontdict[char]
+        self._fontdict[char] = old[:offset%8] + int2byte(byte) + old[offset%8+1:]
+        # drop glyphs rasterised from the old face
+        for key in [_key for _key in self._glyphs if _key[0] == char]:
+            self._glyphs.pop(key)
+
+    def get_cached_glyphs(self):
+        """Packed glyphs currently kept."""
+        return [_packed for _, _packed in self._glyphs.iteritems()]
 
     def build_glyph(self, c, req_width, req_height):
+        """Get a glyph for the given codepage character, rasterising it if needed."""
+        key = c, req_height, req_width
+        try:
+            packed = self._glyphs[key]
+        except KeyError:
+            packed = _pack_mask(self._rasterise(c, req_width, req_height))
+            self._glyphs.put(key, packed)
+        return _unpack_mask(packed, req_height, req_width)
+
+    def _rasterise(self, c, req_width, req_height):
         """Build a glyph for the given codepage character."""
         try:
             face = bytearray(self._fontdict[c])
@@ -217,78 +241,187 @@ else:
         return glyph
 
 
+if numpy:
+
+    def _pack_mask(glyph):
+        """Pack a glyph mask into bytes, eight pixels to a byte."""
+        return numpy.packbits(glyph, axis=1).tobytes()
+
+    def _unpack_mask(packed, height, width):
+        """Unpack a glyph mask."""
+        rows = numpy.frombuffer(packed, dtype=numpy.uint8).reshape(height, -1)
+        return numpy.unpackbits(rows, axis=1)[:, :width].astype(bool)
+
+else:
+
+    def _pack_mask(glyph):
+        """Keep a glyph mask as it is."""
+        return glyph
+
+    def _unpack_mask(packed, height, width):
+        """Copy a glyph mask."""
+        return [_row[:] for _row in packed]
+
+
 #######################################################################################
 # glyph cache
 
+class LRUCache(object):
+    """Bounded cache that lets go of its least recently used entries when full."""
+
+    def __init__(self, max_size):
+        """Set up an empty cache."""
+        self._max_size = max_size
+        # entries as [value, time of last use]
+        self._entries = {}
+        self._clock = 0
+
+    def __len__(self):
+        """Number of entries."""
+        return len(self._entries)
+
+    def __iter__(self):
+        """Iterate over keys."""
+        return iter(self._entries)
+
+    def iteritems(self):
+        """Iterate over keys and values."""
+        return ((_key, _entry[0]) for _key, _entry in self._entries.iteritems())
+
+    def __getitem__(self, key):
+        """Retrieve an entry and mark it as used."""
+        entry = self._entries[key]
+        self._clock += 1
+        entry[1] = self._clock
+        return entry[0]
+
+    def put(self, key, value):
+        """Store an entry; return the keys let go of to make room."""
+        dropped = []
+        if key not in self._entries and len(self._entries) >= self._max_size:
+            # let go of the least recently used quarter at once, so that this is rare
+            by_use = sorted(self._entries, key=lambda _key: self._entries[_key][1])
+            dropped = by_use[:max(1, self._max_size // 4)]
+            for old_key in dropped:
+                del self._entries[old_key]
+        self._clock += 1
+        self._entries[key] = [value, self._clock]
+        return dropped
+
+    def pop(self, key, default=None):
+        """Remove an entry and return its value."""
+        entry = self._entries.pop(key, None)
+        return default if entry is None else entry[0]
+
+
 class GlyphCache(object):
+    """Glyphs for the current mode, built on first use."""
+
+    # maximum number of glyphs to keep in the interface for text modes
+    max_glyphs = 1024
+    # maximum number of coloured glyphs to keep for graphics modes
+    max_sprites = 4096
 
     def __init__(self, mode, fonts, codepage, queues):
         """Initialise glyph set."""
         self._queues = queues
-        self._mode = mode
+        self._mode = None
+        self.init_mode(mode)
         self._fonts = fonts
         self._codepage = codepage
-        # preload SBCS glyphs
-        self._glyphs = {
-            c: self._fonts[mode.font_height].build_glyph(c, mode.font_width, mode.font_height)
-            for c in map(int2byte, range(256))
-        }
-        self.submit()
+        # chars with glyphs held by the interface, by unicode
+        self._submitted = LRUCache(self.max_glyphs)
+        # coloured glyphs for graphics modes, by char, foreground and background attribute
+        self._sprites = {}
+
+    def init_mode(self, mode):
+        """Use the glyphs for a new mode with the same font size."""
+        self._mode = mode
+
+    def _build(self, char):
+        """Get the glyph mask for a character in the current mode."""
+        # fullwidth glyphs are double the width of halfwidth ones
+        return self._fonts[self._mode.font_height].build_glyph(
+            char, self._mode.font_width*len(char), self._mode.font_height
+        )
 
     def submit(self):
         """Send glyph dict to interface."""
         if self._mode.is_text_mode:
-            # send glyphs to signals; copy is necessary
-            # as dict may change here while the other thread is working on it
             self._queues.video.put(signals.Event(
                 signals.VIDEO_BUILD_GLYPHS, (
-                    {self._codepage.to_unicode(k, u'\0'): v for k, v in self._glyphs.iteritems()},
+                    {_uc: self._build(_char) for _uc, _char in self._submitted.iteritems()},
                 )
             ))
 
+    def drop_glyph(self, ordval):
+        """Forget a character after POKE; the interface keeps its glyph until it is resent."""
+        char = int2byte(ordval)
+        for key in [_key for _key in self._sprites if _key[0] == char]:
+            del self._sprites[key]
+        self._submitted.pop(self._codepage.to_unicode(char, u'\0'), None)
+
     def rebuild_glyph(self, ordval):
-        """Rebuild a text-mode character after POKE."""
-        if self._mode.is_text_mode:
-            # force rebuilding the character by deleting and requesting
-            del self._glyphs[int2byte(ordval)]
-            self._submit_char(int2byte(ordval))
-
-    def _submit_char(self, char):
-        """Rebuild glyph and send to interface."""
-        mask = self._fonts[self._mode.font_height].build_glyph(
-            char, self._mode.font_width*2, self._mode.font_height
-        )
-        self._glyphs[char] = mask
-        if self._mode.is_text_mode:
-            self._queues.video.put(signals.Event(
-                signals.VIDEO_BUILD_GLYPHS, ({self._codepage.to_unicode(char, u'\0'): mask},)
-            ))
+        """Rebuild a character after POKE."""
+        # force rebuilding the character by deleting and requesting
+        self.drop_glyph(ordval)
+        self.check_chars((int2byte(ordval),))
 
-    def check_char(self, char):
-        """Submit glyph if needed."""
-        if self._mode.is_text_mode and char not in self._glyphs:
-            self._submit_char(char)
+    def check_chars(self, chars):
+        """Submit any glyphs not held by the interface, letting go of the least recently used."""
+        if not self._mode.is_text_mode:
+            return
+        new_glyphs = {}
+        for char in chars:
+            uc = self._codepage.to_unicode(char, u'\0')
+            try:
+                self._submitted[uc]
+            except KeyError:
+                for dropped in self._submitted.put(uc, char):
+                    new_glyphs[dropped] = None
+                new_glyphs[uc] = self._build(char)
+        if new_glyphs:
+            self._queues.video.put(signals.Event(signals.VIDEO_BUILD_GLYPHS, (new_glyphs,)))
+
+    def _get_coloured(self, char, fore, back):
+        """Return the glyph for a character in given colours, building it if needed."""
+        try:
+            return self._sprites[char, fore, back]
+        except KeyError:
+            pass
+        if len(self._sprites) >= self.max_sprites:
+            self._sprites.clear()
+        sprite = self._sprites[char, fore, back] = self._colour(self._build(char), fore, back)
+        return sprite
 
     if numpy:
-        def get_sprite(self, row, col, char, fore, back):
-            """Return a sprite for a given character."""
-            if char not in self._glyphs:
-                self._submit_char(char)
-            mask = self._glyphs[char]
+        def _colour(self, mask, fore, back):
+            """Apply colours to a glyph mask."""
             # set background
             glyph = numpy.full(mask.shape, back, dtype=int)
             # stamp foreground mask
             glyph[mask] = fore
+            return glyph
+
+        def get_row_sprite(self, row, col, cells):
+            """Return a sprite for a row span of (char, fore, back) cells."""
+            glyphs = [self._get_coloured(*_cell) for _cell in cells]
+            sprite = numpy.hstack(glyphs) if len(glyphs) > 1 else glyphs[0]
             x0, y0 = (col-1) * self._mode.font_width, (row-1) * self._mode.font_height
-            x1, y1 = x0 + mask.shape[1] - 1, y0 + mask.shape[0] - 1
-            return x0, y0, x1, y1, glyph
+            x1, y1 = x0 + sprite.shape[1] - 1, y0 + sprite.shape[0] - 1
+            return x0, y0, x1, y1, sprite
     else:
-        def get_sprite(self, row, col, char, fore, back):
-            """Return a sprite for a given character."""
-            if char not in self._glyphs:
-                self._submit_char(char)
-            mask = self._glyphs[char]
-            glyph = [[(fore if bit else back) for bit in row] for row in mask]
+        def _colour(self, mask, fore, back):
+            """Apply colours to a glyph mask."""
+            return [[(fore if bit else back) for bit in row] for row in mask]
+
+        def get_row_sprite(self, row, col, cells):
+            """Return a sprite for a row span of (char, fore, back) cells."""
+            glyphs = [self._get_coloured(*_cell) for _cell in cells]
+            sprite = [
+                [_c for _glyph in glyphs for _c in _glyph[_y]]
+                for _y in range(len(glyphs[0]))
+            ]
             x0, y0 = (col-1) * self._mode.font_width, (row-1) * self._mode.font_height
-            x1, y1 = x0 + len(mask[0]) - 1, y0 + len(mask) - 1
-            return x0, y0, x1, y1, glyph
+            x1, y1 = x0 + len(sprite[0]) - 1, y0 + len(sprite) - 1
+            return x0, y0, x1, y1, sprite
@@ -0,0 +1,317 @@
+"""
+PC-BASIC - gml.py
+Graphics Macro Language compiler
+
+(c) 2013--2018 Rob Hagemans
+This file is released under the GNU GPL version 3 or later.
+"""
+
+import math
+
+from ..base import error
+from .. import mlparser
+
+
+# GML operations; numbers in operations are either int constants or Reference objects
+# set foreground colour: (COLOUR, attr)
+COLOUR = 0
+# set scale: (SCALE, scale)
+SCALE = 1
+# set angle: (ANGLE, angle, lower, upper, degrees per unit)
+ANGLE = 2
+# one-variable movement: (STEP, x factor, y factor, step, plot, goback)
+STEP = 3
+# two-variable relative movement: (STEP_XY, x, y, plot, goback)
+STEP_XY = 4
+# two-variable absolute movement: (MOVE, x, y, plot, goback)
+MOVE = 5
+# flood fill: (PAINT, colour, border)
+PAINT = 6
+# execute substring: (EXECUTE, reference)
+EXECUTE = 7
+# evaluate and range-check numbers, then raise Illegal function call: (ERROR, checks)
+ERROR = 8
+# run of movements with constant offsets: (POLYLINE, segments)
+# segments are (x, y, relative, plot, goback)
+POLYLINE = 9
+
+# range of movement arguments
+STEP_RANGE = (-99999, 99999)
+MOVE_RANGE = (-9999, 9999)
+
+# one-variable movement commands and their directions
+DIRECTIONS = {
+    b'U': (0, -1), b'D': (0, 1), b'L': (-1, 0), b'R': (1, 0),
+    b'E': (1, -1), b'F': (1, 1), b'G': (-1, 1), b'H': (-1, -1),
+}
+
+
+class Reference(object):
+    """Variable or VARPTR$ reference in a macro-language string, evaluated on execution."""
+
+    def __init__(self, name=None, indices=None, varptr=None, sign=1):
+        """Initialise reference."""
+        self.name = name
+        self.indices = indices
+        self.varptr = varptr
+        self.sign = sign
+
+    def negate(self):
+        """Return the negated reference."""
+        return Reference(self.name, self.indices, self.varptr, -self.sign)
+
+    def get_value(self, memory):
+        """Retrieve the referenced value."""
+        if self.varptr is not None:
+            return memory.get_value_for_varptrstr(self.varptr)
+        indices = [get_number(_index, memory) for _index in self.indices]
+        return memory.view_or_create_variable(self.name, indices)
+
+
+def get_number(number, memory):
+    """Evaluate a compiled number."""
+    if isinstance(number, Reference):
+        return number.sign * number.get_value(memory).to_int()
+    return number
+
+
+class GMLCompiler(mlparser.MLParser):
+    """Compiler from Graphics Macro Language strings to lists of operations."""
+
+    def __init__(self, gml):
+        """Initialise compiler."""
+        mlparser.MLParser.__init__(self, gml, None, None)
+        # numbers parsed so far in the current command, with their ranges
+        self._checks = []
+
+    def compile(self):
+        """Compile the string; syntax errors become an ERROR operation at the end."""
+        ops = []
+        plot, goback = True, False
+        try:
+            while True:
+                self._checks = []
+                c = self.skip_blank_read().upper()
+                if c == b'':
+                    break
+                elif c == b';':
+                    continue
+                elif c == b'B':
+                    # do not draw
+                    plot = False
+                elif c == b'N':
+                    # return to postiton after move
+                    goback = True
+                elif c == b'X':
+                    # execute substring
+                    ops.append((EXECUTE, self.parse_string()))
+                elif c == b'C':
+                    # set foreground colour
+                    # allow empty spec (default 0), but only if followed by a semicolon
+                    if self.skip_blank() == b';':
+                        ops.append((COLOUR, 0))
+                    else:
+                        # 100000 seems to be GW's limit
+                        ops.append((COLOUR, self.parse_number_checked(-99999, 99999)))
+                elif c == b'S':
+                    # set scale
+                    ops.append((SCALE, self.parse_number_checked(1, 255)))
+                elif c == b'A':
+                    # set angle
+                    # allow empty spec (default 0), but only if followed by a semicolon
+                    if self.skip_blank() == b';':
+                        ops.append((ANGLE, 0, 0, 3, 90))
+                    else:
+                        ops.append((ANGLE, self.parse_number_checked(0, 3), 0, 3, 90))
+                elif c == b'T':
+                    # 'turn angle' - set (don't turn) the angle to any value
+                    if self.read(1).upper() != b'A':
+                        raise error.BASICError(error.IFC)
+                    # allow empty spec (default 0), but only if followed by a semicolon
+                    if self.skip_blank() == b';':
+                        ops.append((ANGLE, 0, -360, 360, 1))
+                    else:
+                        ops.append((ANGLE, self.parse_number_checked(-360, 360), -360, 360, 1))
+                # one-variable movement commands:
+                elif c in DIRECTIONS:
+                    xfac, yfac = DIRECTIONS[c]
+                    step = self.parse_number_checked(*STEP_RANGE, default=1)
+                    ops.append((STEP, xfac, yfac, step, plot, goback))
+                    plot = True
+                    goback = False
+                # two-variable movement command
+                elif c == b'M':
+                    relative = self.skip_blank() in (b'+', b'-')
+                    x = self.parse_number_checked(*MOVE_RANGE)
+                    if self.skip_blank() != b',':
+                        raise error.BASICError(error.IFC)
+                    else:
+                        self.read(1)
+                    y = self.parse_number_checked(*MOVE_RANGE)
+                    ops.append((STEP_XY if relative else MOVE, x, y, plot, goback))
+                    plot = True
+                    goback = False
+                elif c == b'P':
+                    # paint - flood fill
+                    colour = self.parse_number_checked(0, 9999)
+                    if self.skip_blank_read() != b',':
+                        raise error.BASICError(error.IFC)
+                    bound = self.parse_number_checked(0, 9999)
+                    ops.append((PAINT, colour, bound))
+                else:
+                    raise error.BASICError(error.IFC)
+        except error.BASICError:
+            # numbers parsed before the error are still evaluated when the error is raised
+            ops.append((ERROR, self._checks))
+        return ops
+
+    def parse_number_checked(self, lower, upper, default=None):
+        """Parse a number to be range-checked on execution."""
+        number = self.parse_number(default)
+        self._checks[-1] = number, lower, upper
+        return number
+
+    def parse_number(self, default=None):
+        """Parse a constant or a reference in a macro-language string."""
+        c = self.skip_blank()
+        negative = c == b'-'
+        if c in (b'+', b'-'):
+            self.read(1)
+            c = self.peek()
+            # don't allow default if sign is given
+            default = None
+        if c == b'=':
+            self.read(1)
+            c = self.peek()
+            if len(c) == 0:
+                raise error.BASICError(error.IFC)
+            elif ord(c) > 8:
+                step = self._parse_variable()
+                if negative:
+                    step = step.negate()
+                # the variable is evaluated even if the semicolon is missing
+                self._checks.append((step, None, None))
+                self.require_read((b';',), err=error.IFC)
+                return step
+            else:
+                # varptr$
+                step = Reference(varptr=self.read(3))
+        elif c and c in mlparser.DIGITS:
+            step = self._parse_const()
+        elif default is not None:
+            step = default
+        else:
+            raise error.BASICError(error.IFC)
+        if negative:
+            step = step.negate() if isinstance(step, Reference) else -step
+        self._checks.append((step, None, None))
+        return step
+
+    def parse_string(self):
+        """Parse a string reference in a macro-language string."""
+        c = self.skip_blank()
+        if len(c) == 0:
+            raise error.BASICError(error.IFC)
+        elif ord(c) > 8:
+            sub = self._parse_variable()
+            self.require_read((b';',), err=error.IFC)
+            return sub
+        else:
+            # varptr$
+            return Reference(varptr=self.read(3))
+
+    def _parse_variable(self):
+        """Parse a reference to a named variable."""
+        name = self.read_name()
+        error.throw_if(not name)
+        return Reference(name, self._parse_indices())
+
+    def _parse_indices(self):
+        """Parse constant or variable array indices."""
+        indices = []
+        if self.skip_blank_read_if((b'[', b'(')):
+            while True:
+                if self.skip_blank() in set(mlparser.DIGITS):
+                    indices.append(self._parse_const())
+                else:
+                    indices.append(self._parse_variable())
+                if not self.skip_blank_read_if((b',',)):
+                    break
+            self.require_read((b']', b')'))
+        return indices
+
+
+def compile_gml(gml):
+    """Compile a Graphics Macro Language string to a list of operations."""
+    return GMLCompiler(gml).compile()
+
+
+def get_step(sx, sy, scale, rotate, aspect):
+    """Offset of a relative DRAW movement at given scale, angle and pixel aspect."""
+    yfac = aspect[1] / (1.*aspect[0])
+    x1 = (scale*sx) // 4
+    y1 = (scale*sy) // 4
+    if rotate == 0 or rotate == 360:
+        pass
+    elif rotate == 90:
+        x1, y1 = int(y1*yfac), -int(x1//yfac)
+    elif rotate == 180:
+        x1, y1 = -x1, -y1
+    elif rotate == 270:
+        x1, y1 = -int(y1*yfac), int(x1//yfac)
+    else:
+        fx, fy = float(x1), float(y1)
+        # degrees to radians
+        phi = rotate * math.pi / 180.
+        sinr, cosr = math.sin(phi), math.cos(phi)
+        fxfac = float(aspect[0]) / float(aspect[1])
+        fx = cosr*fx + (sinr*fy) / fxfac
+        fy = (cosr*fy) * fxfac - sinr*fx
+        x1, y1 = int(round(fx)), int(round(fy))
+    return x1, y1
+
+
+def resolve(ops, scale, rotate, aspect):
+    """Merge runs of constant movements into polylines, given the scale and angle at the start."""
+    resolved, segments = [], []
+    for op in ops:
+        segment = None
+        if op[0] == MOVE:
+            _, x, y, plot, goback = op
+            if _is_constant(x, *MOVE_RANGE) and _is_constant(y, *MOVE_RANGE):
+                segment = x, y, False, plot, goback
+        elif scale is not None and rotate is not None:
+            if op[0] == STEP:
+                _, xfac, yfac, step, plot, goback = op
+                if _is_constant(step, *STEP_RANGE):
+                    x, y = get_step(xfac*step, yfac*step, scale, rotate, aspect)
+                    segment = x, y, True, plot, goback
+            elif op[0] == STEP_XY:
+                _, x, y, plot, goback = op
+                if _is_constant(x, *MOVE_RANGE) and _is_constant(y, *MOVE_RANGE):
+                    x, y = get_step(x, y, scale, rotate, aspect)
+                    segment = x, y, True, plot, goback
+        if segment:
+            segments.append(segment)
+            continue
+        if segments:
+            resolved.append((POLYLINE, segments))
+            segments = []
+        resolved.append(op)
+        # keep track of scale and angle while they are known
+        if op[0] == SCALE:
+            scale = op[1] if _is_constant(op[1], 1, 255) else None
+        elif op[0] == ANGLE:
+            _, angle, lower, upper, factor = op
+            rotate = angle * factor if _is_constant(angle, lower, upper) else None
+        elif op[0] == EXECUTE:
+            # substrings may change scale and angle
+            scale, rotate = None, None
+    if segments:
+        resolved.append((POLYLINE, segments))
+    return resolved
+
+
+def _is_constant(number, lower, upper):
+    """Number is a constant in range."""
+    return not isinstance(number, Reference) and lower <= number <= upper
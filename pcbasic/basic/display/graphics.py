@@ -17,7 +17,12 @@ from ..base import error
 from ..base import tokens as tk
 from ..base import signals
 from .. import values
-from .. import mlparser
+from . import gml as gml_compiler
+
+
+# largest and smallest magnitudes of a single-precision MBF number
+_SINGLE_MAX = (2**24 - 1) * 2.**103
+_SINGLE_MIN = 2.**-128
 
 
 class GraphicsViewPort(object):
@@ -32,6 +37,8 @@ class GraphicsViewPort(object):
         """Unset the graphics viewport."""
         self.absolute = False
         self.rect = None
+        # offset from viewport to absolute coordinates
+        self.offset = 0, 0
 
     def set(self, x0, y0, x1, y1, absolute):
         """Set the graphics viewport."""
@@ -40,6 +47,7 @@ class GraphicsViewPort(object):
         y0, y1 = min(y0, y1), max(y0, y1)
         self.absolute = absolute
         self.rect = x0, y0, x1, y1
+        self.offset = (0, 0) if absolute else (x0, y0)
 
     def is_set(self):
         """Return whether the graphics viewport is set."""
@@ -95,15 +103,15 @@ class GraphicsViewPort(object):
 
     def coords(self, x, y):
         """Retrieve absolute coordinates for viewport coordinates."""
-        if (not self.rect) or self.absolute:
-            return x, y
-        else:
-            return x + self.rect[0], y + self.rect[1]
+        return x + self.offset[0], y + self.offset[1]
 
 
 class Drawing(object):
     """Graphical drawing operations."""
 
+    # maximum number of compiled DRAW strings to keep
+    max_gml_cache = 256
+
     def __init__(self, queues, input_methods, values, memory):
         """Initialise graphics object."""
         # for apagenum and attr
@@ -117,15 +125,22 @@ class Drawing(object):
         self._text = None
         self._pixels = None
         self.graph_view = None
+        # logical to absolute physical coordinates: scale, offset and viewport offset
+        self._transform = None
         self._apagenum = None
         self.last_point = None
         self.last_attr = None
         self.draw_scale = None
         self.draw_angle = None
+        # compiled DRAW strings, by string; and with known offsets, by string, scale and angle
+        self._gml_cache = {}
+        self._draw_cache = {}
 
     def init_mode(self, mode, text, pixels):
         """Initialise for new graphics mode."""
         self._mode = mode
+        # movement offsets depend on the pixel aspect
+        self._draw_cache.clear()
         self._text = text
         self._pixels = pixels
         # set graphics viewport
@@ -192,6 +207,43 @@ class Drawing(object):
             self._queues.video.put(signals.Event(signals.VIDEO_PUT_PIXEL, (pagenum, x, y, index)))
             self.clear_text_at(x, y)
 
+    def put_pixels(self, xs, ys, index):
+        """Put a batch of pixels in one attribute on the active page; empty character buffer."""
+        vx0, vy0, vx1, vy1 = self.graph_view.get()
+        points = [(_x, _y) for _x, _y in zip(xs, ys) if vx0 <= _x <= vx1 and vy0 <= _y <= vy1]
+        if not points:
+            return
+        xs, ys = zip(*points)
+        page = self._pixels.pages[self._apagenum]
+        page.put_pixels(xs, ys, index)
+        x0, y0, x1, y1 = min(xs), min(ys), max(xs), max(ys)
+        self._queues.video.put(signals.Event(
+            signals.VIDEO_PUT_RECT, (self._apagenum, x0, y0, x1, y1, page.get_rect(x0, y0, x1, y1))
+        ))
+        # remove the characters covering the pixels, once for each character cell
+        cells = sorted(
+            (_row, _col)
+            for _row, _col in set(self._mode.pixel_to_text_pos(_x, _y) for _x, _y in points)
+            if self._text.get_char(self._apagenum, _row, _col) != ord(b' ')
+            or self._text.get_attr(self._apagenum, _row, _col) != self._attr
+        )
+        if not cells:
+            return
+        # send cleared cells as runs on each row
+        fore, back, blink, underline = self._mode.split_attr(self._attr)
+        runs = []
+        for row, col in cells:
+            self._text.put_char_attr(self._apagenum, row, col, b' ', self._attr)
+            if runs and runs[-1][0] == row and runs[-1][1] + runs[-1][2] == col:
+                runs[-1][2] += 1
+            else:
+                runs.append([row, col, 1])
+        for row, col, length in runs:
+            self._queues.video.put(signals.Event(
+                signals.VIDEO_PUT_TEXT,
+                (self._apagenum, row, col, [u' '] * length, fore, back, blink, underline)
+            ))
+
     def get_pixel(self, x, y, pagenum=None):
         """Return the attribute a pixel on the screen."""
         if pagenum is None:
@@ -211,6 +263,45 @@ class Drawing(object):
         )
         self.clear_text_area(x, y, x+len(colours), y)
 
+    if numpy:
+        def put_pixel_runs(self, pagenum, xs, ys, colours, mask=0xff):
+            """Write [n][length] attributes to aligned runs of pixels, only in the masked bits."""
+            length = colours.shape[1]
+            page = self._pixels.pages[pagenum]
+            # view of the pixel buffer as [y][run][pixel]
+            runs = page.buffer.reshape(page.height, page.width // length, length)
+            vx0, vy0, vx1, vy1 = self.graph_view.get()
+            if self.graph_view.is_set():
+                run_xs = xs[:, None] + numpy.arange(length)
+                inside = (run_xs >= vx0) & (run_xs <= vx1) & ((ys >= vy0) & (ys <= vy1))[:, None]
+                touched = inside.any(axis=1)
+                if not touched.any():
+                    return
+                xs, ys, colours = xs[touched], ys[touched], colours[touched]
+                old = runs[ys, xs // length]
+                colours = numpy.where(inside[touched], colours, old)
+            cols = xs // length
+            runs[ys, cols] = (runs[ys, cols] & ~mask) | (colours & mask)
+            x0, y0 = max(vx0, xs.min()), ys.min()
+            x1, y1 = min(vx1, xs.max() + length - 1), ys.max()
+            self._queues.video.put(signals.Event(
+                signals.VIDEO_PUT_RECT, (pagenum, x0, y0, x1, y1, page.get_rect(x0, y0, x1, y1))
+            ))
+            # remove the characters covering the pixels
+            rows, cols = ys // self._mode.font_height + 1, xs // self._mode.font_width + 1
+            if len(rows) < self._mode.width:
+                # a few pixel runs: clear cell by cell
+                for row, col in set(zip(rows.tolist(), cols.tolist())):
+                    self._text.clear_area(self._apagenum, row, col, row, col, self._attr)
+                return
+            # many pixel runs: clear runs of cells on each row
+            cleared = numpy.zeros((self._mode.height + 1, self._mode.width + 2), dtype=numpy.int8)
+            cleared[rows, cols] = 1
+            edges = numpy.diff(cleared, axis=1)
+            starts, stops = numpy.nonzero(edges == 1), numpy.nonzero(edges == -1)
+            for row, col0, col1 in zip(starts[0], starts[1] + 1, stops[1]):
+                self._text.clear_area(self._apagenum, row, col0, row, col1, self._attr)
+
     def fill_interval(self, x0, x1, y, index):
         """Fill a scanline interval in a solid attribute."""
         x0, x1, y = self.graph_view.clip_interval(x0, x1, y)
@@ -255,20 +346,22 @@ class Drawing(object):
         if self._mode.is_text_mode:
             raise error.BASICError(error.IFC)
         absolute = next(args)
-        try:
-            x0, y0, x1, y1 = (round(values.to_single(next(args)).to_value()) for _ in range(4))
+        coords = list(int(round(values.to_single_value(next(args)))) for _ in range(4))
+        if not coords:
+            self.unset_view()
+        else:
+            x0, y0, x1, y1 = coords
             error.range_check(0, self._mode.pixel_width-1, x0, x1)
             error.range_check(0, self._mode.pixel_height-1, y0, y1)
-            fill = next(args)
+            # fill and border are not given if the coordinates are not followed by a comma
+            fill = next(args, None)
             if fill is not None:
                 fill = values.to_int(fill)
-            border = next(args)
+            border = next(args, None)
             if border is not None:
                 border = values.to_int(border)
             list(args)
             self.set_view(x0, y0, x1, y1, absolute, fill, border)
-        except StopIteration:
-            self.unset_view()
 
     def set_view(self, x0, y0, x1, y1, absolute, fill, border):
         """Set the graphics viewport and optionally draw a box (VIEW)."""
@@ -284,6 +377,8 @@ class Drawing(object):
         self.last_point = self.graph_view.get_mid()
         if self.window_bounds is not None:
             self.set_window(*self.window_bounds)
+        else:
+            self._update_transform()
 
     def unset_view(self):
         """Unset the graphics viewport."""
@@ -291,6 +386,8 @@ class Drawing(object):
         self.last_point = self.graph_view.get_mid()
         if self.window_bounds is not None:
             self.set_window(*self.window_bounds)
+        else:
+            self._update_transform()
 
     ### WINDOW logical coords
 
@@ -299,7 +396,7 @@ class Drawing(object):
         if self._mode.is_text_mode:
             raise error.BASICError(error.IFC)
         cartesian = not next(args)
-        coords = list(values.to_single(next(args)).to_value() for _ in range(4))
+        coords = list(values.to_single_value(next(args)) for _ in range(4))
         if not coords:
             self.unset_window()
         else:
@@ -326,11 +423,20 @@ class Drawing(object):
         offsety = y0 - fy0*scaley
         self.window = scalex, scaley, offsetx, offsety
         self.window_bounds = fx0, fy0, fx1, fy1, cartesian
+        self._update_transform()
 
     def unset_window(self):
         """Unset the logical coordinate window."""
         self.window = None
         self.window_bounds = None
+        self._update_transform()
+
+    def _update_transform(self):
+        """Precompute the logical to physical transform after a VIEW or WINDOW change."""
+        # without a window, scaling by 1 and adding 0 leaves the coordinates unchanged
+        scalex, scaley, offsetx, offsety = self.window or (1., 1., 0., 0.)
+        viewx, viewy = self.graph_view.offset
+        self._transform = scalex, scaley, offsetx, offsety, viewx, viewy
 
     def window_is_set(self):
         """Return whether the logical coordinate window is set."""
@@ -355,6 +461,50 @@ class Drawing(object):
             raise error.BASICError(error.OVERFLOW)
         return x, y
 
+    def get_physical(self, fx, fy, step=False):
+        """Convert logical to absolute physical coordinates."""
+        scalex, scaley, offsetx, offsety, viewx, viewy = self._transform
+        if step:
+            x, y = self.get_window_physical(fx, fy, step)
+        else:
+            x = int(round(offsetx + fx * scalex))
+            y = int(round(offsety + fy * scaley))
+            # overflow check
+            if x < -0x8000 or y < -0x8000 or x > 0x7fff or y > 0x7fff:
+                raise error.BASICError(error.OVERFLOW)
+        return x + viewx, y + viewy
+
+    if numpy:
+        def get_physical_array(self, fxs, fys):
+            """Convert arrays of logical to absolute physical coordinates."""
+            scalex, scaley, offsetx, offsety, viewx, viewy = self._transform
+            # round to single precision first, as POINT does with its arguments
+            xs = _round_array(offsetx + _round_single_array(fxs) * scalex)
+            ys = _round_array(offsety + _round_single_array(fys) * scaley)
+            # overflow check
+            if (
+                    (xs < -0x8000).any() or (ys < -0x8000).any()
+                    or (xs > 0x7fff).any() or (ys > 0x7fff).any()
+                ):
+                raise error.BASICError(error.OVERFLOW)
+            return xs.astype(int) + viewx, ys.astype(int) + viewy
+
+    else:
+        def get_physical_array(self, fxs, fys):
+            """Convert lists of logical to absolute physical coordinates."""
+            # round to single precision first, as POINT does with its arguments
+            try:
+                coords = [
+                    self.get_physical(
+                        self._values.new_double().from_value(_fx).to_single().to_value(),
+                        self._values.new_double().from_value(_fy).to_single().to_value()
+                    )
+                    for _fx, _fy in zip(fxs, fys)
+                ]
+            except OverflowError:
+                raise error.BASICError(error.OVERFLOW)
+            return [_x for _x, _ in coords], [_y for _, _y in coords]
+
     def get_window_logical(self, x, y):
         """Convert physical to logical coordinates."""
         x, y = float(x), float(y)
@@ -390,7 +540,7 @@ class Drawing(object):
         if self._mode.is_text_mode:
             raise error.BASICError(error.IFC)
         step = next(args)
-        x, y = (values.to_single(next(args)).to_value() for _ in range(2))
+        x, y = (values.to_single_value(next(args)) for _ in range(2))
         c = next(args)
         if c is None:
             c = default
@@ -398,7 +548,7 @@ class Drawing(object):
             c = values.to_int(c)
             error.range_check(0, 255, c)
         list(args)
-        x, y = self.graph_view.coords(*self.get_window_physical(x, y, step))
+        x, y = self.get_physical(x, y, step)
         c = self.get_attr_index(c)
         self.put_pixel(x, y, c)
         self.last_attr = c
@@ -412,11 +562,11 @@ class Drawing(object):
             raise error.BASICError(error.IFC)
         step0 = next(args)
         x0, y0 = (
-            None if arg is None else values.to_single(arg).to_value()
+            None if arg is None else values.to_single_value(arg)
             for _, arg in zip(range(2), args)
         )
         step1 = next(args)
-        x1, y1 = (values.to_single(next(args)).to_value() for _ in range(2))
+        x1, y1 = (values.to_single_value(next(args)) for _ in range(2))
         coord0 = x0, y0, step0
         coord1 = x1, y1, step1
         c = next(args)
@@ -431,10 +581,10 @@ class Drawing(object):
         else:
             pattern = values.to_int(pattern)
         if coord0 != (None, None, None):
-            x0, y0 = self.graph_view.coords(*self.get_window_physical(*coord0))
+            x0, y0 = self.get_physical(*coord0)
         else:
             x0, y0 = self.last_point
-        x1, y1 = self.graph_view.coords(*self.get_window_physical(*coord1))
+        x1, y1 = self.get_physical(*coord1)
         c = self.get_attr_index(c)
         if not shape:
             self.draw_line(x0, y0, x1, y1, c, pattern)
@@ -447,6 +597,12 @@ class Drawing(object):
 
     def draw_line(self, x0, y0, x1, y1, c, pattern=0xffff):
         """Draw a line between the given physical points."""
+        xs, ys = [], []
+        self._get_line(xs, ys, x0, y0, x1, y1, pattern)
+        self.put_pixels(xs, ys, c)
+
+    def _get_line(self, xs, ys, x0, y0, x1, y1, pattern=0xffff):
+        """Add the pixels of a line between the given physical points to the coordinate lists."""
         # cut off any out-of-bound coordinates
         x0, y0 = self._mode.cutoff_coord(x0, y0)
         x1, y1 = self._mode.cutoff_coord(x1, y1)
@@ -461,22 +617,17 @@ class Drawing(object):
             dx, dy = dy, dx
         sx = 1 if x1 > x0 else -1
         sy = 1 if y1 > y0 else -1
-        mask = 0x8000
-        line_error = dx // 2
-        x, y = x0, y0
-        for x in xrange(x0, x1+sx, sx):
-            if pattern & mask != 0:
-                if steep:
-                    self.put_pixel(y, x, c)
-                else:
-                    self.put_pixel(x, y, c)
-            mask >>= 1
-            if mask == 0:
-                mask = 0x8000
-            line_error -= dy
-            if line_error < 0:
-                y += sy
-                line_error += dx
+        # the line style bit for the i-th step is (0x8000 >> (i % 16))
+        steps = [_i for _i in xrange(dx+1) if pattern & (0x8000 >> (_i % 16))]
+        # the error term starts at dx // 2 and stays within [0, dx) as it is decreased by dy
+        # and increased by dx on each change of y; so y has changed ceil((i*dy - dx//2) / dx) times
+        half = dx // 2
+        line_xs = [x0 + sx*_i for _i in steps]
+        line_ys = [y0 - sy*((half - _i*dy) // dx) if dx else y0 for _i in steps]
+        if steep:
+            line_xs, line_ys = line_ys, line_xs
+        xs.extend(line_xs)
+        ys.extend(line_ys)
 
     def draw_box_filled(self, x0, y0, x1, y1, c):
         """Draw a filled box between the given corner points."""
@@ -492,17 +643,19 @@ class Drawing(object):
         """Draw an empty box between the given corner points."""
         x0, y0 = self._mode.cutoff_coord(x0, y0)
         x1, y1 = self._mode.cutoff_coord(x1, y1)
+        xs, ys = [], []
         mask = 0x8000
-        mask = self.draw_straight(x1, y1, x0, y1, c, pattern, mask)
-        mask = self.draw_straight(x1, y0, x0, y0, c, pattern, mask)
+        mask = self._get_straight(xs, ys, x1, y1, x0, y1, pattern, mask)
+        mask = self._get_straight(xs, ys, x1, y0, x0, y0, pattern, mask)
         # verticals always drawn top to bottom
         if y0 < y1:
             y0, y1 = y1, y0
-        mask = self.draw_straight(x1, y1, x1, y0, c, pattern, mask)
-        mask = self.draw_straight(x0, y1, x0, y0, c, pattern, mask)
+        mask = self._get_straight(xs, ys, x1, y1, x1, y0, pattern, mask)
+        mask = self._get_straight(xs, ys, x0, y1, x0, y0, pattern, mask)
+        self.put_pixels(xs, ys, c)
 
-    def draw_straight(self, x0, y0, x1, y1, c, pattern, mask):
-        """Draw a horizontal or vertical line."""
+    def _get_straight(self, xs, ys, x0, y0, x1, y1, pattern, mask):
+        """Add the pixels of a horizontal or vertical line to the coordinate lists."""
         if x0 == x1:
             p0, p1, q, direction = y0, y1, x0, 'y'
         else:
@@ -511,9 +664,11 @@ class Drawing(object):
         for p in range(p0, p1+sp, sp):
             if pattern & mask != 0:
                 if direction == 'x':
-                    self.put_pixel(p, q, c)
+                    xs.append(p)
+                    ys.append(q)
                 else:
-                    self.put_pixel(q, p, c)
+                    xs.append(q)
+                    ys.append(p)
             mask >>= 1
             if mask == 0:
                 mask = 0x8000
@@ -563,23 +718,23 @@ class Drawing(object):
         if self._mode.is_text_mode:
             raise error.BASICError(error.IFC)
         step = next(args)
-        x, y = (values.to_single(next(args)).to_value() for _ in range(2))
-        r = values.to_single(next(args)).to_value()
+        x, y = (values.to_single_value(next(args)) for _ in range(2))
+        r = values.to_single_value(next(args))
         error.throw_if(r < 0)
         c = next(args)
         if c is not None:
             c = values.to_int(c)
         start = next(args)
         if start is not None:
-            start = values.to_single(start).to_value()
+            start = values.to_single_value(start)
         stop = next(args)
         if stop is not None:
-            stop = values.to_single(stop).to_value()
+            stop = values.to_single_value(stop)
         aspect = next(args)
         if aspect is not None:
-            aspect = values.to_single(aspect).to_value()
+            aspect = values.to_single_value(aspect)
         list(args)
-        x0, y0 = self.graph_view.coords(*self.get_window_physical(x, y, step))
+        x0, y0 = self.get_physical(x, y, step)
         if c is None:
             c = -1
         else:
@@ -639,6 +794,7 @@ class Drawing(object):
         # if oct1==oct0:
         # ----|.....|--- : coo1 lt coo0 : print if y in [0,coo1] or in [coo0, r]
         # ....|-----|... ; coo1 gte coo0: print if y in [coo0,coo1]
+        xs, ys = [], []
         x, y = r, 0
         bres_error = 1-r
         while x >= y:
@@ -661,7 +817,9 @@ class Drawing(object):
                         # (don't draw if y is between coo's)
                         if _octant_gt(oct0, y, coo1) and _octant_gt(oct0, coo0, y):
                             continue
-                self.put_pixel(*_octant_coord(octant, x0, y0, x, y), index=c)
+                px, py = _octant_coord(octant, x0, y0, x, y)
+                xs.append(px)
+                ys.append(py)
             # remember endpoints for pie sectors
             if y == coo0:
                 coo0x = x
@@ -674,6 +832,7 @@ class Drawing(object):
             else:
                 x -= 1
                 bres_error += 2*(y-x+1)
+        self.put_pixels(xs, ys, c)
         # draw pie-slice lines
         if line0:
             self.draw_line(x0, y0, *_octant_coord(oct0, x0, y0, coo0x, coo0), c=c)
@@ -701,6 +860,7 @@ class Drawing(object):
         ddx = 32 * ry * ry
         # error for first step
         err = dx + dy
+        xs, ys = [], []
         x, y = rx, 0
         while True:
             for quadrant in range(0,4):
@@ -718,7 +878,9 @@ class Drawing(object):
                     else:
                         if _quadrant_gt(qua0, x, y, x1, y1) and _quadrant_gt(qua0, x0, y0, x, y):
                             continue
-                self.put_pixel(*_quadrant_coord(quadrant, cx, cy, x, y), index=c)
+                px, py = _quadrant_coord(quadrant, cx, cy, x, y)
+                xs.append(px)
+                ys.append(py)
             # bresenham error step
             e2 = 2 * err
             if (e2 <= dy):
@@ -735,9 +897,10 @@ class Drawing(object):
         # too early stop of flat vertical ellipses
         # finish tip of ellipse
         while (y < ry):
-            self.put_pixel(cx, cy+y, c)
-            self.put_pixel(cx, cy-y, c)
+            xs += [cx, cx]
+            ys += [cy+y, cy-y]
             y += 1
+        self.put_pixels(xs, ys, c)
         # draw pie-slice lines
         if line0:
             self.draw_line(cx, cy, *_quadrant_coord(qua0, cx, cy, x0, y0), c=c)
@@ -751,7 +914,7 @@ class Drawing(object):
         if self._mode.is_text_mode:
             raise error.BASICError(error.IFC)
         step = next(args)
-        x, y = (values.to_single(next(args)).to_value() for _ in range(2))
+        x, y = (values.to_single_value(next(args)) for _ in range(2))
         coord = x, y, step
         c, pattern = -1, None
         cval = next(args)
@@ -797,7 +960,7 @@ class Drawing(object):
         else:
             tile, back = [[c]*8], None
         bound_x0, bound_y0, bound_x1, bound_y1 = self.graph_view.get()
-        x, y = self.graph_view.coords(*self.get_window_physical(*lcoord))
+        x, y = self.get_physical(*lcoord)
         line_seed = [(x, x, y, 0)]
         # paint nothing if seed is out of bounds
         if x < bound_x0 or x > bound_x1 or y < bound_y0 or y > bound_y1:
@@ -845,43 +1008,79 @@ class Drawing(object):
                 self.put_interval(self._apagenum, x_left, y, interval)
             # allow interrupting the paint
             if y%4 == 0:
-                self._input_methods.wait()
+                self._input_methods.check_events()
         self.last_attr = c
 
-    def check_scanline(
-            self, line_seed, x_start, x_stop, y,
-            c, tile, back, border, ydir
-        ):
-        """Append all subintervals between border colours to the scanning stack."""
-        if x_stop < x_start:
+    if numpy:
+        def check_scanline(
+                self, line_seed, x_start, x_stop, y,
+                c, tile, back, border, ydir
+            ):
+            """Append all subintervals between border colours to the scanning stack."""
+            if x_stop < x_start:
+                return line_seed
+            scanline = self._pixels.pages[self._apagenum].buffer[y, x_start:x_stop+1]
+            rtile = tile[y%len(tile)]
+            rback = back[y%len(back)] if back else None
+            # intervals between border colours, as [start, stop) relative to x_start
+            borders = (scanline == border).nonzero()[0].tolist()
+            for start, stop in zip([0] + [_b+1 for _b in borders], borders + [len(scanline)]):
+                if stop <= start:
+                    continue
+                # don't append if same fill colour/pattern,
+                # to avoid infinite loops over bits already painted (eg. 00 shape)
+                if not self._has_same_pattern(scanline[start:stop], x_start+start, rtile, rback):
+                    line_seed.append([x_start+start, x_start+stop-1, y, ydir])
             return line_seed
-        x_start_next = x_start
-        x_stop_next = x_start_next-1
-        rtile = tile[y%len(tile)]
-        if back:
-            rback = back[y%len(back)]
-        x = x_start
-        while x <= x_stop:
-            # scan horizontally until border colour found, then append interval & continue scanning
-            pattern = self.get_until(x, x_stop+1, y, border)
-            x_stop_next = x + len(pattern) - 1
-            x = x_stop_next + 1
+
+        def _has_same_pattern(self, interval, x, rtile, rback):
+            """Check if a scanline interval starting at x holds the tile row and not the background."""
             # never match zero pattern (special case)
-            has_same_pattern = (rtile != [0]*8)
-            for pat_x in range(len(pattern)):
-                if not has_same_pattern:
-                    break
-                tile_x = (x_start_next + pat_x) % 8
-                has_same_pattern &= (pattern[pat_x] == rtile[tile_x])
-                has_same_pattern &= (not back or pattern[pat_x] != rback[tile_x])
-            # we've reached a border colour, append our interval & start a new one
-            # don't append if same fill colour/pattern,
-            # to avoid infinite loops over bits already painted (eg. 00 shape)
-            if x_stop_next >= x_start_next and not has_same_pattern:
-                line_seed.append([x_start_next, x_stop_next, y, ydir])
-            x_start_next = x + 1
-            x += 1
-        return line_seed
+            if rtile == [0]*8:
+                return False
+            # most intervals differ in the first pixel; avoid building the tiled row
+            if interval[0] != rtile[x%8] or (rback and interval[0] == rback[x%8]):
+                return False
+            tile_x = numpy.arange(x, x+len(interval)) % 8
+            if (interval != numpy.array(rtile)[tile_x]).any():
+                return False
+            return not rback or (interval != numpy.array(rback)[tile_x]).all()
+
+    else:
+        def check_scanline(
+                self, line_seed, x_start, x_stop, y,
+                c, tile, back, border, ydir
+            ):
+            """Append all subintervals between border colours to the scanning stack."""
+            if x_stop < x_start:
+                return line_seed
+            x_start_next = x_start
+            x_stop_next = x_start_next-1
+            rtile = tile[y%len(tile)]
+            if back:
+                rback = back[y%len(back)]
+            x = x_start
+            while x <= x_stop:
+                # scan horizontally until border colour found, then append interval & continue scanning
+                pattern = self.get_until(x, x_stop+1, y, border)
+                x_stop_next = x + len(pattern) - 1
+                x = x_stop_next + 1
+                # never match zero pattern (special case)
+                has_same_pattern = (rtile != [0]*8)
+                for pat_x in range(len(pattern)):
+                    if not has_same_pattern:
+                        break
+                    tile_x = (x_start_next + pat_x) % 8
+                    has_same_pattern &= (pattern[pat_x] == rtile[tile_x])
+                    has_same_pattern &= (not back or pattern[pat_x] != rback[tile_x])
+                # we've reached a border colour, append our interval & start a new one
+                # don't append if same fill colour/pattern,
+                # to avoid infinite loops over bits already painted (eg. 00 shape)
+                if x_stop_next >= x_start_next and not has_same_pattern:
+                    line_seed.append([x_start_next, x_stop_next, y, ydir])
+                x_start_next = x + 1
+                x += 1
+            return line_seed
 
     ### PUT and GET: Sprite operations
 
@@ -889,7 +1088,7 @@ class Drawing(object):
         """PUT: Put a sprite on the screen."""
         if self._mode.is_text_mode:
             raise error.BASICError(error.IFC)
-        x0, y0 = (values.to_single(next(args)).to_value() for _ in range(2))
+        x0, y0 = (values.to_single_value(next(args)) for _ in range(2))
         array_name, operation_token = args
         array_name = self._memory.complete_name(array_name)
         operation_token = operation_token or tk.XOR
@@ -897,7 +1096,7 @@ class Drawing(object):
             raise error.BASICError(error.IFC)
         elif array_name[-1] == values.STR:
             raise error.BASICError(error.TYPE_MISMATCH)
-        x0, y0 = self.graph_view.coords(*self.get_window_physical(x0, y0))
+        x0, y0 = self.get_physical(x0, y0)
         self.last_point = x0, y0
         try:
             byte_array = self._memory.arrays.view_full_buffer(array_name)
@@ -929,9 +1128,9 @@ class Drawing(object):
         """GET: Read a sprite from the screen."""
         if self._mode.is_text_mode:
             raise error.BASICError(error.IFC)
-        x0, y0 = (values.to_single(next(args)).to_value() for _ in range(2))
+        x0, y0 = (values.to_single_value(next(args)) for _ in range(2))
         step = next(args)
-        x, y = (values.to_single(next(args)).to_value() for _ in range(2))
+        x, y = (values.to_single_value(next(args)) for _ in range(2))
         lcoord1 = x, y, step
         array_name, = args
         array_name = self._memory.complete_name(array_name)
@@ -939,8 +1138,8 @@ class Drawing(object):
             raise error.BASICError(error.IFC)
         elif array_name[-1] == values.STR:
             raise error.BASICError(error.TYPE_MISMATCH)
-        x0, y0 = self.graph_view.coords(*self.get_window_physical(x0, y0))
-        x1, y1 = self.graph_view.coords(*self.get_window_physical(*lcoord1))
+        x0, y0 = self.get_physical(x0, y0)
+        x1, y1 = self.get_physical(*lcoord1)
         self.last_point = x1, y1
         try:
             byte_array = self._memory.arrays.view_full_buffer(array_name)
@@ -979,138 +1178,93 @@ class Drawing(object):
 
     def draw(self, gml):
         """Execute a Graphics Macro Language string."""
-        # don't convert to uppercase as VARPTR$ elements are case sensitive
-        gmls = mlparser.MLParser(gml, self._memory, self._values)
-        plot, goback = True, False
-        while True:
-            c = gmls.skip_blank_read().upper()
-            if c == b'':
-                break
-            elif c == b';':
-                continue
-            elif c == b'B':
-                # do not draw
-                plot = False
-            elif c == b'N':
-                # return to postiton after move
-                goback = True
-            elif c == b'X':
-                # execute substring
-                sub = gmls.parse_string()
-                self.draw(sub)
-            elif c == b'C':
-                # set foreground colour
-                # allow empty spec (default 0), but only if followed by a semicolon
-                if gmls.skip_blank() == b';':
-                    self.last_attr = 0
-                else:
-                    attr = gmls.parse_number()
-                    # 100000 seems to be GW's limit
-                    error.range_check(-99999, 99999, attr)
-                    self.last_attr = attr
-            elif c == b'S':
-                # set scale
-                scale = gmls.parse_number()
-                error.range_check(1, 255, scale)
-                self.draw_scale = scale
-            elif c == b'A':
-                # set angle
-                # allow empty spec (default 0), but only if followed by a semicolon
-                if gmls.skip_blank() == b';':
-                    self.draw_angle = 0
-                else:
-                    angle = gmls.parse_number()
-                    error.range_check(0, 3, angle)
-                    self.draw_angle = 90 * angle
-            elif c == b'T':
-                # 'turn angle' - set (don't turn) the angle to any value
-                if gmls.read(1).upper() != b'A':
-                    raise error.BASICError(error.IFC)
-                # allow empty spec (default 0), but only if followed by a semicolon
-                if gmls.skip_blank() == b';':
-                    self.draw_angle = 0
-                else:
-                    angle = gmls.parse_number()
-                    error.range_check(-360, 360, angle)
-                    self.draw_angle = angle
-            # one-variable movement commands:
-            elif c in (b'U', b'D', b'L', b'R', b'E', b'F', b'G', b'H'):
-                step = gmls.parse_number(default=1)
-                # 100000 seems to be GW's limit
-                error.range_check(-99999, 99999, step)
-                x0, y0 = self.last_point
-                x1, y1 = 0, 0
-                if c in (b'U', b'E', b'H'):
-                    y1 -= step
-                elif c in (b'D', b'F', b'G'):
-                    y1 += step
-                if c in (b'L', b'G', b'H'):
-                    x1 -= step
-                elif c in (b'R', b'E', b'F'):
-                    x1 += step
-                self.draw_step(x0, y0, x1, y1, plot, goback)
-                plot = True
-                goback = False
-            # two-variable movement command
-            elif c == b'M':
-                relative = gmls.skip_blank() in (b'+', b'-')
-                x = gmls.parse_number()
-                error.range_check(-9999, 9999, x)
-                if gmls.skip_blank() != b',':
-                    raise error.BASICError(error.IFC)
-                else:
-                    gmls.read(1)
-                y = gmls.parse_number()
-                error.range_check(-9999, 9999, y)
-                x0, y0 = self.last_point
-                if relative:
-                    self.draw_step(x0, y0, x, y, plot, goback)
-                else:
-                    if plot:
-                        self.draw_line(x0, y0, x, y, self.last_attr)
-                    self.last_point = x, y
-                    if goback:
-                        self.last_point = x0, y0
-                plot = True
-                goback = False
-            elif c == b'P':
-                # paint - flood fill
-                colour = gmls.parse_number()
-                error.range_check(0, 9999, colour)
-                if gmls.skip_blank_read() != b',':
-                    raise error.BASICError(error.IFC)
-                bound = gmls.parse_number()
-                error.range_check(0, 9999, bound)
-                x, y = self.get_window_logical(*self.last_point)
-                self.flood_fill((x, y, False), colour, None, bound, None)
+        state = gml, self.draw_scale, self.draw_angle
+        try:
+            ops = self._draw_cache[state]
+        except KeyError:
+            try:
+                parsed = self._gml_cache[gml]
+            except KeyError:
+                # don't convert to uppercase as VARPTR$ elements are case sensitive
+                if len(self._gml_cache) >= self.max_gml_cache:
+                    self._gml_cache.clear()
+                parsed = self._gml_cache[gml] = gml_compiler.compile_gml(gml)
+            if len(self._draw_cache) >= self.max_gml_cache:
+                self._draw_cache.clear()
+            ops = self._draw_cache[state] = gml_compiler.resolve(
+                parsed, self.draw_scale, self.draw_angle, self._mode.pixel_aspect
+            )
+        for op in ops:
+            self._draw_op(op)
+
+    def _draw_op(self, op):
+        """Execute a compiled GML operation."""
+        code, args = op[0], op[1:]
+        if code == gml_compiler.POLYLINE:
+            self.draw_polyline(*args)
+        elif code == gml_compiler.COLOUR:
+            self.last_attr = self._get_gml_number(args[0], -99999, 99999)
+        elif code == gml_compiler.SCALE:
+            self.draw_scale = self._get_gml_number(args[0], 1, 255)
+        elif code == gml_compiler.ANGLE:
+            angle, lower, upper, factor = args
+            self.draw_angle = factor * self._get_gml_number(angle, lower, upper)
+        elif code == gml_compiler.STEP:
+            xfac, yfac, step, plot, goback = args
+            step = self._get_gml_number(step, *gml_compiler.STEP_RANGE)
+            x0, y0 = self.last_point
+            self.draw_step(x0, y0, xfac*step, yfac*step, plot, goback)
+        elif code in (gml_compiler.STEP_XY, gml_compiler.MOVE):
+            x, y, plot, goback = args
+            x = self._get_gml_number(x, *gml_compiler.MOVE_RANGE)
+            y = self._get_gml_number(y, *gml_compiler.MOVE_RANGE)
+            x0, y0 = self.last_point
+            if code == gml_compiler.STEP_XY:
+                self.draw_step(x0, y0, x, y, plot, goback)
             else:
-                raise error.BASICError(error.IFC)
+                if plot:
+                    self.draw_line(x0, y0, x, y, self.last_attr)
+                self.last_point = x, y
+                if goback:
+                    self.last_point = x0, y0
+        elif code == gml_compiler.PAINT:
+            colour = self._get_gml_number(args[0], 0, 9999)
+            bound = self._get_gml_number(args[1], 0, 9999)
+            x, y = self.get_window_logical(*self.last_point)
+            self.flood_fill((x, y, False), colour, None, bound, None)
+        elif code == gml_compiler.EXECUTE:
+            self.draw(values.pass_string(args[0].get_value(self._memory)).to_str())
+        elif code == gml_compiler.ERROR:
+            for number, lower, upper in args[0]:
+                self._get_gml_number(number, lower, upper)
+            raise error.BASICError(error.IFC)
+
+    def _get_gml_number(self, number, lower, upper):
+        """Evaluate and range-check a compiled GML number."""
+        number = gml_compiler.get_number(number, self._memory)
+        if lower is not None:
+            error.range_check(lower, upper, number)
+        return number
+
+    def draw_polyline(self, segments):
+        """Draw a run of DRAW movements as one batch of pixels."""
+        x0, y0 = self.last_point
+        xs, ys = [], []
+        for x1, y1, relative, plot, goback in segments:
+            if relative:
+                x1, y1 = x0 + x1, y0 + y1
+            if plot:
+                self._get_line(xs, ys, x0, y0, x1, y1)
+            if not goback:
+                x0, y0 = x1, y1
+        self.last_point = x0, y0
+        self.put_pixels(xs, ys, self.last_attr)
 
     def draw_step(self, x0, y0, sx, sy, plot, goback):
         """Make a DRAW step, drawing a line and returning if requested."""
-        scale = self.draw_scale
-        rotate = self.draw_angle
-        aspect = self._mode.pixel_aspect
-        yfac = aspect[1] / (1.*aspect[0])
-        x1 = (scale*sx) // 4
-        y1 = (scale*sy) // 4
-        if rotate == 0 or rotate == 360:
-            pass
-        elif rotate == 90:
-            x1, y1 = int(y1*yfac), -int(x1//yfac)
-        elif rotate == 180:
-            x1, y1 = -x1, -y1
-        elif rotate == 270:
-            x1, y1 = -int(y1*yfac), int(x1//yfac)
-        else:
-            fx, fy = float(x1), float(y1)
-            # degrees to radians
-            phi = rotate * math.pi / 180.
-            sinr, cosr = math.sin(phi), math.cos(phi)
-            fxfac = float(aspect[0]) / float(aspect[1])
-            fx = cosr*fx + (sinr*fy) / fxfac
-            fy = (cosr*fy) * fxfac - sinr*fx
-            x1, y1 = int(round(fx)), int(round(fy))
+        x1, y1 = gml_compiler.get_step(
+            sx, sy, self.draw_scale, self.draw_angle, self._mode.pixel_aspect
+        )
         y1 += y0
         x1 += x0
         if plot:
@@ -1145,14 +1299,39 @@ class Drawing(object):
                 raise error.BASICError(error.IFC)
             arg1 = values.pass_number(arg1)
             list(args)
-            x, y = values.to_single(arg0).to_value(), values.to_single(arg1).to_value()
-            x, y = self.graph_view.coords(*self.get_window_physical(x, y))
+            x, y = values.to_single_value(arg0), values.to_single_value(arg1)
+            x, y = self.get_physical(x, y)
             if x < 0 or x >= self._mode.pixel_width or y < 0 or y >= self._mode.pixel_height:
                 point = -1
             else:
                 point = self.get_pixel(x, y)
             return self._values.new_integer().from_int(point)
 
+    if numpy:
+        def get_points(self, fxs, fys):
+            """Return the attributes of pixels at arrays of logical coordinates, as POINT does."""
+            if self._mode.is_text_mode:
+                raise error.BASICError(error.IFC)
+            xs, ys = self.get_physical_array(fxs, fys)
+            inside = (
+                (xs >= 0) & (xs < self._mode.pixel_width) & (ys >= 0) & (ys < self._mode.pixel_height)
+            )
+            points = numpy.full(xs.shape, -1, dtype=int)
+            points[inside] = self._pixels.pages[self._apagenum].buffer[ys[inside], xs[inside]]
+            return points
+
+    else:
+        def get_points(self, fxs, fys):
+            """Return the attributes of pixels at lists of logical coordinates, as POINT does."""
+            if self._mode.is_text_mode:
+                raise error.BASICError(error.IFC)
+            return [
+                -1 if (
+                    _x < 0 or _x >= self._mode.pixel_width or _y < 0 or _y >= self._mode.pixel_height
+                ) else self.get_pixel(_x, _y)
+                for _x, _y in zip(*self.get_physical_array(fxs, fys))
+            ]
+
     def pmap_(self, args):
         """PMAP: convert between logical and physical coordinates."""
         # create a new Single for the return value
@@ -1166,9 +1345,9 @@ class Drawing(object):
                 values.to_integer(coord)
             value = 0
         elif mode == 0:
-            value, _ = self.get_window_physical(values.to_single(coord).to_value(), 0.)
+            value, _ = self.get_window_physical(coord.to_value(), 0.)
         elif mode == 1:
-            _, value = self.get_window_physical(0., values.to_single(coord).to_value())
+            _, value = self.get_window_physical(0., coord.to_value())
         elif mode == 2:
             value, _ = self.get_window_logical(values.to_integer(coord).to_int(), 0)
         elif mode == 3:
@@ -1176,6 +1355,33 @@ class Drawing(object):
         return self._values.new_single().from_value(value)
 
 
+if numpy:
+    def _round_array(floats):
+        """Round an array of floats to whole numbers, halves away from zero like round()."""
+        magnitude = numpy.abs(floats)
+        whole = numpy.floor(magnitude)
+        # the fractional part is exact, unlike magnitude + 0.5
+        whole += (magnitude - whole >= 0.5)
+        return numpy.copysign(whole, floats)
+
+    def _round_single_array(floats):
+        """Round an array of floats to single precision like Double.to_single()."""
+        floats = numpy.asarray(floats, dtype=float)
+        man, exp = numpy.frexp(numpy.abs(floats))
+        # 24-bit mantissa and the carry byte below it; further bits are dropped
+        man = numpy.floor(numpy.ldexp(man, 32)).astype(numpy.int64)
+        carry = man & 0xff
+        man >>= 8
+        # round on the carry byte, halves to even
+        man += (carry > 0x80) | ((carry == 0x80) & (man & 1 == 1))
+        singles = numpy.copysign(numpy.ldexp(man.astype(float), exp - 24), floats)
+        # out of range for the Microsoft Binary Format
+        if (numpy.abs(singles) > _SINGLE_MAX).any():
+            raise error.BASICError(error.OVERFLOW)
+        singles[numpy.abs(singles) < _SINGLE_MIN] = 0.
+        return singles
+
+
 def tile_to_interval(x0, x1, y, tile):
     """Convert a tile to a list of attributes."""
     dx = x1 - x0 + 1
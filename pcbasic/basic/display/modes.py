@@ -518,7 +518,7 @@ class VideoMode(object):
         # area bounds are all inclusive
         return (
             (col0-1) * self.font_width, (row0-1) * self.font_height,
-            (col1-col0+1) * self.font_width-1, (row1-row0+1) * self.font_height-1
+            col1 * self.font_width - 1, row1 * self.font_height - 1
         )
 
     def get_all_memory(self, screen):
@@ -555,48 +555,44 @@ class TextMode(VideoMode):
         self.is_text_mode = True
         self.num_attr = 32
 
+    def _walk_rows(self, addr, num_bytes):
+        """Yield page, row, offset in row, offset in block and length of each row in a block."""
+        row_size = self.width * 2
+        start = addr - self.video_segment*0x10
+        pos = max(0, start)
+        while pos < start + num_bytes:
+            page, offset = divmod(pos, self.page_size)
+            row, col_offset = divmod(offset, row_size)
+            length = min(row_size - col_offset, self.page_size - offset, start + num_bytes - pos)
+            if page < self.num_pages and row < self.height:
+                yield page, row + 1, col_offset, pos - start, length
+            pos += length
+
+    def _get_row_bytes(self, text, page, row, col0, col1):
+        """Interleaved character and attribute bytes for a run of columns on a row."""
+        row_bytes = bytearray(2 * (col1 - col0 + 1))
+        row_bytes[0::2] = text.get_chars(page, row, col0, col1)
+        row_bytes[1::2] = text.get_attrs(page, row, col0, col1)
+        return row_bytes
+
     def get_memory(self, screen, addr, num_bytes):
         """Retrieve bytes from textmode video memory."""
-        addr -= self.video_segment*0x10
         mem_bytes = bytearray(num_bytes)
-        for i in xrange(num_bytes):
-            page = (addr+i) // self.page_size
-            offset = (addr+i) % self.page_size
-            ccol = 1 + (offset % (self.width*2)) // 2
-            crow = 1 + offset // (self.width*2)
-            try:
-                if (addr+i) % 2:
-                    mem_bytes[i] = screen.text_screen.text.get_attr(page, crow, ccol)
-                else:
-                    mem_bytes[i] = screen.text_screen.text.get_char(page, crow, ccol)
-            except IndexError:
-                pass
+        for page, row, col_offset, ofs, length in self._walk_rows(addr, num_bytes):
+            col0, col1 = col_offset//2 + 1, (col_offset+length-1)//2 + 1
+            row_bytes = self._get_row_bytes(screen.text_screen.text, page, row, col0, col1)
+            mem_bytes[ofs:ofs+length] = row_bytes[col_offset%2:col_offset%2+length]
         return mem_bytes
 
     def set_memory(self, screen, addr, mem_bytes):
         """Set bytes in textmode video memory."""
-        addr -= self.video_segment*0x10
-        last_row = 0
-        for i in xrange(len(mem_bytes)):
-            page = (addr+i) // self.page_size
-            offset = (addr+i) % self.page_size
-            ccol = 1 + (offset % (self.width*2)) // 2
-            crow = 1 + offset // (self.width*2)
-            try:
-                if (addr+i) % 2:
-                    c = screen.text_screen.text.get_char(page, crow, ccol)
-                    a = mem_bytes[i]
-                else:
-                    c = mem_bytes[i]
-                    a = screen.text_screen.text.get_attr(page, crow, ccol)
-                screen.text_screen.text.put_char_attr(page, crow, ccol, int2byte(c), a)
-                if last_row > 0 and last_row != crow:
-                    screen.text_screen.refresh_range(page, last_row, 1, self.width)
-            except IndexError:
-                pass
-            last_row = crow
-        if last_row >= 1 and last_row <= self.height and page >= 0 and page < self.num_pages:
-            screen.text_screen.refresh_range(page, last_row, 1, self.width)
+        text = screen.text_screen.text
+        for page, row, col_offset, ofs, length in self._walk_rows(addr, len(mem_bytes)):
+            col0, col1 = col_offset//2 + 1, (col_offset+length-1)//2 + 1
+            row_bytes = self._get_row_bytes(text, page, row, col0, col1)
+            row_bytes[col_offset%2:col_offset%2+length] = mem_bytes[ofs:ofs+length]
+            start, stop = text.put_chars_attrs(page, row, col0, row_bytes[0::2], row_bytes[1::2])
+            screen.text_screen.refresh_range(page, row, start, stop)
 
 
 class MonoTextMode(TextMode):
@@ -667,6 +663,43 @@ if numpy:
             nattrs |= attrs[i::pixels_per_byte]
         return bytearray(list(nattrs))
 
+    def _get_sprite_shifts(bits, planes):
+        """Bit shifts of the attribute bits in each plane, most significant first."""
+        return numpy.arange(planes)[:, None] * bits + numpy.arange(bits-1, -1, -1)[None, :]
+
+    def sprite_to_bytes(attrs, bits, planes):
+        """Pack an [y][x] array of attributes into rows of byte-aligned planes of bits per pixel."""
+        attrs = numpy.asarray(attrs).astype(numpy.uint8)
+        height, width = attrs.shape
+        shifts = _get_sprite_shifts(bits, planes)
+        # [y][plane][x][bit]
+        bitarray = (attrs[:, None, :, None] >> shifts[None, :, None, :]) & 1
+        return numpy.packbits(bitarray.reshape(height, planes, width*bits), axis=-1)
+
+    def bytes_to_sprite(byte_array, offset, dx, dy, bits, planes):
+        """Unpack rows of byte-aligned planes of bits per pixel into an [y][x] array of attributes."""
+        row_bytes = (dx*bits + 7) // 8
+        length = dy * planes * row_bytes
+        packed = numpy.frombuffer(bytearray(byte_array[offset:offset+length]), dtype=numpy.uint8)
+        if len(packed) < length:
+            raise error.BASICError(error.IFC)
+        bitarray = numpy.unpackbits(packed.reshape(dy, planes, row_bytes), axis=-1)
+        bitarray = bitarray[:, :, :dx*bits].reshape(dy, planes, dx, bits).astype(numpy.int8)
+        shifts = _get_sprite_shifts(bits, planes)
+        return (bitarray << shifts[None, :, None, :]).sum(axis=(1, 3), dtype=numpy.int8)
+
+    def _split_pages(pages):
+        """Yield page number, start and stop index of each page in a sorted array of pages."""
+        if not len(pages):
+            return
+        if pages[0] == pages[-1]:
+            yield pages[0], 0, len(pages)
+            return
+        for pagenum in range(pages[0], pages[-1] + 1):
+            start, stop = numpy.searchsorted(pages, (pagenum, pagenum + 1))
+            if stop > start:
+                yield pagenum, start, stop
+
 else:
     def bytes_to_interval(byte_array, pixels_per_byte, mask=1):
         """Convert masked attributes packed into bytes to a scanline interval."""
@@ -739,44 +772,61 @@ def record_to_sprite_size_ega(self, byte_array):
     """Read 4-byte record of sprite size in EGA modes."""
     return struct.unpack('<HH', byte_array[0:4])
 
-def sprite_to_array_ega(self, attrs, dx, dy, byte_array, offs):
-    """Build the sprite byte array in EGA modes."""
-    # for EGA modes, sprites have 8 pixels per byte
-    # with colour planes in consecutive rows
-    # each new row is aligned on a new byte
-    #
-    # this is much faster for wide selections
-    # but for narrow selections storing in an array and indexing take longer
-    # than just getting each pixel separately
-    row_bytes = (dx+7) // 8
-    length = dy * self.bitsperpixel * row_bytes
-    if offs+length > len(byte_array):
-        raise ValueError('Sprite exceeds array byte size')
-    byte_array[offs:offs+length] = b'\0'*length
-    for row in attrs:
-        for plane in range(self.bitsperpixel):
-            byte_array[offs:offs+row_bytes] = interval_to_bytes(row, 8, plane)
-            offs += row_bytes
-
-# elementwise OR, in-place if possible
 if numpy:
-    or_i = numpy.ndarray.__ior__
+    def sprite_to_array_ega(self, attrs, dx, dy, byte_array, offs):
+        """Build the sprite byte array in EGA modes."""
+        # for EGA modes, sprites have 8 pixels per byte
+        # with colour planes in consecutive rows
+        # each new row is aligned on a new byte
+        row_bytes = (dx+7) // 8
+        length = dy * self.bitsperpixel * row_bytes
+        if offs+length > len(byte_array):
+            raise ValueError('Sprite exceeds array byte size')
+        packed = sprite_to_bytes(attrs, 1, self.bitsperpixel)
+        if packed.shape[-1] != row_bytes:
+            # Tandy screen 6 reads rows twice as wide as the record
+            byte_array[offs:offs+length] = b'\0'*length
+            raise ValueError('Sprite exceeds record width')
+        byte_array[offs:offs+length] = packed.tostring()
+
+    def array_to_sprite_ega(self, byte_array, offset, dx, dy):
+        """Build sprite from byte_array in EGA modes."""
+        return bytes_to_sprite(byte_array, offset, dx, dy, 1, self.bitsperpixel)
+
 else:
-    def or_i(list0, list1):
-        return [ x | y for x, y in zip(list0, list1) ]
-
-def array_to_sprite_ega(self, byte_array, offset, dx, dy):
-    """Build sprite from byte_array in EGA modes."""
-    row_bytes = (dx+7) // 8
-    attrs = []
-    for y in range(dy):
-        row = bytes_to_interval(byte_array[offset:offset+row_bytes], 8, 1)
-        offset += row_bytes
-        for plane in range(1, self.bitsperpixel):
-            row = or_i(row, bytes_to_interval(byte_array[offset:offset+row_bytes], 8, 1 << plane))
+    def sprite_to_array_ega(self, attrs, dx, dy, byte_array, offs):
+        """Build the sprite byte array in EGA modes."""
+        # for EGA modes, sprites have 8 pixels per byte
+        # with colour planes in consecutive rows
+        # each new row is aligned on a new byte
+        #
+        # this is much faster for wide selections
+        # but for narrow selections storing in an array and indexing take longer
+        # than just getting each pixel separately
+        row_bytes = (dx+7) // 8
+        length = dy * self.bitsperpixel * row_bytes
+        if offs+length > len(byte_array):
+            raise ValueError('Sprite exceeds array byte size')
+        byte_array[offs:offs+length] = b'\0'*length
+        for row in attrs:
+            for plane in range(self.bitsperpixel):
+                byte_array[offs:offs+row_bytes] = interval_to_bytes(row, 8, plane)
+                offs += row_bytes
+
+    def array_to_sprite_ega(self, byte_array, offset, dx, dy):
+        """Build sprite from byte_array in EGA modes."""
+        row_bytes = (dx+7) // 8
+        attrs = []
+        for y in range(dy):
+            row = bytes_to_interval(byte_array[offset:offset+row_bytes], 8, 1)
             offset += row_bytes
-        attrs.append(row[:dx])
-    return attrs
+            for plane in range(1, self.bitsperpixel):
+                plane_row = bytes_to_interval(byte_array[offset:offset+row_bytes], 8, 1 << plane)
+                row = [x | y for x, y in zip(row, plane_row)]
+                offset += row_bytes
+            attrs.append(row[:dx])
+        return attrs
+
 
 def build_tile_cga(self, pattern):
     """Build a flood-fill tile for CGA screens."""
@@ -828,6 +878,8 @@ class GraphicsMode(VideoMode):
             num_pages, has_blink, video_segment, page_size
         )
         self.is_text_mode = False
+        # lookup arrays from video memory offset to page and coordinates, built on first use
+        self._memory_map = None
         self.bitsperpixel = int(bitsperpixel)
         # number of pixels referenced in each byte of a plane
         self.ppb = 8 // self.bitsperpixel
@@ -860,13 +912,61 @@ class GraphicsMode(VideoMode):
         """Set the current colour plane mask (EGA only)."""
         pass
 
+    if numpy:
+        def _get_memory_map(self):
+            """Build lookup arrays of page and pixel coordinates for each byte of video memory."""
+            if self._memory_map is None:
+                offsets = numpy.arange(self.page_size * self.num_pages)
+                page, x, y = self.get_coords(offsets + self.video_segment*0x10)
+                # bytes beyond the visible rows of a page hold no pixels
+                page[(x >= self.pixel_width) | (y >= self.pixel_height)] = -1
+                self._memory_map = page, x, y
+            return self._memory_map
+
+        def _locate_memory(self, addr, num_bytes):
+            """Get offset into block, page, x and y of the bytes in a memory block that hold pixels."""
+            page, x, y = self._get_memory_map()
+            start = addr - self.video_segment*0x10
+            offsets = numpy.arange(max(0, start), min(len(page), start + num_bytes))
+            offsets = offsets[page[offsets] >= 0]
+            return offsets - start, page[offsets], x[offsets], y[offsets]
+
+        def _get_pixel_bytes(self, screen, located, pixels_per_byte, plane):
+            """Pack the pixels at located bytes into byte values for one plane."""
+            _, pages, xs, ys = located
+            bpp = 8 // pixels_per_byte
+            shifts = numpy.arange(8-bpp, -1, -bpp)
+            values = numpy.zeros(len(pages), dtype=numpy.uint8)
+            for pagenum, start, stop in _split_pages(pages):
+                buffer = screen.pixels.pages[pagenum].buffer
+                # view of the pixel buffer as [y][byte][pixel]
+                runs = buffer.reshape(self.pixel_height, self.pixel_width // pixels_per_byte, -1)
+                attrs = runs[ys[start:stop], xs[start:stop] // pixels_per_byte].astype(int)
+                values[start:stop] = (((attrs >> plane) & ((1<<bpp) - 1)) << shifts).sum(axis=1)
+            return values
+
+        def _put_pixel_bytes(self, screen, located, values, pixels_per_byte, mask=None):
+            """Unpack byte values into the pixels at located bytes; with a mask, set only those planes."""
+            _, pages, xs, ys = located
+            bpp = 8 // pixels_per_byte
+            shifts = numpy.arange(8-bpp, -1, -bpp)
+            attrs = (numpy.asarray(values, dtype=numpy.int8)[:, None] >> shifts) & ((1<<bpp) - 1)
+            if mask is None:
+                mask = 0xff
+            else:
+                attrs *= mask
+            for pagenum, start, stop in _split_pages(pages):
+                screen.drawing.put_pixel_runs(
+                    pagenum, xs[start:stop], ys[start:stop], attrs[start:stop], mask
+                )
+
 
 class CGAMode(GraphicsMode):
     """Default settings for a CGA graphics mode."""
 
     def get_coords(self, addr):
         """Get video page and coordinates for address."""
-        addr = int(addr) - self.video_segment * 0x10
+        addr = addr - self.video_segment * 0x10
         # modes 1-5: interleaved scan lines, pixels sequentially packed into bytes
         page, addr = addr//self.page_size, addr%self.page_size
         # 2 x interleaved scan lines of 80bytes
@@ -876,21 +976,36 @@ class CGAMode(GraphicsMode):
         y = bank + self.interleave_times * row
         return page, x, y
 
-    def set_memory(self, screen, addr, byte_array):
-        """Set bytes in CGA memory."""
-        for page, x, y, ofs, length in walk_memory(self, addr, len(byte_array)):
-            screen.drawing.put_interval(
-                page, x, y, bytes_to_interval(byte_array[ofs:ofs+length], self.ppb)
-            )
+    if numpy:
+        def set_memory(self, screen, addr, byte_array):
+            """Set bytes in CGA memory."""
+            located = self._locate_memory(addr, len(byte_array))
+            values = numpy.frombuffer(bytearray(byte_array), dtype=numpy.uint8)
+            self._put_pixel_bytes(screen, located, values[located[0]], self.ppb)
+
+        def get_memory(self, screen, addr, num_bytes):
+            """Retrieve bytes from CGA memory."""
+            byte_array = numpy.zeros(num_bytes, dtype=numpy.uint8)
+            located = self._locate_memory(addr, num_bytes)
+            byte_array[located[0]] = self._get_pixel_bytes(screen, located, self.ppb, 0)
+            return bytearray(byte_array.tostring())
+
+    else:
+        def set_memory(self, screen, addr, byte_array):
+            """Set bytes in CGA memory."""
+            for page, x, y, ofs, length in walk_memory(self, addr, len(byte_array)):
+                screen.drawing.put_interval(
+                    page, x, y, bytes_to_interval(byte_array[ofs:ofs+length], self.ppb)
+                )
 
-    def get_memory(self, screen, addr, num_bytes):
-        """Retrieve bytes from CGA memory."""
-        byte_array = bytearray(num_bytes)
-        for page, x, y, ofs, length in walk_memory(self, addr, num_bytes):
-            byte_array[ofs:ofs+length] = interval_to_bytes(
-                screen.pixels.pages[page].get_interval(x, y, length*self.ppb), self.ppb
-            )
-        return byte_array
+        def get_memory(self, screen, addr, num_bytes):
+            """Retrieve bytes from CGA memory."""
+            byte_array = bytearray(num_bytes)
+            for page, x, y, ofs, length in walk_memory(self, addr, num_bytes):
+                byte_array[ofs:ofs+length] = interval_to_bytes(
+                    screen.pixels.pages[page].get_interval(x, y, length*self.ppb), self.ppb
+                )
+            return byte_array
 
     def sprite_size_to_record(self, dx, dy):
         """Write 4-byte record of sprite size."""
@@ -898,31 +1013,47 @@ class CGAMode(GraphicsMode):
 
     def record_to_sprite_size(self, byte_array):
         """Read 4-byte record of sprite size."""
-        return struct.unpack('<HH', byte_array[0:4])
-
-    def sprite_to_array(self, attrs, dx, dy, byte_array, offs):
-        """Build the sprite byte array."""
-        row_bytes = (dx * self.bitsperpixel + 7) // 8
-        length = row_bytes*dy
-        if offs+length > len(byte_array):
-            # NOTE: if we use memoryviews instead of bytearrays, we won't need
-            # this check as the assignment will fail with ValueError anyway
-            raise ValueError('Sprite exceeds array byte size')
-        byte_array[offs:offs+length] = b'\0'*length
-        for row in attrs:
-            byte_array[offs:offs+row_bytes] = interval_to_bytes(row, 8//self.bitsperpixel, 0)
-            offs += row_bytes
-
-    def array_to_sprite(self, byte_array, offset, dx, dy):
-        """Build sprite from byte_array."""
-        row_bytes = (dx * self.bitsperpixel + 7) // 8
-        # illegal fn call if outside screen boundary
-        attrs = []
-        for y in range(dy):
-            row = bytes_to_interval(byte_array[offset:offset+row_bytes], 8//self.bitsperpixel, 1)
-            offset += row_bytes
-            attrs.append(row[:dx])
-        return attrs
+        # the record holds the width in bits
+        dx, dy = struct.unpack('<HH', byte_array[0:4])
+        return dx // self.bitsperpixel, dy
+
+    if numpy:
+        def sprite_to_array(self, attrs, dx, dy, byte_array, offs):
+            """Build the sprite byte array."""
+            row_bytes = (dx * self.bitsperpixel + 7) // 8
+            length = row_bytes*dy
+            if offs+length > len(byte_array):
+                raise ValueError('Sprite exceeds array byte size')
+            byte_array[offs:offs+length] = sprite_to_bytes(attrs, self.bitsperpixel, 1).tostring()
+
+        def array_to_sprite(self, byte_array, offset, dx, dy):
+            """Build sprite from byte_array."""
+            return bytes_to_sprite(byte_array, offset, dx, dy, self.bitsperpixel, 1)
+
+    else:
+        def sprite_to_array(self, attrs, dx, dy, byte_array, offs):
+            """Build the sprite byte array."""
+            row_bytes = (dx * self.bitsperpixel + 7) // 8
+            length = row_bytes*dy
+            if offs+length > len(byte_array):
+                # NOTE: if we use memoryviews instead of bytearrays, we won't need
+                # this check as the assignment will fail with ValueError anyway
+                raise ValueError('Sprite exceeds array byte size')
+            byte_array[offs:offs+length] = b'\0'*length
+            for row in attrs:
+                byte_array[offs:offs+row_bytes] = interval_to_bytes(row, 8//self.bitsperpixel, 0)
+                offs += row_bytes
+
+        def array_to_sprite(self, byte_array, offset, dx, dy):
+            """Build sprite from byte_array."""
+            row_bytes = (dx * self.bitsperpixel + 7) // 8
+            # illegal fn call if outside screen boundary
+            attrs = []
+            for y in range(dy):
+                row = bytes_to_interval(byte_array[offset:offset+row_bytes], 8//self.bitsperpixel, 1)
+                offset += row_bytes
+                attrs.append(row[:dx])
+            return attrs
 
     build_tile = build_tile_cga
 
@@ -970,39 +1101,64 @@ class EGAMode(GraphicsMode):
 
     def get_coords(self, addr):
         """Get video page and coordinates for address."""
-        addr = int(addr) - self.video_segment * 0x10
+        addr = addr - self.video_segment * 0x10
         # modes 7-9: 1 bit per pixel per colour plane
         page, addr = addr//self.page_size, addr%self.page_size
         x, y = (addr%self.bytes_per_row)*8, addr//self.bytes_per_row
         return page, x, y
 
-    def get_memory(self, screen, addr, num_bytes):
-        """Retrieve bytes from EGA memory."""
-        plane = self.plane % (max(self.planes_used)+1)
-        byte_array = bytearray(num_bytes)
-        if plane not in self.planes_used:
+    if numpy:
+        def get_memory(self, screen, addr, num_bytes):
+            """Retrieve bytes from EGA memory."""
+            plane = self.plane % (max(self.planes_used)+1)
+            byte_array = numpy.zeros(num_bytes, dtype=numpy.uint8)
+            if plane in self.planes_used:
+                located = self._locate_memory(addr, num_bytes)
+                byte_array[located[0]] = self._get_pixel_bytes(screen, located, self.ppb, plane)
+            return bytearray(byte_array.tostring())
+
+        def set_memory(self, screen, addr, byte_array):
+            """Set bytes in EGA video memory."""
+            # EGA memory is planar with memory-mapped colour planes.
+            # Within a plane, 8 pixels are encoded into each byte.
+            # The colour plane is set through a port OUT and
+            # determines which bit of each pixel's attribute is affected.
+            mask = self.plane_mask & self.master_plane_mask
+            # return immediately for unused colour planes
+            if mask == 0:
+                return
+            located = self._locate_memory(addr, len(byte_array))
+            values = numpy.frombuffer(bytearray(byte_array), dtype=numpy.uint8)
+            self._put_pixel_bytes(screen, located, values[located[0]], self.ppb, mask)
+
+    else:
+        def get_memory(self, screen, addr, num_bytes):
+            """Retrieve bytes from EGA memory."""
+            plane = self.plane % (max(self.planes_used)+1)
+            byte_array = bytearray(num_bytes)
+            if plane not in self.planes_used:
+                return byte_array
+            for page, x, y, ofs, length in walk_memory(self, addr, num_bytes):
+                byte_array[ofs:ofs+length] = interval_to_bytes(
+                    screen.pixels.pages[page].get_interval(x, y, length*self.ppb),
+                    self.ppb, plane
+                )
             return byte_array
-        for page, x, y, ofs, length in walk_memory(self, addr, num_bytes):
-            byte_array[ofs:ofs+length] = interval_to_bytes(
-                screen.pixels.pages[page].get_interval(x, y, length*self.ppb),
-                self.ppb, plane
-            )
-        return byte_array
-
-    def set_memory(self, screen, addr, byte_array):
-        """Set bytes in EGA video memory."""
-        # EGA memory is planar with memory-mapped colour planes.
-        # Within a plane, 8 pixels are encoded into each byte.
-        # The colour plane is set through a port OUT and
-        # determines which bit of each pixel's attribute is affected.
-        mask = self.plane_mask & self.master_plane_mask
-        # return immediately for unused colour planes
-        if mask == 0:
-            return
-        for page, x, y, ofs, length in walk_memory(self, addr, len(byte_array)):
-            screen.drawing.put_interval(page, x, y,
-                bytes_to_interval(byte_array[ofs:ofs+length], self.ppb, mask), mask
-            )
+
+        def set_memory(self, screen, addr, byte_array):
+            """Set bytes in EGA video memory."""
+            # EGA memory is planar with memory-mapped colour planes.
+            # Within a plane, 8 pixels are encoded into each byte.
+            # The colour plane is set through a port OUT and
+            # determines which bit of each pixel's attribute is affected.
+            mask = self.plane_mask & self.master_plane_mask
+            # return immediately for unused colour planes
+            if mask == 0:
+                return
+            for page, x, y, ofs, length in walk_memory(self, addr, len(byte_array)):
+                screen.drawing.put_interval(page, x, y,
+                    bytes_to_interval(byte_array[ofs:ofs+length], self.ppb, mask), mask
+                )
 
     sprite_to_array = sprite_to_array_ega
     array_to_sprite = array_to_sprite_ega
@@ -1048,7 +1204,7 @@ class Tandy6Mode(GraphicsMode):
 
     def get_coords(self, addr):
         """Get video page and coordinates for address."""
-        addr =  int(addr) - self.video_segment * 0x10
+        addr = addr - self.video_segment * 0x10
         page, addr = addr//self.page_size, addr%self.page_size
         # 4 x interleaved scan lines of 160bytes
         bank, offset = addr//self.bank_size, addr%self.bank_size
@@ -1057,34 +1213,59 @@ class Tandy6Mode(GraphicsMode):
         y = bank + 4 * row
         return page, x, y
 
-    def get_memory(self, screen, addr, num_bytes):
-        """Retrieve bytes from Tandy 640x200x4 """
-        # 8 pixels per 2 bytes
-        # low attribute bits stored in even bytes, high bits in odd bytes.
-        half_len = (num_bytes+1) // 2
-        hbytes = bytearray(half_len), bytearray(half_len)
-        for parity in (0, 1):
-            for page, x, y, ofs, length in walk_memory(self, addr, num_bytes, 2):
-                hbytes[parity][ofs:ofs+length] = interval_to_bytes(
-                    screen.pixels.pages[page].get_interval(x, y, length*self.ppb*2),
-                    self.ppb*2, parity ^ (addr%2)
-                )
-        # resulting array may be too long by one byte, so cut to size
-        return [item for pair in zip(*hbytes) for item in pair] [:num_bytes]
-
-    def set_memory(self, screen, addr, byte_array):
-        """Set bytes in Tandy 640x200x4 memory."""
-        hbytes = byte_array[0::2], byte_array[1::2]
-        # Tandy-6 encodes 8 pixels per byte, alternating colour planes.
-        # I.e. even addresses are 'colour plane 0', odd ones are 'plane 1'
-        for parity in (0, 1):
-            mask = 2 ** (parity^(addr%2))
-            for page, x, y, ofs, length in walk_memory(self, addr, len(byte_array), 2):
-                screen.drawing.put_interval(
-                    page, x, y,
-                    bytes_to_interval(hbytes[parity][ofs:ofs+length], 2*self.ppb, mask),
-                    mask
-                )
+    if numpy:
+        def _locate_planes(self, addr, num_bytes):
+            """Split located bytes into the even and odd ones, which hold the low and high planes."""
+            located = self._locate_memory(addr, num_bytes)
+            parity = (located[0] + addr) % 2
+            return [tuple(_array[parity == _plane] for _array in located) for _plane in (0, 1)]
+
+        def get_memory(self, screen, addr, num_bytes):
+            """Retrieve bytes from Tandy 640x200x4 """
+            # 8 pixels per 2 bytes
+            # low attribute bits stored in even bytes, high bits in odd bytes.
+            byte_array = numpy.zeros(num_bytes, dtype=numpy.uint8)
+            for plane, located in enumerate(self._locate_planes(addr, num_bytes)):
+                byte_array[located[0]] = self._get_pixel_bytes(screen, located, self.ppb*2, plane)
+            return bytearray(byte_array.tostring())
+
+        def set_memory(self, screen, addr, byte_array):
+            """Set bytes in Tandy 640x200x4 memory."""
+            # Tandy-6 encodes 8 pixels per byte, alternating colour planes.
+            # I.e. even addresses are 'colour plane 0', odd ones are 'plane 1'
+            values = numpy.frombuffer(bytearray(byte_array), dtype=numpy.uint8)
+            for plane, located in enumerate(self._locate_planes(addr, len(byte_array))):
+                self._put_pixel_bytes(screen, located, values[located[0]], self.ppb*2, 1 << plane)
+
+    else:
+        def get_memory(self, screen, addr, num_bytes):
+            """Retrieve bytes from Tandy 640x200x4 """
+            # 8 pixels per 2 bytes
+            # low attribute bits stored in even bytes, high bits in odd bytes.
+            half_len = (num_bytes+1) // 2
+            hbytes = bytearray(half_len), bytearray(half_len)
+            for parity in (0, 1):
+                for page, x, y, ofs, length in walk_memory(self, addr, num_bytes, 2):
+                    hbytes[parity][ofs:ofs+length] = interval_to_bytes(
+                        screen.pixels.pages[page].get_interval(x, y, length*self.ppb*2),
+                        self.ppb*2, parity ^ (addr%2)
+                    )
+            # resulting array may be too long by one byte, so cut to size
+            return [item for pair in zip(*hbytes) for item in pair] [:num_bytes]
+
+        def set_memory(self, screen, addr, byte_array):
+            """Set bytes in Tandy 640x200x4 memory."""
+            hbytes = byte_array[0::2], byte_array[1::2]
+            # Tandy-6 encodes 8 pixels per byte, alternating colour planes.
+            # I.e. even addresses are 'colour plane 0', odd ones are 'plane 1'
+            for parity in (0, 1):
+                mask = 2 ** (parity^(addr%2))
+                for page, x, y, ofs, length in walk_memory(self, addr, len(byte_array), 2):
+                    screen.drawing.put_interval(
+                        page, x, y,
+                        bytes_to_interval(hbytes[parity][ofs:ofs+length], 2*self.ppb, mask),
+                        mask
+                    )
 
     sprite_to_array = sprite_to_array_ega
     array_to_sprite = array_to_sprite_ega
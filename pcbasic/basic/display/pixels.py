@@ -25,9 +25,40 @@ class PixelBuffer(object):
         self.width = bwidth
         self.height = bheight
 
-    def copy_page(self, src, dst):
-        """Copy source to destination page."""
-        self.pages[dst].buffer[:] = self.pages[src].buffer[:]
+    if numpy:
+        def clear(self):
+            """Clear all pages, to reuse the buffer in a new mode."""
+            for page in self.pages:
+                page.buffer[:] = 0
+    else:
+        def clear(self):
+            """Clear all pages, to reuse the buffer in a new mode."""
+            for page in self.pages:
+                for row in page.buffer:
+                    row[:] = [0] * self.width
+
+    if numpy:
+        def copy_page(self, src, dst):
+            """Copy source to destination page; return the changed rect or None."""
+            src_buf, dst_buf = self.pages[src].buffer, self.pages[dst].buffer
+            diff = src_buf != dst_buf
+            rows = numpy.flatnonzero(diff.any(axis=1))
+            if not len(rows):
+                return None
+            cols = numpy.flatnonzero(diff[rows[0]:rows[-1]+1].any(axis=0))
+            y0, y1 = rows[0], rows[-1]
+            dst_buf[y0:y1+1] = src_buf[y0:y1+1]
+            return int(cols[0]), int(y0), int(cols[-1]), int(y1)
+    else:
+        def copy_page(self, src, dst):
+            """Copy source to destination page; return the changed rect or None."""
+            src_buf, dst_buf = self.pages[src].buffer, self.pages[dst].buffer
+            rows = [y for y in xrange(self.height) if src_buf[y] != dst_buf[y]]
+            if not rows:
+                return None
+            for y in rows:
+                dst_buf[y][:] = src_buf[y]
+            return 0, rows[0], self.width-1, rows[-1]
 
 
 class PixelPage(object):
@@ -64,6 +95,16 @@ class PixelPage(object):
         except IndexError:
             pass
 
+    if numpy:
+        def put_pixels(self, xs, ys, attr):
+            """Put pixels in one attribute in the buffer; coordinates must be within the page."""
+            self.buffer[ys, xs] = attr
+    else:
+        def put_pixels(self, xs, ys, attr):
+            """Put pixels in one attribute in the buffer; coordinates must be within the page."""
+            for x, y in zip(xs, ys):
+                self.buffer[y][x] = attr
+
     def get_pixel(self, x, y):
         """Get attribute of a pixel in the buffer."""
         try:
@@ -135,15 +176,18 @@ class PixelPage(object):
             except IndexError:
                 return numpy.zeros((y1-y0+1, x1-x0+1), dtype=numpy.int8)
 
-        def move_rect(self, sx0, sy0, sx1, sy1, tx0, ty0):
-            """Move pixels from an area to another, replacing with attribute 0."""
-            w, h = sx1-sx0+1, sy1-sy0+1
-            area = numpy.array(self.buffer[sy0:sy1+1, sx0:sx1+1])
-            self.buffer[sy0:sy1+1, sx0:sx1+1] = numpy.zeros((h, w), dtype=numpy.int8)
-            self.buffer[ty0:ty0+h, tx0:tx0+w] = area
+        def scroll_up(self, y0, y1, height):
+            """Scroll scanlines y0 to y1 up by height, exposing scanlines of attribute 0."""
+            self.buffer[y0:y1+1-height] = self.buffer[y0+height:y1+1]
+            self.buffer[y1+1-height:y1+1] = 0
+
+        def scroll_down(self, y0, y1, height):
+            """Scroll scanlines y0 to y1 down by height, exposing scanlines of attribute 0."""
+            self.buffer[y0+height:y1+1] = self.buffer[y0:y1+1-height]
+            self.buffer[y0:y0+height] = 0
 
         def get_until(self, x0, x1, y, c):
-            """Get the attribute values of a scanline interval [x0, x1-1]."""
+            """Return *view of* the attribute values of a scanline interval [x0, x1-1]."""
             if x0 == x1:
                 return []
             toright = x1 > x0
@@ -153,13 +197,13 @@ class PixelPage(object):
                 arr = self.buffer[y, x0:x1]
             except IndexError:
                 return []
-            found = numpy.where(arr == c)
-            if len(found[0]) > 0:
+            found = numpy.flatnonzero(arr == c)
+            if len(found) > 0:
                 if toright:
-                    arr = arr[:found[0][0]]
+                    arr = arr[:found[0]]
                 else:
-                    arr = arr[found[0][-1]+1:]
-            return list(arr.flatten())
+                    arr = arr[found[-1]+1:]
+            return arr
 
     else:
         def init_operations(self):
@@ -202,11 +246,12 @@ class PixelPage(object):
             """Apply 2d list [y][x] of attributes to an area."""
             if (x1 < x0) or (y1 < y0):
                 return
+            operation = self.operations[operation_token]
             try:
                 for y in range(y0, y1+1):
                     self.buffer[y][x0:x1+1] = [
-                        [self.operations[operation_token](a, b)
-                        for a, b in zip(self.buffer[y][x0:x1+1], array)]]
+                        operation(a, b) for a, b in zip(self.buffer[y][x0:x1+1], array[y-y0])
+                    ]
                 return [self.buffer[y][x0:x1+1] for y in range(y0, y1+1)]
             except IndexError:
                 return [[0]*(x1-x0+1) for _ in range(y1-y0+1)]
@@ -218,12 +263,20 @@ class PixelPage(object):
             except IndexError:
                 return [[0]*(x1-x0+1) for _ in range(y1-y0+1)]
 
-        def move_rect(self, sx0, sy0, sx1, sy1, tx0, ty0):
-            """Move pixels from an area to another, replacing with attribute 0."""
-            for y in range(0, sy1-sy0+1):
-                row = self.buffer[sy0+y][sx0:sx1+1]
-                self.buffer[sy0+y][sx0:sx1+1] = [0] * (sx1-sx0+1)
-                self.buffer[ty0+y][tx0:tx0+(sx1-sx0+1)] = row
+        def scroll_up(self, y0, y1, height):
+            """Scroll scanlines y0 to y1 up by height, exposing scanlines of attribute 0."""
+            # rotate the scanlines, reusing the ones scrolled out for the exposed ones
+            rows = self.buffer[y0:y1+1]
+            for row in rows[:height]:
+                row[:] = [0] * self.width
+            self.buffer[y0:y1+1] = rows[height:] + rows[:height]
+
+        def scroll_down(self, y0, y1, height):
+            """Scroll scanlines y0 to y1 down by height, exposing scanlines of attribute 0."""
+            rows = self.buffer[y0:y1+1]
+            for row in rows[-height:]:
+                row[:] = [0] * self.width
+            self.buffer[y0:y1+1] = rows[-height:] + rows[:-height]
 
         def get_until(self, x0, x1, y, c):
             """Get the attribute values of a scanline interval [x0, x1-1]."""
@@ -9,6 +9,10 @@ This file is released under the GNU GPL version 3 or later.
 import logging
 
 
+# mark bytes conversion explicitly
+int2byte = chr
+
+
 class TextRow(object):
     """Buffer for a single row of the screen."""
 
@@ -23,42 +27,64 @@ class TextRow(object):
 
     def clear(self, attr):
         """Clear the screen row buffer. Leave wrap untouched."""
-        # screen buffer, initialised to spaces
-        self.buf = [(b' ', attr)] * self.width
+        # characters and attributes, initialised to spaces
+        self.chars = bytearray(b' ' * self.width)
+        self.attrs = bytearray(int2byte(attr) * self.width)
         # character is part of double width char; 0 = no; 1 = lead, 2 = trail
-        self.double = [0] * self.width
+        self.double = bytearray(self.width)
         # last non-whitespace character
         self.end = 0
 
     def clear_from(self, scol, attr):
         """Clear characters from given position till end of row."""
-        self.buf = self.buf[:scol-1] + [(b' ', attr)] * (self.width - scol + 1)
-        self.double = self.double[:scol-1] + [0] * (self.width - scol + 1)
+        length = self.width - scol + 1
+        self.chars[scol-1:] = b' ' * length
+        self.attrs[scol-1:] = int2byte(attr) * length
+        self.double[scol-1:] = bytearray(length)
         self.end = min(self.end, scol-1)
 
     def put_char_attr(self, col, c, attr):
         """Put a byte to the screen, reinterpreting SBCS and DBCS as necessary."""
         # update the screen buffer
-        self.buf[col-1] = (c, attr)
+        self.chars[col-1] = c
+        self.attrs[col-1] = attr
         self.double[col-1] = 0
         # for sbcs codepages we're done now
         if not self._dbcs_enabled:
             return col, col
-        # mark out replaced char and changed following dbcs characters to be redrawn
-        sequences = self._conv.mark(b''.join(entry[0] for entry in self.buf), flush=True)
+        return self._mark_double(col, col)
+
+    def put_chars_attr(self, col, chars, attr):
+        """Put a run of bytes on the row, not wrapping; return the range of columns to redraw."""
+        return self.put_chars_attrs(col, chars, int2byte(attr) * len(chars))
+
+    def put_chars_attrs(self, col, chars, attrs):
+        """Put runs of bytes and attributes on the row, not wrapping; return range to redraw."""
+        stop = col + len(chars) - 1
+        self.chars[col-1:stop] = chars
+        self.attrs[col-1:stop] = attrs
+        self.double[col-1:stop] = bytearray(len(chars))
+        if not self._dbcs_enabled:
+            return col, stop
+        return self._mark_double(col, stop)
+
+    def _mark_double(self, col, last):
+        """Reinterpret DBCS after columns col to last have changed; return range to redraw."""
+        # mark out replaced chars and changed following dbcs characters to be redrawn
+        sequences = self._conv.mark(bytes(self.chars), flush=True)
         flags = ((0,) if len(seq) == 1 else (1, 2) for seq in sequences)
         old_double = self.double
-        self.double = [entry for flag in flags for entry in flag]
+        self.double = bytearray(entry for flag in flags for entry in flag)
         # find the first and last changed columns, to be able to redraw
         diff = [old != new for old, new in zip(old_double, self.double)]
         if True in diff:
             start, stop = diff.index(True) + 1, len(diff) - diff[::-1].index(True)
         else:
-            start, stop = col, col
+            start, stop = col, last
         # if the tail byte has changed, the lead byte needs to be redrawn as well
         if self.double[start-1] == 2:
             start -= 1
-        return min(col, start), max(col, stop)
+        return min(col, start), max(last, stop)
 
 
 class TextPage(object):
@@ -76,15 +102,25 @@ class TextBuffer(object):
 
     def __init__(self, attr, width, height, num_pages, codepage, do_fullwidth):
         """Initialise the screen buffer to given pages and dimensions."""
-        self._dbcs_enabled = codepage.dbcs and do_fullwidth
+        self.dbcs_enabled = codepage.dbcs and do_fullwidth
         self._conv = codepage.get_converter(preserve=b'')
         self.pages = [
-            TextPage(attr, width, height, self._conv, self._dbcs_enabled)
+            TextPage(attr, width, height, self._conv, self.dbcs_enabled)
             for _ in range(num_pages)
         ]
         self.width = width
         self.height = height
 
+    def reset(self, attr):
+        """Clear all pages and unwrap all rows, to reuse the buffer in a new mode."""
+        # assign the same blank row everywhere rather than clearing row by row
+        chars, attrs = b' ' * self.width, int2byte(attr) * self.width
+        double = bytes(bytearray(self.width))
+        for page in self.pages:
+            for row in page.row:
+                row.chars[:], row.attrs[:], row.double[:] = chars, attrs, double
+                row.end, row.wrap = 0, False
+
     def __str__(self):
         """Return a string representation of the screen buffer (for debugging)."""
         horiz_bar = ('  +' + '-' * self.width + '+')
@@ -93,13 +129,12 @@ class TextBuffer(object):
         for num, page in enumerate(self.pages):
             row_strs += [horiz_bar]
             for i, row in enumerate(page.row):
-                s = [ c[0] for c in row.buf ]
                 outstr = '{0:2}'.format(i)
                 if lastwrap:
                     outstr += ('\\')
                 else:
                     outstr += ('|')
-                outstr += (''.join(s))
+                outstr += bytes(row.chars)
                 if row.wrap:
                     row_strs.append(outstr + '\\ {0:2}'.format(row.end))
                 else:
@@ -113,40 +148,72 @@ class TextBuffer(object):
         for x in range(self.height):
             dstrow = self.pages[dst].row[x]
             srcrow = self.pages[src].row[x]
-            dstrow.buf[:] = srcrow.buf[:]
+            dstrow.chars[:] = srcrow.chars
+            dstrow.attrs[:] = srcrow.attrs
+            dstrow.double[:] = srcrow.double
             dstrow.end = srcrow.end
             dstrow.wrap = srcrow.wrap
 
     def clear_area(self, pagenum, row0, col0, row1, col1, attr):
         """Clear a rectangular area of the screen."""
+        length = col1 - col0 + 1
         for r in range(row0-1, row1):
-            self.pages[pagenum].row[r].buf[col0-1:col1] = [(b' ', attr)] * (col1 - col0 + 1)
+            therow = self.pages[pagenum].row[r]
+            therow.chars[col0-1:col1] = b' ' * length
+            therow.attrs[col0-1:col1] = int2byte(attr) * length
 
     def put_char_attr(self, pagenum, row, col, c, attr):
         """Put a byte to the screen, reinterpreting SBCS and DBCS as necessary."""
         return self.pages[pagenum].row[row-1].put_char_attr(col, c, attr)
 
+    def put_chars_attr(self, pagenum, row, col, chars, attr):
+        """Put a run of bytes on a row, reinterpreting SBCS and DBCS as necessary."""
+        return self.pages[pagenum].row[row-1].put_chars_attr(col, chars, attr)
+
+    def put_chars_attrs(self, pagenum, row, col, chars, attrs):
+        """Put runs of bytes and attributes on a row, reinterpreting SBCS and DBCS as necessary."""
+        return self.pages[pagenum].row[row-1].put_chars_attrs(col, chars, attrs)
+
     def scroll_up(self, pagenum, from_line, bottom, attr):
         """Scroll up."""
-        self.pages[pagenum].row.insert(
-            bottom, TextRow(attr, self.width, self._conv, self._dbcs_enabled)
-        )
-        del self.pages[pagenum].row[from_line-1]
+        # rotate the rows, reusing the one scrolled out as the new bottom row
+        rows = self.pages[pagenum].row
+        therow = rows.pop(from_line-1)
+        therow.clear(attr)
+        therow.wrap = False
+        rows.insert(bottom-1, therow)
 
     def scroll_down(self, pagenum, from_line, bottom, attr):
         """Scroll down."""
-        self.pages[pagenum].row.insert(
-            from_line - 1, TextRow(attr, self.width, self._conv, self._dbcs_enabled)
-        )
-        del self.pages[pagenum].row[bottom-1]
+        rows = self.pages[pagenum].row
+        therow = rows.pop(bottom-1)
+        therow.clear(attr)
+        therow.wrap = False
+        rows.insert(from_line-1, therow)
 
     def get_char(self, pagenum, row, col):
         """Retrieve a byte from the screen (SBCS or DBCS half-char)."""
-        return ord(self.pages[pagenum].row[row-1].buf[col-1][0])
+        return self.pages[pagenum].row[row-1].chars[col-1]
 
     def get_attr(self, pagenum, row, col):
         """Retrieve attribute from the screen."""
-        return self.pages[pagenum].row[row-1].buf[col-1][1]
+        return self.pages[pagenum].row[row-1].attrs[col-1]
+
+    def get_chars(self, pagenum, row, start_col, stop_col):
+        """Retrieve the bytes in a run of columns on a row."""
+        return self.pages[pagenum].row[row-1].chars[start_col-1:stop_col]
+
+    def get_attrs(self, pagenum, row, start_col, stop_col):
+        """Retrieve the attributes in a run of columns on a row."""
+        return self.pages[pagenum].row[row-1].attrs[start_col-1:stop_col]
+
+    def get_rect(self, pagenum, start_row, start_col, stop_row, stop_col):
+        """Retrieve lists of the bytes and the attributes in each row of a rectangle."""
+        rows = self.pages[pagenum].row[start_row-1:stop_row]
+        return (
+            [bytes(_row.chars[start_col-1:stop_col]) for _row in rows],
+            [_row.attrs[start_col-1:stop_col] for _row in rows]
+        )
 
     def get_charwidth(self, pagenum, row, col):
         """Retrieve DBCS character width in bytes."""
@@ -161,12 +228,9 @@ class TextBuffer(object):
         """Retrieve SBCS or DBCS character."""
         therow = self.pages[pagenum].row[row-1]
         if therow.double[col-1] == 1:
-            ca = therow.buf[col-1]
-            da = therow.buf[col]
-            char, attr = ca[0] + da[0], da[1]
+            char, attr = bytes(therow.chars[col-1:col+1]), therow.attrs[col]
         elif therow.double[col-1] == 0:
-            ca = therow.buf[col-1]
-            char, attr = ca[0], ca[1]
+            char, attr = int2byte(therow.chars[col-1]), therow.attrs[col-1]
         else:
             char, attr = b'\0', 0
             logging.debug('DBCS buffer corrupted at %d, %d (%d)', row, col, therow.double[col-1])
@@ -174,10 +238,7 @@ class TextBuffer(object):
 
     def get_text_raw(self, pagenum):
         """Retrieve all raw text on a page."""
-        return tuple(
-            b''.join(c for c, _ in self.pages[pagenum].row[row_index].buf)
-            for row_index in range(self.pages[pagenum].height)
-        )
+        return tuple(bytes(_row.chars) for _row in self.pages[pagenum].row)
 
     ###########################################################################
     # logical lines
@@ -194,14 +255,18 @@ class TextBuffer(object):
         full = []
         clip = []
         while r < stop_row or (r == stop_row and c < stop_col):
-            clip.append(self.pages[pagenum].row[r-1].buf[c-1][0])
-            c += 1
-            if c > self.pages[pagenum].row[r-1].end:
-                if not self.pages[pagenum].row[r-1].wrap:
-                    full.append(b''.join(clip))
-                    clip = []
-                r += 1
-                c = 1
+            therow = self.pages[pagenum].row[r-1]
+            # take at least one character, up to the end of the row or the selection
+            row_last = max(c, therow.end)
+            last = min(row_last, stop_col-1) if r == stop_row else row_last
+            clip.append(bytes(therow.chars[c-1:last]))
+            if last < row_last:
+                break
+            if not therow.wrap:
+                full.append(b''.join(clip))
+                clip = []
+            r += 1
+            c = 1
         full.append(b''.join(clip))
         return full
 
@@ -230,7 +295,7 @@ class TextBuffer(object):
         # add all rows of the logical line
         for row in range(srow, self.height+1):
             therow = self.pages[pagenum].row[row-1]
-            line += bytearray(pair[0] for pair in therow.buf[scol-1:therow.end])
+            line += therow.chars[scol-1:therow.end]
             # continue so long as the line wraps
             if not therow.wrap:
                 break
@@ -257,11 +322,9 @@ class TextBuffer(object):
                 therow = self.pages[pagenum].row[row-1]
                 # exclude prompt, if any; only go from furthest_left to furthest_right
                 if row == prompt_row:
-                    rowpairs = therow.buf[:therow.end][left-1:right-1]
+                    line += therow.chars[:therow.end][left-1:right-1]
                 else:
-                    rowpairs = therow.buf[:therow.end]
-                # get characters from char/attr pairs and convert to bytearray
-                line += bytearray(pair[0] for pair in rowpairs)
+                    line += therow.chars[:therow.end]
                 if not therow.wrap:
                     break
                 # wrap before end of line means LF
@@ -6,6 +6,7 @@ Text operations
 This file is released under the GNU GPL version 3 or later.
 """
 
+import re
 import logging
 
 from ..base import signals
@@ -20,6 +21,9 @@ from .textbase import BottomBar, Cursor, ScrollArea
 # mark bytes conversion explicitly
 int2byte = chr
 
+# single control characters interpreted by write(), or runs of characters put on the screen
+_WRITE_TOKENS = re.compile(b'[\t\n\r\a\x0B\x0C\x1C-\x1F]|[^\t\n\r\a\x0B\x0C\x1C-\x1F]+')
+
 
 class TextScreen(object):
     """Text screen."""
@@ -52,6 +56,21 @@ class TextScreen(object):
         }
         # function key macros
         self.bottom_bar = BottomBar()
+        # headless: no interface attached, don't send text updates to the video queue
+        self._headless = False
+        # screen buffers by dimensions and number of pages, reused on mode switches
+        self._text_buffers = {}
+        # glyph caches by font size, reused on mode switches
+        self._glyph_caches = {}
+
+    def __getstate__(self):
+        """Pickle."""
+        pickle_dict = self.__dict__.copy()
+        # only the current buffer needs to be kept
+        pickle_dict['_text_buffers'] = {}
+        # a resumed session's interface holds no glyphs
+        pickle_dict['_glyph_caches'] = {}
+        return pickle_dict
 
     def init_mode(self, mode, pixels, attr, vpagenum, apagenum):
         """Reset the text screen for new video mode."""
@@ -59,13 +78,27 @@ class TextScreen(object):
         self.attr = attr
         self.apagenum = apagenum
         self.vpagenum = vpagenum
-        # set up glyph cache and preload halfwidth glyphs (i.e. single-byte code points)
-        self._glyphs = font.GlyphCache(self.mode, self.fonts, self.codepage, self.queues)
-        # build the screen buffer
-        self.text = TextBuffer(
-            self.attr, self.mode.width, self.mode.height, self.mode.num_pages,
-            self.codepage, do_fullwidth=(self.mode.font_height >= 14)
-        )
+        # set up glyph cache; glyphs are built when first used
+        # the interface keeps its glyphs by font size too, so those it holds need not be resent
+        key = self.mode.font_height, self.mode.font_width, self.mode.is_text_mode
+        try:
+            self._glyphs = self._glyph_caches[key]
+            self._glyphs.init_mode(self.mode)
+        except KeyError:
+            self._glyphs = self._glyph_caches[key] = font.GlyphCache(
+                self.mode, self.fonts, self.codepage, self.queues
+            )
+        # build the screen buffer, or clear one of the same shape
+        do_fullwidth = self.mode.font_height >= 14
+        key = self.mode.width, self.mode.height, self.mode.num_pages, do_fullwidth
+        try:
+            self.text = self._text_buffers[key]
+            self.text.reset(self.attr)
+        except KeyError:
+            self.text = self._text_buffers[key] = TextBuffer(
+                self.attr, self.mode.width, self.mode.height, self.mode.num_pages,
+                self.codepage, do_fullwidth
+            )
         # pixel buffer
         self.pixels = pixels
         # redraw key line
@@ -76,6 +109,10 @@ class TextScreen(object):
         # rebuild the cursor
         self.cursor.init_mode(self.mode, self.attr)
 
+    def set_headless(self, headless):
+        """Switch off sending text to the video queue; the screen needs a rebuild on switching back."""
+        self._headless = headless
+
     def set_page(self, vpagenum, apagenum):
         """Set visible and active page."""
         self.vpagenum = vpagenum
@@ -94,11 +131,25 @@ class TextScreen(object):
             )
             raise error.BASICError(error.IFC)
 
+    def rebuild_glyph(self, ordval):
+        """Rebuild a character after its RAM font face has changed."""
+        for glyphs in self._glyph_caches.itervalues():
+            glyphs.drop_glyph(ordval)
+        self._glyphs.rebuild_glyph(ordval)
+
     def rebuild(self):
         """Completely resubmit the text screen to the interface."""
+        # the interface may be new and hold no glyphs for other font sizes
+        self._glyph_caches = {
+            _key: _glyphs for _key, _glyphs in self._glyph_caches.iteritems()
+            if _glyphs is self._glyphs
+        }
         # send the glyph dict to interface if necessary
         self._glyphs.submit()
-        # fix the cursor
+        # fix the cursor; width is not kept up to date when headless
+        self.cursor.set_width(
+            self.text.get_charwidth(self.apagenum, self.current_row, self.current_col)
+        )
         self.queues.video.put(signals.Event(
             signals.VIDEO_SET_CURSOR_SHAPE,
             (self.cursor.width, self.mode.font_height, self.cursor.from_line, self.cursor.to_line)
@@ -140,7 +191,7 @@ class TextScreen(object):
         last = b''
         # if our line wrapped at the end before, it doesn't anymore
         self.text.pages[self.apagenum].row[self.current_row-1].wrap = False
-        for c in s:
+        for c in _WRITE_TOKENS.findall(s):
             row, col = self.current_row, self.current_col
             if c == b'\t':
                 # TAB
@@ -181,7 +232,7 @@ class TextScreen(object):
                 self.set_pos(row + 1, col, scroll_ok)
             else:
                 # includes \b, \0, and non-control chars
-                self.write_char(c)
+                self.write_chars(c)
             last = c
 
     def write_line(self, s=b'', scroll_ok=True, do_echo=True):
@@ -230,6 +281,32 @@ class TextScreen(object):
         # move cursor and see if we need to scroll up
         self._check_pos(scroll_ok=True)
 
+    def write_chars(self, chars):
+        """Put a run of characters at the current position, a row span at a time."""
+        i = 0
+        while i < len(chars):
+            if self.overflow or self.current_col > self.mode.width:
+                # wrapping needed, go through the single-character path
+                self.write_char(chars[i])
+                i += 1
+                continue
+            # scroll up if needed
+            self._check_pos(scroll_ok=True)
+            row, col = self.current_row, self.current_col
+            span = chars[i:i + self.mode.width - col + 1]
+            self.put_chars_attr(self.apagenum, row, col, span, self.attr)
+            # adjust end of line marker
+            therow = self.text.pages[self.apagenum].row[row-1]
+            therow.end = max(therow.end, col + len(span) - 1)
+            # as in write_char, only move to the next row when the next char is printed
+            if col + len(span) > self.mode.width:
+                self.current_col = self.mode.width
+                self.overflow = True
+            else:
+                self.current_col = col + len(span)
+            self._check_pos(scroll_ok=True)
+            i += len(span)
+
     def _check_wrap(self, do_scroll_down):
         """Wrap if we need to."""
         if self.current_col > self.mode.width:
@@ -329,6 +406,8 @@ class TextScreen(object):
     def _move_cursor(self, row, col):
         """Move the cursor to a new position."""
         self.current_row, self.current_col = row, col
+        if self._headless:
+            return
         # set halfwidth/fullwidth cursor
         width = self.text.get_charwidth(self.apagenum, self.current_row, self.current_col)
         self.cursor.set_width(width)
@@ -357,34 +436,76 @@ class TextScreen(object):
         if not self.mode.is_text_mode:
             attr = attr & 0xf
         start, stop = self.text.put_char_attr(pagenum, row, col, c, attr)
+        if self._headless and self.mode.is_text_mode:
+            # nothing to draw
+            return
         if one_only:
             stop = start
         # update the screen
         self.refresh_range(pagenum, row, start, stop)
 
+    def put_chars_attr(self, pagenum, row, col, chars, attr):
+        """Put a run of bytes on a screen row without wrapping, redrawing as necessary."""
+        if not self.mode.is_text_mode:
+            attr = attr & 0xf
+        start, stop = self.text.put_chars_attr(pagenum, row, col, chars, attr)
+        if self._headless and self.mode.is_text_mode:
+            return
+        if self.text.dbcs_enabled:
+            # DBCS sequences may have changed beyond the run
+            self.refresh_range(pagenum, row, start, stop)
+        else:
+            self._draw_runs(pagenum, row, [(col, chars, self.mode.split_attr(attr))])
+
     ###########################################################################
 
     def refresh_range(self, pagenum, row, start, stop, text_only=False):
         """Redraw a section of a screen row, assuming DBCS buffer has been set."""
-        therow = self.text.pages[pagenum].row[row-1]
-        col = start
+        # split into runs of halfwidth characters in the same attribute; fullwidth chars are separate
+        runs = []
+        col, last_attr = start, None
         while col <= stop:
-            r, c = row, col
             char, attr = self.text.get_fullchar_attr(pagenum, row, col)
+            if len(char) == 1 and attr == last_attr:
+                runs[-1][1].append(char)
+            else:
+                runs.append((col, [char], self.mode.split_attr(attr)))
+                last_attr = attr if len(char) == 1 else None
             col += len(char)
-            # ensure glyph is stored
-            self._glyphs.check_char(char)
-            fore, back, blink, underline = self.mode.split_attr(attr)
-            self.queues.video.put(signals.Event(
-                signals.VIDEO_PUT_GLYPH, (
-                    pagenum, r, c, self.codepage.to_unicode(char, u'\0'),
-                    len(char) > 1, fore, back, blink, underline,
-                )
-            ))
-            if not self.mode.is_text_mode and not text_only:
-                # update pixel buffer
-                x0, y0, x1, y1, sprite = self._glyphs.get_sprite(r, c, char, fore, back)
-                self.pixels.pages[self.apagenum].put_rect(x0, y0, x1, y1, sprite, tk.PSET)
+        self._draw_runs(pagenum, row, runs, text_only)
+
+    def _draw_runs(self, pagenum, row, runs, text_only=False):
+        """Send runs of (col, chars, split attribute) on a row to the interface and pixel buffer."""
+        if not runs:
+            return
+        if not self._headless:
+            # ensure glyphs are stored
+            self._glyphs.check_chars(set(_char for _, _chars, _ in runs for _char in _chars))
+            for col, chars, (fore, back, blink, underline) in runs:
+                if len(chars[0]) > 1:
+                    self.queues.video.put(signals.Event(
+                        signals.VIDEO_PUT_GLYPH, (
+                            pagenum, row, col, self.codepage.to_unicode(chars[0], u'\0'),
+                            True, fore, back, blink, underline,
+                        )
+                    ))
+                else:
+                    self.queues.video.put(signals.Event(
+                        signals.VIDEO_PUT_TEXT, (
+                            pagenum, row, col,
+                            [self.codepage.to_unicode(char, u'\0') for char in chars],
+                            fore, back, blink, underline
+                        )
+                    ))
+        if not self.mode.is_text_mode and not text_only:
+            # update pixel buffer with the whole span at once
+            x0, y0, x1, y1, sprite = self._glyphs.get_row_sprite(row, runs[0][0], [
+                (char, fore, back)
+                for _, chars, (fore, back, _, _) in runs
+                for char in chars
+            ])
+            self.pixels.pages[self.apagenum].put_rect(x0, y0, x1, y1, sprite, tk.PSET)
+            if not self._headless:
                 self.queues.video.put(signals.Event(
                     signals.VIDEO_PUT_RECT, (self.apagenum, x0, y0, x1, y1, sprite)
                 ))
@@ -485,35 +606,33 @@ class TextScreen(object):
             from_line = self.scroll_area.top
         _, back, _, _ = self.mode.split_attr(self.attr)
         self.queues.video.put(signals.Event(
-            signals.VIDEO_SCROLL_UP, (from_line, self.scroll_area.bottom, back)
+            signals.VIDEO_SCROLL_UP, (from_line, self.scroll_area.bottom, back, 1)
         ))
         if self.current_row > from_line:
             self.current_row -= 1
         # sync buffers with the new screen reality:
         self.text.scroll_up(self.apagenum, from_line, self.scroll_area.bottom, self.attr)
         if not self.mode.is_text_mode:
-            sx0, sy0, sx1, sy1 = self.mode.text_to_pixel_area(from_line+1, 1,
-                self.scroll_area.bottom, self.mode.width)
-            tx0, ty0, _, _ = self.mode.text_to_pixel_area(from_line, 1,
-                self.scroll_area.bottom-1, self.mode.width)
-            self.pixels.pages[self.apagenum].move_rect(sx0, sy0, sx1, sy1, tx0, ty0)
+            _, y0, _, y1 = self.mode.text_to_pixel_area(
+                from_line, 1, self.scroll_area.bottom, self.mode.width
+            )
+            self.pixels.pages[self.apagenum].scroll_up(y0, y1, self.mode.font_height)
 
     def scroll_down(self, from_line):
         """Scroll the scroll region down by one line, starting at from_line."""
         _, back, _, _ = self.mode.split_attr(self.attr)
         self.queues.video.put(signals.Event(
-            signals.VIDEO_SCROLL_DOWN, (from_line, self.scroll_area.bottom, back)
+            signals.VIDEO_SCROLL_DOWN, (from_line, self.scroll_area.bottom, back, 1)
         ))
         if self.current_row >= from_line:
             self.current_row += 1
         # sync buffers with the new screen reality:
         self.text.scroll_down(self.apagenum, from_line, self.scroll_area.bottom, self.attr)
         if not self.mode.is_text_mode:
-            sx0, sy0, sx1, sy1 = self.mode.text_to_pixel_area(from_line, 1,
-                self.scroll_area.bottom-1, self.mode.width)
-            tx0, ty0, _, _ = self.mode.text_to_pixel_area(from_line+1, 1,
-                self.scroll_area.bottom, self.mode.width)
-            self.pixels.pages[self.apagenum].move_rect(sx0, sy0, sx1, sy1, tx0, ty0)
+            _, y0, _, y1 = self.mode.text_to_pixel_area(
+                from_line, 1, self.scroll_area.bottom, self.mode.width
+            )
+            self.pixels.pages[self.apagenum].scroll_down(y0, y1, self.mode.font_height)
 
     ###########################################################################
     # console operations
@@ -580,9 +699,11 @@ class TextScreen(object):
         for c in sequence:
             while True:
                 therow = self.text.pages[self.apagenum].row[row-1]
-                therow.buf.insert(col-1, (c, attr))
+                therow.chars.insert(col-1, c)
+                therow.attrs.insert(col-1, attr)
                 if therow.end < self.mode.width:
-                    therow.buf.pop()
+                    therow.chars.pop()
+                    therow.attrs.pop()
                     if therow.end > col-1:
                         therow.end += 1
                     else:
@@ -595,7 +716,7 @@ class TextScreen(object):
                     if not therow.wrap and row < self.mode.height:
                         self.scroll_down(row+1)
                         therow.wrap = True
-                    c, attr = therow.buf.pop()
+                    c, attr = int2byte(therow.chars.pop()), therow.attrs.pop()
                     row += 1
                     col = 1
             col += 1
@@ -8,6 +8,7 @@ This file is released under the GNU GPL version 3 or later.
 
 import time
 import Queue
+from collections import OrderedDict
 
 from .base import error
 from .base import scancode
@@ -94,11 +95,247 @@ class NullQueue(object):
         pass
 
 
+class VideoQueue(object):
+    """Video queue wrapper that coalesces writes, scrolls, palette changes and cursor changes."""
+
+    # pixel writes, with a function giving the affected page and rect
+    _pixel_events = {
+        signals.VIDEO_PUT_PIXEL: lambda p, x, y, _: (p, x, y, x, y),
+        signals.VIDEO_PUT_INTERVAL: lambda p, x, y, c: (p, x, y, x+len(c)-1, y),
+        signals.VIDEO_FILL_INTERVAL: lambda p, x0, x1, y, _: (p, x0, y, x1, y),
+        signals.VIDEO_PUT_RECT: lambda p, x0, y0, x1, y1, _: (p, x0, y0, x1, y1),
+        signals.VIDEO_FILL_RECT: lambda p, x0, y0, x1, y1, _: (p, x0, y0, x1, y1),
+    }
+    # scrolls, with the direction in which they move the rows
+    _scroll_events = {signals.VIDEO_SCROLL_UP: -1, signals.VIDEO_SCROLL_DOWN: 1}
+    # events that do not interact with pixels or glyphs and need not wait for them
+    _independent_events = (
+        signals.VIDEO_SHOW_CURSOR, signals.VIDEO_SET_CAPTION, signals.VIDEO_SET_CLIPBOARD_TEXT,
+    )
+
+    def __init__(self, queue, pixels=None, shared_framebuffer=False):
+        """Wrap a video queue."""
+        self._queue = queue
+        self._pixels = pixels
+        # interface reads from our pixel buffer, only send the dirty rects
+        self._shared = shared_framebuffer
+        self._apagenum = 0
+        # height of a text row in pixels
+        self._row_height = None
+        # pending scroll of the active page, as [event_type, from_line, bottom, back, count]
+        self._scroll = None
+        # dirty rect per page, as [x0, y0, x1, y1]
+        self._dirty = {}
+        # latest glyph writes per page and row, then per column; text runs also keyed by length
+        self._glyphs = {}
+        # latest cursor move and attribute
+        self._cursor = None
+        self._cursor_attr = None
+        # latest palette change
+        self._palette = None
+        self._last_flush = time.time()
+
+    def set_pixels(self, pixels):
+        """Set the pixel buffer that holds the contents of dirty rects."""
+        self.flush()
+        self._pixels = pixels
+        if self._shared:
+            self._queue.put(signals.Event(signals.VIDEO_SET_FRAMEBUFFER, (pixels,)))
+
+    def put(self, item, block=True, timeout=None):
+        """Queue an event; writes and cursor moves are held back until the next flush."""
+        if item.event_type in self._pixel_events and self._pixels is not None:
+            pagenum, x0, y0, x1, y1 = self._pixel_events[item.event_type](*item.params)
+            if x1 < x0 or y1 < y0:
+                return
+            try:
+                rect = self._dirty[pagenum]
+            except KeyError:
+                self._dirty[pagenum] = [x0, y0, x1, y1]
+            else:
+                rect[:] = min(rect[0], x0), min(rect[1], y0), max(rect[2], x1), max(rect[3], y1)
+        elif item.event_type == signals.VIDEO_PUT_GLYPH:
+            self._put_glyph(item, item.params[2:3])
+        elif item.event_type == signals.VIDEO_PUT_TEXT:
+            # a later run over exactly the same cells replaces an earlier one
+            self._put_glyph(item, (item.params[2], len(item.params[3])))
+        elif item.event_type in self._scroll_events:
+            self._put_scroll(item)
+        elif item.event_type == signals.VIDEO_MOVE_CURSOR:
+            self._cursor = item
+        elif item.event_type == signals.VIDEO_SET_CURSOR_ATTR:
+            self._cursor_attr = item
+        elif item.event_type == signals.VIDEO_SET_PALETTE:
+            # the palette applies to the whole screen, only the latest one needs to be shown
+            self._palette = item
+        elif item.event_type in self._independent_events:
+            self._queue.put(item, block, timeout)
+        elif item.event_type == signals.VIDEO_BUILD_GLYPHS and not self._drops_glyphs(item):
+            # new glyphs arrive ahead of the held-back writes that use them
+            self._queue.put(item, block, timeout)
+        else:
+            self.flush()
+            self._queue.put(item, block, timeout)
+            if item.event_type == signals.VIDEO_SET_PAGE:
+                _, self._apagenum = item.params
+            elif item.event_type == signals.VIDEO_SET_MODE:
+                self._row_height = item.params[0].font_height
+            elif self._shared and self._pixels is not None:
+                # the pixel buffer is changed by the interpreter, not the interface
+                if item.event_type == signals.VIDEO_CLEAR_ROWS:
+                    self._set_dirty(self._apagenum)
+
+    def _drops_glyphs(self, item):
+        """Glyph event lets go of glyphs that held-back writes may still need."""
+        return any(_glyph is None for _glyph in item.params[0].itervalues())
+
+    def _put_glyph(self, item, key):
+        """Hold back a glyph write; a later write replaces an earlier one on the same key."""
+        try:
+            row_glyphs = self._glyphs[item.params[:2]]
+        except KeyError:
+            row_glyphs = self._glyphs[item.params[:2]] = OrderedDict()
+        # later writes move to the end to keep fullwidth overlaps right
+        row_glyphs.pop(key, None)
+        row_glyphs[key] = item
+
+    def _put_scroll(self, item):
+        """Add a scroll to the pending one and move held-back writes along with it."""
+        from_line, bottom, back, count = item.params
+        key = [item.event_type, from_line, bottom, back]
+        if self._scroll and self._scroll[:4] != key:
+            self.flush()
+        if not self._scroll:
+            self._scroll = key + [0]
+        self._scroll[4] += count
+        rows = self._scroll_events[item.event_type] * count
+        self._shift_glyphs(from_line, bottom, rows)
+        if self._pixels is not None:
+            self._shift_dirty(from_line, bottom, rows)
+
+    def _shift_glyphs(self, from_line, bottom, rows):
+        """Move held-back glyph writes on the active page by a number of rows within a region."""
+        glyphs = {}
+        for (pagenum, row), row_glyphs in self._glyphs.iteritems():
+            if pagenum == self._apagenum and from_line <= row <= bottom:
+                row += rows
+                # drop writes that have scrolled out of the region
+                if not from_line <= row <= bottom:
+                    continue
+            glyphs[pagenum, row] = row_glyphs
+        self._glyphs = glyphs
+
+    def _shift_dirty(self, from_line, bottom, rows):
+        """Move the dirty rect of the active page by a number of rows within a region."""
+        if self._row_height is None:
+            self._set_dirty(self._apagenum)
+            return
+        page = self._pixels.pages[self._apagenum]
+        y0, y1 = (from_line-1) * self._row_height, bottom * self._row_height - 1
+        try:
+            rect = self._dirty[self._apagenum]
+        except KeyError:
+            rect = None
+        if self._shared:
+            # the interface reads the scrolled region from our pixel buffer
+            if rect:
+                rect[:] = 0, min(rect[1], y0), page.width-1, max(rect[3], y1)
+            else:
+                self._dirty[self._apagenum] = [0, y0, page.width-1, y1]
+        elif rect and y0 <= rect[1] and rect[3] <= y1:
+            # the interface scrolls its own pixels; move the changes with them
+            rect[1] = max(y0, rect[1] + rows * self._row_height)
+            rect[3] = min(y1, rect[3] + rows * self._row_height)
+            if rect[1] > rect[3]:
+                del self._dirty[self._apagenum]
+        elif rect and rect[1] <= y1 and y0 <= rect[3]:
+            # changes partly inside the region; include all of the region
+            rect[:] = 0, min(rect[1], y0), page.width-1, max(rect[3], y1)
+
+    def _set_dirty(self, pagenum):
+        """Mark a whole page as changed."""
+        page = self._pixels.pages[pagenum]
+        self._dirty[pagenum] = [0, 0, page.width-1, page.height-1]
+
+    def put_nowait(self, item):
+        """Queue an event."""
+        self.put(item, False)
+
+    def flush(self):
+        """Send held-back palette, scroll, glyph writes, cursor and a rect for each dirty page."""
+        self._last_flush = time.time()
+        # glyph attributes depend on the palette size, so it goes first
+        if self._palette:
+            self._queue.put(self._palette)
+            self._palette = None
+        # held-back writes have been moved to where they are after the scroll
+        if self._scroll:
+            event_type, from_line, bottom, back, count = self._scroll
+            self._queue.put(signals.Event(event_type, (from_line, bottom, back, count)))
+            self._scroll = None
+        for (pagenum, row), row_glyphs in self._glyphs.iteritems():
+            for item in row_glyphs.itervalues():
+                if item.params[1] != row:
+                    item = signals.Event(item.event_type, (pagenum, row) + item.params[2:])
+                self._queue.put(item)
+        self._glyphs.clear()
+        if self._cursor_attr:
+            self._queue.put(self._cursor_attr)
+            self._cursor_attr = None
+        if self._cursor:
+            self._queue.put(self._cursor)
+            self._cursor = None
+        for pagenum, (x0, y0, x1, y1) in self._dirty.iteritems():
+            page = self._pixels.pages[pagenum]
+            x0, y0 = max(0, x0), max(0, y0)
+            x1, y1 = min(page.width-1, x1), min(page.height-1, y1)
+            if x0 > x1 or y0 > y1:
+                continue
+            if self._shared:
+                self._queue.put(signals.Event(signals.VIDEO_UPDATE_RECT, (pagenum, x0, y0, x1, y1)))
+            else:
+                self._queue.put(signals.Event(
+                    signals.VIDEO_PUT_RECT, (pagenum, x0, y0, x1, y1, page.get_rect(x0, y0, x1, y1))
+                ))
+        self._dirty.clear()
+
+    def _held_back(self):
+        """Any events are held back."""
+        return bool(
+            self._dirty or self._glyphs or self._scroll
+            or self._cursor or self._cursor_attr or self._palette
+        )
+
+    def tick(self, interval):
+        """Flush if the last flush was longer ago than the given interval."""
+        if self._held_back() and time.time() - self._last_flush >= interval:
+            self.flush()
+
+    def qsize(self):
+        """Number of events on the queue, not counting held-back writes."""
+        return self._queue.qsize()
+
+    def empty(self):
+        """Queue is empty and nothing is held back."""
+        return not self._held_back() and self._queue.empty()
+
+    def full(self):
+        """Queue is full."""
+        return self._queue.full()
+
+    def join(self):
+        """Flush and wait until the interface has processed all events."""
+        self.flush()
+        self._queue.join()
+
+
 class EventQueues(object):
     """Manage interface queues."""
 
     tick = 0.006
     max_video_qsize = 500
+    # time to hold back pixel and glyph writes for coalescing
+    video_flush_interval = 0.02
     max_audio_qsize = 20
 
     def __init__(self, values, ctrl_c_is_break, inputs=None, video=None, audio=None):
@@ -112,14 +349,30 @@ class EventQueues(object):
         self._ctrl_c_is_break = ctrl_c_is_break
         # F12 replacement events
         self._f12_active = False
+        # pixel buffer of the current graphics mode
+        self._pixels = None
         self.set(inputs, video, audio)
 
-    def set(self, inputs=None, video=None, audio=None):
+    def set(self, inputs=None, video=None, audio=None, shared_framebuffer=False):
         """Set; default is NullQueues."""
         self.inputs = inputs or NullQueue()
-        self.video = video or NullQueue()
+        if video:
+            self.video = VideoQueue(video, self._pixels, shared_framebuffer)
+        else:
+            self.video = NullQueue()
         self.audio = audio or NullQueue()
 
+    def set_pixels(self, pixels):
+        """Set the pixel buffer used to coalesce video events."""
+        self._pixels = pixels
+        if isinstance(self.video, VideoQueue):
+            self.video.set_pixels(pixels)
+
+    def flush_video(self):
+        """Send held-back video events to the interface."""
+        if isinstance(self.video, VideoQueue):
+            self.video.flush()
+
     def __getstate__(self):
         """Don't pickle queues."""
         pickle_dict = self.__dict__.copy()
@@ -148,6 +401,8 @@ class EventQueues(object):
         # and we have put a lot of work on the queue
         # this works because Interface will send KEYB_QUIT on termination
         self._check_input(event_check_input)
+        if isinstance(self.video, VideoQueue):
+            self.video.tick(self.video_flush_interval)
         # avoid screen lockups if video queue fills up
         if self.video.qsize() > self.max_video_qsize:
             # note that this really slows down screen writing
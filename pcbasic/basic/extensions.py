@@ -7,46 +7,82 @@ This file is released under the GNU GPL version 3 or later.
 """
 
 import logging
+import numbers
 from importlib import import_module
 from collections import Iterable
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from .base import error
 from . import values
 
+
+# conversion of BASIC arguments to Python, by BASIC type
+ARG_CONVERTERS = {
+    values.Integer: values.Integer.to_int,
+    values.Single: values.Single.to_value,
+    values.Double: values.Double.to_value,
+    values.String: values.String.to_str,
+}
+
+
 class Extensions(object):
     """Extension handler."""
 
-    def __init__(self, extension, values, codepage):
+    def __init__(self, extension, values, codepage, memory):
         """Initialise extension handler."""
         if isinstance(extension, basestring) or not isinstance(extension, Iterable):
             extension = [extension]
         self._extension = list(extension)
         self._values = values
         self._codepage = codepage
-        self._ext_funcs = None
+        self._memory = memory
+        # loaded extension modules and objects
+        self._ext_objs = None
+        # callables resolved so far, by upper-case name
+        self._ext_funcs = {}
+        self._init_converters()
+
+    def _init_converters(self):
+        """Set up conversion of return values, by Python type."""
+        self._result_converters = {
+            bytes: self._from_bytes,
+            unicode: self._from_unicode,
+            bool: self._values.from_bool,
+            int: self._from_number,
+            float: self._from_number,
+        }
 
     def __getstate__(self):
         """Pickle."""
         pickle_dict = self.__dict__.copy()
         # modules can't be pickled
-        pickle_dict['_ext_funcs'] = None
+        pickle_dict['_ext_objs'] = None
+        pickle_dict['_ext_funcs'] = {}
+        # bound methods can't be pickled
+        pickle_dict['_result_converters'] = None
         pickle_dict['step'] = None
         return pickle_dict
 
     def __setstate__(self, pickle_dict):
         """Unpickle."""
         self.__dict__.update(pickle_dict)
+        self._init_converters()
         self.step = lambda: None
 
     def add(self, ext):
         """Add an extension."""
         self._extension.append(ext)
         # reset cache
-        self._ext_funcs = None
+        self._ext_objs = None
+        self._ext_funcs = {}
 
     def _load_extensions(self):
         """Cache extension modules and objects."""
-        if self._ext_funcs is not None:
+        if self._ext_objs is not None:
             return
         if not self._extension:
             raise error.BASICError(error.STX)
@@ -60,35 +96,98 @@ class Extensions(object):
             except Exception as e:
                 logging.error(u'Could not load extension module `%s`: %s', ext, repr(e))
                 raise error.BASICError(error.INTERNAL_ERROR)
-        self._ext_funcs = {
-            n.upper(): getattr(ext_obj, n)
-            for ext_obj in ext_objs
-                for n in dir(ext_obj) if not n.startswith('_')
-        }
+        self._ext_objs = ext_objs
+
+    def _resolve(self, func_name):
+        """Find the callable for an upper-case name; later extensions take precedence."""
+        try:
+            return self._ext_funcs[func_name]
+        except KeyError:
+            pass
+        self._load_extensions()
+        for ext_obj in reversed(self._ext_objs):
+            for n in dir(ext_obj):
+                if not n.startswith('_') and n.upper() == func_name:
+                    func = getattr(ext_obj, n)
+                    self._ext_funcs[func_name] = func
+                    return func
+        return None
+
+    def _convert_argument(self, arg):
+        """Convert a BASIC argument to Python; array names are passed as bytes."""
+        if isinstance(arg, bytes):
+            return self._convert_array(arg)
+        return ARG_CONVERTERS[type(arg)](arg)
+
+    def _convert_array(self, name):
+        """Convert a whole array to a nested list or, for integer arrays, a NumPy view."""
+        name = self._memory.complete_name(name)
+        arrays = self._memory.arrays
+        if name not in arrays:
+            raise error.BASICError(error.IFC)
+        buf = arrays.view_full_buffer(name)
+        # dimensions hold the maximum index; the first index runs fastest in memory
+        base = arrays.base
+        shape = tuple(d + 1 - base for d in arrays.dimensions(name))
+        if numpy and name[-1] == values.INT:
+            # writes through the view change the BASIC array: drop the sprite cache
+            arrays.set_cache(name, None)
+            return numpy.asarray(buf).view('<i2').reshape(shape, order='F')
+        size = values.size_bytes(name)
+        convert = ARG_CONVERTERS[values.TYPE_TO_CLASS[name[-1]]]
+        flat = [
+            convert(self._values.create(buf[i:i+size]))
+            for i in xrange(0, len(buf), size)
+        ]
+        return _nest(flat, shape)
 
     def call_as_statement(self, args):
         """Extension statement: call a python function as a statement."""
-        self._load_extensions()
         func_name = next(args)
-        func_args = list(arg.to_value() for arg in args if arg is not None)
+        func = self._resolve(func_name)
+        func_args = [self._convert_argument(arg) for arg in args if arg is not None]
         try:
-            result = self._ext_funcs[func_name](*func_args)
+            return func(*func_args)
         except (error.Exit, error.Reset):
             raise
         except Exception as e:
             logging.error(u'Could not call extension function `%s%s`: %s', func_name, tuple(func_args), repr(e))
             raise error.BASICError(error.INTERNAL_ERROR)
-        return result
 
     def call_as_function(self, args):
         """Extension function: call a python function as a function."""
         result = self.call_as_statement(args)
-        if isinstance(result, unicode):
-            result = self._codepage.str_from_unicode(result)
-        if isinstance(result, bytes):
-            return self._values.from_value(result, values.STR)
-        elif isinstance(result, bool):
-            return self._values.from_bool(result)
-        elif isinstance(result, int) or isinstance(result, float):
-            return self._values.from_value(result, values.DBL)
-        raise error.BASICError(error.TYPE_MISMATCH)
+        try:
+            convert = self._result_converters[type(result)]
+        except KeyError:
+            # subclasses, long integers and numpy scalars
+            if isinstance(result, unicode):
+                convert = self._from_unicode
+            elif isinstance(result, bytes):
+                convert = self._from_bytes
+            elif isinstance(result, bool):
+                convert = self._values.from_bool
+            elif isinstance(result, numbers.Real):
+                convert = self._from_number
+            else:
+                raise error.BASICError(error.TYPE_MISMATCH)
+        return convert(result)
+
+    def _from_bytes(self, result):
+        """Convert a bytes result to a BASIC string."""
+        return self._values.from_value(result, values.STR)
+
+    def _from_unicode(self, result):
+        """Convert a unicode result to a BASIC string."""
+        return self._values.from_value(self._codepage.str_from_unicode(result), values.STR)
+
+    def _from_number(self, result):
+        """Convert a numeric result to a BASIC double."""
+        return self._values.from_value(result, values.DBL)
+
+
+def _nest(flat, shape):
+    """Convert a flat list in memory order to nested lists, first index outermost."""
+    if len(shape) <= 1:
+        return flat
+    return [_nest(flat[i::shape[0]], shape[1:]) for i in range(shape[0])]
@@ -12,6 +12,11 @@ import Queue
 import logging
 from contextlib import contextmanager
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from ..metadata import NAME, VERSION, COPYRIGHT
 from .base import error
 from .base import tokens as tk
@@ -58,7 +63,7 @@ class Implementation(object):
             peek_values=None, allow_code_poke=False, rebuild_offsets=True,
             max_memory=65534, reserved_memory=3429, video_memory=262144,
             serial_buffer_size=128, max_reclen=128, max_files=3,
-            extension=None, greeting=True,
+            extension=None, greeting=True, capture_output=False,
         ):
         """Initialise the interpreter session."""
         ######################################################################
@@ -113,7 +118,7 @@ class Implementation(object):
         )
         # prepare I/O streams
         self.io_streams = iostreams.IOStreams(
-            self.queues, self.codepage, input_streams, output_streams, utf8
+            self.queues, self.codepage, input_streams, output_streams, utf8, capture_output
         )
         # initialise sound queue
         self.sound = sound.Sound(self.queues, self.values, self.memory, syntax)
@@ -188,7 +193,9 @@ class Implementation(object):
         ######################################################################
         # extensions
         ######################################################################
-        self.extensions = extensions.Extensions(extension, self.values, self.codepage)
+        self.extensions = extensions.Extensions(
+            extension, self.values, self.codepage, self.memory
+        )
         ######################################################################
         # interpreter
         ######################################################################
@@ -233,8 +240,12 @@ class Implementation(object):
     def attach_interface(self, interface=None):
         """Attach interface to interpreter session."""
         if interface:
-            self.queues.set(*interface.get_queues())
+            self.queues.set(
+                *interface.get_queues(),
+                shared_framebuffer=getattr(interface, 'shared_framebuffer', False)
+            )
             # rebuild the screen
+            self.screen.set_headless(False)
             self.display.rebuild()
             # rebuild audio queues
             self.sound.rebuild()
@@ -242,6 +253,8 @@ class Implementation(object):
             # use dummy video & audio queues if not provided
             # but an input queue should be operational for I/O streams
             self.queues.set(inputs=Queue.Queue())
+            # nobody's watching, so don't draw text
+            self.screen.set_headless(True)
 
     def execute(self, command):
         """Execute a BASIC statement."""
@@ -250,6 +263,8 @@ class Implementation(object):
         with self._handle_exceptions():
             self._store_line(command)
             self.interpreter.loop()
+        # show the results
+        self.queues.flush_video()
 
     def evaluate(self, expression):
         """Evaluate a BASIC expression."""
@@ -270,19 +285,59 @@ class Implementation(object):
             value = -1 if value else 0
         if b'(' in name:
             name = name.split(b'(', 1)[0]
-            self.arrays.from_list(value, name)
+            if numpy and isinstance(value, numpy.ndarray):
+                self.arrays.from_numpy(self._convert_numpy(value), self.memory.complete_name(name))
+            else:
+                self.arrays.from_list(value, name)
         else:
             self.memory.set_variable(name, [], self.values.from_value(value, name[-1]))
 
-    def get_variable(self, name):
+    def _convert_numpy(self, array):
+        """Convert unicode and boolean NumPy arrays to BASIC representation."""
+        if array.dtype.kind == b'U':
+            return numpy.array(
+                [self.codepage.str_from_unicode(s) for s in array.flat], dtype=bytes
+            ).reshape(array.shape)
+        elif array.dtype.kind == b'b':
+            return -array.astype(int)
+        return array
+
+    def get_variable(self, name, as_numpy=False):
         """Get a variable in memory."""
         name = name.upper()
         if b'(' in name:
             name = name.split(b'(', 1)[0]
+            if as_numpy:
+                return self.arrays.to_numpy(self.memory.complete_name(name))
             return self.arrays.to_list(name)
         else:
             return self.memory.view_or_create_variable(name, []).to_value()
 
+    def get_text_screen(self, as_numpy=False):
+        """Get the characters and attributes on the visible page."""
+        text_screen = self.display.text_screen
+        chars, attrs = text_screen.text.get_rect(
+            text_screen.vpagenum, 1, 1, text_screen.mode.height, text_screen.mode.width
+        )
+        if as_numpy:
+            return (
+                numpy.array([bytearray(_row) for _row in chars], dtype=numpy.uint8),
+                numpy.array(attrs, dtype=numpy.uint8)
+            )
+        return chars, [list(_row) for _row in attrs]
+
+    def get_points(self, xs, ys, as_numpy=False):
+        """Get the attributes at sequences of logical coordinates, as POINT does.
+
+        Off-screen points are -1; as POINT, raises Illegal function call in text mode
+        and Overflow for coordinates out of range.
+        """
+        points = self.display.drawing.get_points(xs, ys)
+        if as_numpy:
+            return numpy.asarray(points)
+        # with NumPy, the drawing returns an array
+        return points.tolist() if numpy else points
+
     def interact(self):
         """Interactive interpreter session."""
         # greet at most once per session: execute() will switch off greeting
@@ -304,6 +359,8 @@ class Implementation(object):
         # close files if we opened any
         self.files.close_all()
         self.files.close_devices()
+        # don't leave screen updates behind
+        self.queues.flush_video()
 
     def _show_prompt(self):
         """Show the Ok or EDIT prompt, unless suppressed."""
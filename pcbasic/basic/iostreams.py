@@ -12,7 +12,7 @@ import sys
 import time
 import io
 from contextlib import contextmanager
-from collections import Iterable
+from collections import Iterable, deque
 
 from ..compat import WIN32, read_all_available
 from .base import signals
@@ -27,7 +27,7 @@ TICK = 0.03
 class IOStreams(object):
     """Manage input/output to files, printers and stdio."""
 
-    def __init__(self, queues, codepage, input_streams, output_streams, utf8):
+    def __init__(self, queues, codepage, input_streams, output_streams, utf8, capture=False):
         """Initialise I/O streams."""
         self._queues = queues
         self._codepage = codepage
@@ -45,6 +45,11 @@ class IOStreams(object):
         elif hasattr(output_streams, 'write') or not isinstance(output_streams, Iterable):
             output_streams = (output_streams,)
         self._output_echos = [self._wrap_output(stream) for stream in output_streams]
+        # captured output, to be retrieved through the session
+        self._captured = None
+        if capture:
+            self._captured = deque()
+            self._output_echos.append(CallbackStreamWrapper(self._captured.append))
         # disable at start
         self._active = False
         # launch a daemon thread for input
@@ -59,6 +64,13 @@ class IOStreams(object):
         for f in self._output_echos:
             f.write(s)
 
+    def read_captured(self):
+        """Retrieve chunks of captured output, oldest first; stop when no more are available."""
+        if self._captured is None:
+            return
+        while self._captured:
+            yield self._captured.popleft()
+
     def toggle_echo(self, stream):
         """Toggle copying of all screen I/O to stream."""
         if stream in self._output_echos:
@@ -84,6 +96,8 @@ class IOStreams(object):
 
     def _wrap_output(self, stream):
         """Wrap output stream."""
+        if callable(stream) and not hasattr(stream, 'write'):
+            return CallbackStreamWrapper(stream)
         return OutputStreamWrapper(
                 stream, self._codepage, (stream.encoding if stream.isatty() else self._encoding)
             )
@@ -132,6 +146,18 @@ class OutputStreamWrapper(object):
         self._stream.flush()
 
 
+class CallbackStreamWrapper(object):
+    """Pass raw output to a callable."""
+
+    def __init__(self, callback):
+        """Set up callback."""
+        self._callback = callback
+
+    def write(self, s):
+        """Call back with raw bytes."""
+        self._callback(bytes(s))
+
+
 class InputStreamWrapper(object):
     """Converter and non-blocking input wrapper."""
 
@@ -9,6 +9,11 @@ This file is released under the GNU GPL version 3 or later.
 import binascii
 import struct
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from ..base import error
 from .. import values
 from .scalars import get_name_in_memory
@@ -70,6 +75,11 @@ class Arrays(object):
                     self._array_memory[name] = name_ptr - freed_bytes, array_ptr - freed_bytes
             self.current -= freed_bytes
 
+    @property
+    def base(self):
+        """Array base: 0 or 1, 0 if unset."""
+        return self._base or 0
+
     def index(self, index, dimensions):
         """Return the flat index for a given dimensioned index."""
         bigindex = 0
@@ -304,6 +314,69 @@ class Arrays(object):
             for i, v in enumerate(python_list):
                 self.set(name, index+[i+(self._base or 0)], self._values.from_value(v, name[-1]))
 
+    def shape(self, name):
+        """Number of elements along each index, first index first."""
+        return tuple(d + 1 - self.base for d in self._dims[name])
+
+    def from_numpy(self, array, name):
+        """Convert NumPy array to BASIC array; allocate the array if needed."""
+        array = numpy.asarray(array)
+        sigil = name[-1]
+        if array.dtype.kind not in (b'S' if sigil == values.STR else b'biuf'):
+            raise error.BASICError(error.TYPE_MISMATCH)
+        if name not in self._dims:
+            if self._base is None:
+                self._base = 0
+            # subscripts must be integers
+            if any(n - 1 + self._base > 0x7fff for n in array.shape):
+                raise error.BASICError(error.OVERFLOW)
+            self.allocate(name, [n - 1 + self._base for n in array.shape])
+        shape = self.shape(name)
+        if array.ndim != len(shape) or any(n > m for n, m in zip(array.shape, shape)):
+            raise error.BASICError(error.SUBSCRIPT_OUT_OF_RANGE)
+        # the first index runs fastest in memory, so the buffer is in Fortran order
+        size = values.size_bytes(name)
+        target = numpy.asarray(memoryview(self._buffers[name])).view('V%d' % size)
+        target = target.reshape(shape, order='F')[tuple(slice(0, n) for n in array.shape)]
+        if sigil == values.STR:
+            for index in numpy.ndindex(array.shape):
+                target[index] = bytes(self._values.from_value(array[index], values.STR).to_bytes())
+                self._memory.strings.fix_temporaries()
+        elif sigil == values.INT:
+            if array.size and (array.min() < -0x8000 or array.max() > 0x7fff):
+                raise error.BASICError(error.OVERFLOW)
+            target[...] = array.astype('<i2').view('V2')
+        else:
+            try:
+                packed = values.TYPE_TO_CLASS[sigil].array_from_value(array)
+            except OverflowError:
+                raise error.BASICError(error.OVERFLOW)
+            except ValueError:
+                raise error.BASICError(error.IFC)
+            target[...] = packed.view('V%d' % size)[..., 0]
+        # drop cache
+        self._cache[name] = None
+
+    def to_numpy(self, name):
+        """Convert BASIC array to NumPy array; strings become fixed-length bytes."""
+        if name not in self._dims:
+            return numpy.zeros(0)
+        shape = self.shape(name)
+        buf = self._buffers[name]
+        sigil = name[-1]
+        if sigil == values.STR:
+            flat = [
+                self._values.create(memoryview(buf)[i:i+3]).to_str()
+                for i in range(0, len(buf), 3)
+            ]
+            # numpy.array would take empty strings for an empty sequence
+            flat = numpy.array(flat, dtype=bytes) if flat else numpy.zeros(0, 'S1')
+        elif sigil == values.INT:
+            flat = numpy.frombuffer(bytes(buf), '<i2').astype(int)
+        else:
+            flat = values.TYPE_TO_CLASS[sigil].array_to_value(buf)
+        return flat.reshape(shape, order='F').copy()
+
     def to_list(self, name):
         """Convert BASIC array to Python list."""
         if name in self._dims:
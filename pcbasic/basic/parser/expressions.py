@@ -376,6 +376,15 @@ class ExpressionParser(object):
             ins.require_read((b']', b')'))
         return indices
 
+    def parse_array_name(self, ins):
+        """Parse a whole-array reference such as A%(); return the name or None if not found."""
+        pos = ins.tell()
+        name = ins.read_name()
+        if name and ins.skip_blank_read_if((b'[', b'(')) and ins.skip_blank_read_if((b']', b')')):
+            return name
+        ins.seek(pos)
+        return None
+
     ###########################################################################
     # function and argument handling
 
@@ -452,7 +461,8 @@ class ExpressionParser(object):
         yield ins.read_name()
         if ins.skip_blank_read_if((b'(',)):
             while True:
-                yield self.parse(ins)
+                # whole arrays are passed by name
+                yield self.parse_array_name(ins) or self.parse(ins)
                 if not ins.skip_blank_read_if((b',',)):
                     break
             ins.require_read((b')',))
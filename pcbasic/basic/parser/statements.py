@@ -724,7 +724,11 @@ class Parser(object):
         """Parse extension statement."""
         yield ins.read_name()
         while True:
-            yield self.parse_expression(ins, allow_empty=True)
+            # whole arrays are passed by name
+            yield (
+                self.expression_parser.parse_array_name(ins)
+                or self.parse_expression(ins, allow_empty=True)
+            )
             if not ins.skip_blank_read_if((b',',)):
                 break
 
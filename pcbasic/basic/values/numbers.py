@@ -26,6 +26,11 @@ import binascii
 import struct
 import math
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from ..base import tokens as tk
 from ..base import error
 
@@ -445,8 +450,8 @@ class Float(Number):
         exp = ord(self._buffer[-1]) - self._bias
         if exp == -self._bias:
             return 0.
-        # unpack as unsigned long int
-        man = struct.unpack(self._intformat, bytearray(self._buffer[:-1]) + b'\0')[0]
+        # unpack as unsigned long int and mask out the exponent byte
+        man = struct.unpack(self._intformat, self._buffer)[0] & self._mask
         # prepend assumed bit and apply sign
         if man & self._signmask:
             man = -man
@@ -474,6 +479,56 @@ class Float(Number):
         return self
 
 
+    # NumPy array conversions
+
+    @classmethod
+    def array_to_value(cls, buf):
+        """Convert a buffer of packed floats to a flat NumPy array of Python floats."""
+        raw = numpy.asarray(memoryview(buf)).reshape(-1, cls.size)
+        exp = raw[:, -1].astype(numpy.int32)
+        man = numpy.zeros(len(raw), numpy.int64)
+        for i in range(cls.size - 1):
+            man |= raw[:, i].astype(numpy.int64) << (8*i)
+        neg = (man & cls._signmask) != 0
+        # set assumed bit
+        man |= cls._signmask
+        result = numpy.ldexp(man.astype(numpy.float64), exp - cls._bias)
+        result[neg] = -result[neg]
+        result[exp == 0] = 0.
+        return result
+
+    @classmethod
+    def array_from_value(cls, in_floats):
+        """Convert a NumPy array of floats to an array of packed floats along a new last axis."""
+        in_floats = numpy.asarray(in_floats, numpy.float64)
+        if numpy.isnan(in_floats).any():
+            raise ValueError(in_floats)
+        if not numpy.isfinite(in_floats).all():
+            raise OverflowError(in_floats)
+        neg = in_floats < 0
+        in_abs = numpy.abs(in_floats)
+        frac, exp = numpy.frexp(in_abs)
+        # follow from_value: its first exponent estimate rounds towards zero
+        # so that a bit may be lost for values that need a negative estimate
+        exp = exp - 1 - cls._shift
+        exp += (exp < 0) & (frac != 0.5)
+        man = numpy.floor(numpy.ldexp(in_abs, -exp))
+        small = man < cls._signmask
+        man[small] *= 2
+        exp -= small
+        exp += cls._bias
+        if (exp[in_abs != 0] > 255).any():
+            raise OverflowError(in_floats)
+        man = man.astype(numpy.int64)
+        man[~neg] &= cls._posmask
+        out = numpy.zeros(in_floats.shape + (cls.size,), numpy.uint8)
+        for i in range(cls.size - 1):
+            out[..., i] = (man >> (8*i)) & 0xff
+        out[..., -1] = exp
+        # zero and underflow
+        out[(in_abs == 0) | (exp <= 0)] = 0
+        return out
+
     # Python int conversions
 
     def to_int(self):
@@ -361,6 +361,15 @@ def to_int(inp, unsigned=False):
     """Round numeric variable and convert to Python integer."""
     return to_integer(inp, unsigned).to_int(unsigned)
 
+def to_single_value(num):
+    """Check if variable is numeric, return its single-precision value as Python float."""
+    # no need to convert a Single, or an Integer which is exact in single precision
+    if isinstance(num, numbers.Single):
+        return num.to_value()
+    elif isinstance(num, numbers.Integer):
+        return float(num.to_int())
+    return to_single(num).to_value()
+
 def mki_(args):
     """MKI$: return the byte representation of an int."""
     x, = args
@@ -23,7 +23,7 @@ from collections import deque
 from .metadata import VERSION, NAME
 from .data import CODEPAGES, FONTS, PROGRAMS, ICON
 from .compat import WIN32, get_short_pathname, get_unicode_argv, HAS_CONSOLE
-from .compat import USER_CONFIG_HOME, USER_DATA_HOME
+from .compat import USER_CONFIG_HOME, USER_DATA_HOME, USER_CACHE_HOME
 from .compat import split_quoted
 from . import data
 
@@ -35,9 +35,10 @@ MIN_PYTHON_VERSION = (2, 7, 12)
 MAJOR_VERSION = u'.'.join(VERSION.split(u'.')[:2])
 BASENAME = u'pcbasic-{0}'.format(MAJOR_VERSION)
 
-# user configuration and state directories
+# user configuration, state and cache directories
 USER_CONFIG_DIR = os.path.join(USER_CONFIG_HOME, BASENAME)
 STATE_PATH = os.path.join(USER_DATA_HOME, BASENAME)
+CACHE_PATH = os.path.join(USER_CACHE_HOME, BASENAME)
 
 # @: target drive for bundled programs
 PROGRAM_PATH = os.path.join(STATE_PATH, u'bundled_programs')
@@ -223,7 +224,7 @@ class Settings(object):
         u'interface': {
             u'type': u'string', u'default': u'',
             u'choices': (u'', u'none', u'cli', u'text', u'graphical',
-                        u'ansi', u'curses', u'pygame', u'sdl2'), },
+                        u'ansi', u'curses', u'pygame', u'sdl2', u'framebuffer'), },
         u'sound': {
             u'type': u'string', u'default': u'',
             u'choices': (u'', u'none', u'beep', u'portaudio', u'interface'), },
@@ -292,6 +293,8 @@ class Settings(object):
         u'shell': {u'type': u'string', u'default': u'',},
         u'ctrl-c-break': {u'type': u'bool', u'default': True,},
         u'wait': {u'type': u'bool', u'default': False,},
+        u'capture': {u'type': u'string', u'default': u'',},
+        u'capture-interval': {u'type': u'int', u'default': 0,},
         u'current-device': {u'type': u'string', u'default': ''},
         u'extension': {u'type': u'string', u'list': u'*', u'default': []},
         u'options': {u'type': u'string', u'default': ''},
@@ -487,7 +490,7 @@ class Settings(object):
         max_list[0] = max_list[0] or max_list[1]
         # codepage parameters
         codepage_params = self.get('codepage').split(u':')
-        codepage_dict = data.read_codepage(codepage_params[0])
+        codepage_dict = data.read_codepage(codepage_params[0], cache_dir=CACHE_PATH)
         nobox = len(codepage_params) > 1 and codepage_params[1] == u'nobox'
         # video parameters
         video_params = self.get('video').split(u':')
@@ -505,7 +508,9 @@ class Settings(object):
             'text_width': self.get('text-width'),
             'video_memory': self.get('video-memory'),
             'low_intensity': cga_low,
-            'font': data.read_fonts(codepage_dict, self.get('font'), warn=self.get('debug')),
+            'font': data.read_fonts(
+                codepage_dict, self.get('font'), warn=self.get('debug'), cache_dir=CACHE_PATH
+            ),
             # inserted keystrokes
             'keys': self.get('keys').encode('utf-8', 'replace')
                         .decode('string_escape').decode('utf-8', 'replace'),
@@ -558,6 +563,8 @@ class Settings(object):
             'mouse_clipboard': self.get('mouse-clipboard'),
             'icon': ICON,
             'wait': self.get('wait'),
+            'capture_file': self.get('capture'),
+            'capture_interval': self.get('capture-interval'),
             }
 
     def _get_audio_parameters(self):
@@ -0,0 +1,80 @@
+"""
+PC-BASIC - data package
+Binary cache for parsed fonts and codepages
+
+(c) 2013--2018 Rob Hagemans
+This file is released under the GNU GPL version 3 or later.
+"""
+
+import os
+import io
+import sys
+import marshal
+import hashlib
+import logging
+
+# increment when the layout of the cached objects changes
+CACHE_VERSION = 1
+# header line; marshal format depends on the python version
+CACHE_MAGIC = b'PC-BASIC cache %d %d %d.%d\n' % (
+    CACHE_VERSION, marshal.version, sys.version_info[0], sys.version_info[1]
+)
+CACHE_PATTERN = u'{kind}-{name}.cache'
+
+
+def hash_sources(*sources):
+    """Hash the contents of a sequence of source files; None for missing files."""
+    digest = hashlib.sha1()
+    for source in sources:
+        digest.update(b'-' if source is None else hashlib.sha1(source).digest())
+    return digest.hexdigest()
+
+
+class DataCache(object):
+    """Versioned binary cache of parsed data files, validated by source hash."""
+
+    def __init__(self, cache_dir):
+        """Initialise cache; if cache_dir is None or empty, do not cache."""
+        self._cache_dir = cache_dir
+
+    def _path(self, kind, name):
+        """Path to cache file."""
+        return os.path.join(self._cache_dir, CACHE_PATTERN.format(kind=kind, name=name))
+
+    def load(self, kind, name, source_hash):
+        """Retrieve a cached object; None if not cached, outdated or unreadable."""
+        if not self._cache_dir:
+            return None
+        try:
+            with io.open(self._path(kind, name), 'rb') as cache_file:
+                if cache_file.readline() != CACHE_MAGIC:
+                    return None
+                if cache_file.readline().rstrip() != source_hash:
+                    return None
+                return marshal.loads(cache_file.read())
+        except (EnvironmentError, EOFError, ValueError, TypeError):
+            return None
+
+    def store(self, kind, name, source_hash, obj):
+        """Store an object in the cache."""
+        if not self._cache_dir:
+            return
+        path = self._path(kind, name)
+        temp_path = u'%s.%d' % (path, os.getpid())
+        try:
+            if not os.path.isdir(self._cache_dir):
+                os.makedirs(self._cache_dir)
+            with io.open(temp_path, 'wb') as cache_file:
+                cache_file.write(CACHE_MAGIC)
+                cache_file.write(source_hash + b'\n')
+                cache_file.write(marshal.dumps(obj))
+            # rename does not replace existing files on Windows
+            if os.path.exists(path):
+                os.remove(path)
+            os.rename(temp_path, path)
+        except (EnvironmentError, ValueError) as e:
+            logging.debug('Could not write cache file %s: %s', path, e)
+            try:
+                os.remove(temp_path)
+            except EnvironmentError:
+                pass
@@ -10,9 +10,12 @@ import sys
 import pkg_resources
 import logging
 import binascii
+import hashlib
+import marshal
 
 from ..basic.codepage import PRINTABLE_ASCII
 from .resources import get_data, ResourceFailed
+from .cache import DataCache, hash_sources
 
 FONT_DIR = u'fonts'
 FONT_PATTERN = u'{path}/{name}_{height:02d}.hex'
@@ -23,8 +26,40 @@ FONTS = sorted(
 )
 
 
-def read_fonts(codepage_dict, font_families, warn):
+def read_fonts(codepage_dict, font_families, warn, cache_dir=None):
     """Load font typefaces."""
+    # load the .hex font resources for each height, height-16 first
+    font_files = {}
+    for height in (16, 14, 8):
+        font_files[height] = []
+        for name in font_families:
+            try:
+                font_files[height].append(
+                    get_data(FONT_PATTERN, path=FONT_DIR, name=name, height=height)
+                )
+            except ResourceFailed as e:
+                if warn:
+                    logging.debug(e)
+    # the parsed fonts depend on the codepage and on the contents of the font files
+    codepage_hash = hashlib.sha1(marshal.dumps(sorted(codepage_dict.iteritems()))).hexdigest()
+    cache_name = hashlib.sha1(
+        u'\0'.join(font_families).encode('utf-8') + b'\0' + codepage_hash
+    ).hexdigest()
+    source_hash = hash_sources(codepage_hash, *(
+        font_file for height in (16, 14, 8) for font_file in font_files[height] + [None]
+    ))
+    cache = DataCache(cache_dir)
+    # in debug mode, parse the fonts to report missing glyphs
+    fonts = None if warn else cache.load(u'font', cache_name, source_hash)
+    if fonts is None:
+        fonts = _build_fonts(codepage_dict, font_files, warn)
+        cache.store(u'font', cache_name, source_hash, fonts)
+    if 8 in fonts:
+        fonts[9] = dict(fonts[8])
+    return fonts
+
+def _build_fonts(codepage_dict, font_files, warn):
+    """Parse fonts and take the codepage subset."""
     # load the graphics fonts, including the 8-pixel RAM font
     # use set() for speed - lookup is O(1) rather than O(n) for list
     unicode_needed = set(codepage_dict.itervalues())
@@ -44,32 +79,20 @@ def read_fonts(codepage_dict, font_families, warn):
     # load fonts, height-16 first
     for height in (16, 14, 8):
         # load a Unifont .hex font and take the codepage subset
-        font_files = []
-        for name in font_families:
-            try:
-                font_files.append(
-                    get_data(FONT_PATTERN, path=FONT_DIR, name=name, height=height)
-                )
-            except ResourceFailed as e:
-                if warn:
-                    logging.debug(e)
         fonts[height] = FontLoader(height).load_hex(
-            font_files, unicode_needed, substitutes, warn=warn
+            font_files[height], unicode_needed, substitutes, warn=warn
         )
         # fix missing code points font based on 16-line font
         if fonts[16]:
             fonts[height].fix_missing(unicode_needed, fonts[16])
-    if 8 in fonts:
-        fonts[9] = fonts[8]
     # convert keys from unicode to codepage
-    fonts = {
+    return {
         height: {
             c: font._fontdict[uc]
             for c, uc in codepage_dict.iteritems() if uc in font._fontdict
         }
         for height, font in fonts.iteritems()
     }
-    return {height: font for height, font in fonts.iteritems()}
 
 
 class FontLoader(object):
@@ -11,6 +11,7 @@ import logging
 import binascii
 
 from .resources import get_data
+from .cache import DataCache, hash_sources
 
 CODEPAGE_DIR = u'codepages'
 CODEPAGE_PATTERN = u'{path}/{name}.ucp'
@@ -21,10 +22,21 @@ CODEPAGES = [
 ]
 
 
-def read_codepage(codepage_name):
+def read_codepage(codepage_name, cache_dir=None):
     """Read a codepage file and convert to codepage dict."""
+    source = get_data(CODEPAGE_PATTERN, path=CODEPAGE_DIR, name=codepage_name)
+    cache = DataCache(cache_dir)
+    source_hash = hash_sources(source)
+    codepage = cache.load(u'codepage', codepage_name, source_hash)
+    if codepage is None:
+        codepage = _parse_codepage(source)
+        cache.store(u'codepage', codepage_name, source_hash, codepage)
+    return codepage
+
+def _parse_codepage(source):
+    """Parse a .ucp codepage file into a codepage dict."""
     codepage = {}
-    for line in get_data(CODEPAGE_PATTERN, path=CODEPAGE_DIR, name=codepage_name).splitlines():
+    for line in source.splitlines():
         # ignore empty lines and comment lines (first char is #)
         if (not line) or (line[0] == b'#'):
             continue
@@ -29,6 +29,7 @@ SET_SCROLL_SCREEN = u'\x1B[r'
 SET_SCROLL_REGION = u'\x1B[%i;%ir'
 CLEAR_SCREEN = u'\x1B[2J'
 CLEAR_LINE = u'\x1B[2K'
+CLEAR_TO_EOL = u'\x1B[K'
 SCROLL_UP = u'\x1B[%iS'
 SCROLL_DOWN = u'\x1B[%iT'
 SHOW_CURSOR = u'\x1B[?25h'
@@ -43,6 +44,7 @@ SET_CURSOR_COLOUR = u'\x1B]12;%s\a'
 # 1 blinking block 2 block 3 blinking line 4 line
 SET_CURSOR_SHAPE = u'\x1B[%i q'
 SET_COLOUR = u'\x1B[%im'
+SET_ATTRIBUTES = u'\x1B[%sm'
 SET_TITLE = u'\x1B]2;%s\a'
 MOVE_RIGHT = u'\x1B[C'
 MOVE_LEFT = u'\x1B[D'
@@ -7,6 +7,7 @@ This file is released under the GNU GPL version 3 or later.
 """
 
 import os
+import importlib
 
 
 # message displayed when wiating to close
@@ -28,9 +29,11 @@ class InitFailed(Exception):
 class PluginRegister(object):
     """Plugin register."""
 
-    def __init__(self):
+    def __init__(self, modules):
         """Initialise plugin register."""
         self._plugins = {}
+        # modules defining the plugins, only imported when the plugin is requested
+        self._modules = modules
 
     def register(self, name):
         """Decorator to register a plugin."""
@@ -40,7 +43,9 @@ class PluginRegister(object):
         return decorated_plugin
 
     def __getitem__(self, name):
-        """Retrieve plugin."""
+        """Retrieve plugin, importing its module on first use."""
+        if name not in self._plugins and name in self._modules:
+            importlib.import_module(self._modules[name], __package__)
         return self._plugins[name]
 
 
@@ -87,5 +92,18 @@ class EnvironmentCache(object):
 ###############################################################################
 # plugin registers
 
-video_plugins = PluginRegister()
-audio_plugins = PluginRegister()
+video_plugins = PluginRegister({
+    'ansi': '.video_ansi',
+    'cli': '.video_cli',
+    'curses': '.video_curses',
+    'framebuffer': '.video_framebuffer',
+    'pygame': '.video_pygame',
+    'sdl2': '.video_sdl2',
+})
+
+audio_plugins = PluginRegister({
+    'beep': '.audio_beep',
+    'portaudio': '.audio_portaudio',
+    'pygame': '.audio_pygame',
+    'sdl2': '.audio_sdl2',
+})
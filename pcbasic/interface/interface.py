@@ -61,6 +61,11 @@ class Interface(object):
         """Retrieve interface queues."""
         return self._input_queue, self._video_queue, self._audio_queue
 
+    @property
+    def shared_framebuffer(self):
+        """Video plugin reads graphics directly from the interpreter's pixel buffer."""
+        return self._video.shared_framebuffer
+
     def launch(self, target, **kwargs):
         """Start an interactive interpreter session."""
         thread = threading.Thread(target=self._thread_runner, args=(target,), kwargs=kwargs)
@@ -0,0 +1,124 @@
+"""
+PC-BASIC - shadow.py
+Shadow text buffer for text-based interfaces
+
+(c) 2018 Rob Hagemans
+This file is released under the GNU GPL version 3 or later.
+"""
+
+
+class ShadowScreen(object):
+    """Text pages and the text shown on the terminal, to compute minimal updates."""
+
+    # changed cells separated by no more than this many unchanged cells are updated as one run
+    max_gap = 4
+
+    def __init__(self, height, width, num_pages, blank):
+        """Initialise the buffer."""
+        self.set_mode(height, width, num_pages, blank)
+
+    def set_mode(self, height, width, num_pages, blank):
+        """Reset the buffer for a new screen mode; cells are (char, attr) tuples."""
+        self.height, self.width = height, width
+        self.pages = [[[blank] * width for _ in range(height)] for _ in range(num_pages)]
+        self.vpagenum, self.apagenum = 0, 0
+        self.invalidate()
+
+    def invalidate(self):
+        """Terminal contents are unknown; everything needs to be written."""
+        self._shown = [[None] * self.width for _ in range(self.height)]
+        self._scrolls = []
+        self.changed = True
+
+    def clear_shown(self, blank):
+        """Terminal has been cleared to blank cells."""
+        self._shown = [[blank] * self.width for _ in range(self.height)]
+        self._scrolls = []
+        self.changed = True
+
+    def set_page(self, vpagenum, apagenum):
+        """Set visible and active page."""
+        self.changed = self.changed or vpagenum != self.vpagenum
+        self.vpagenum, self.apagenum = vpagenum, apagenum
+
+    def copy_page(self, src, dst):
+        """Copy screen pages; rows that are already equal are left alone."""
+        src_page, dst_page = self.pages[src], self.pages[dst]
+        for y, row in enumerate(src_page):
+            if dst_page[y] != row:
+                dst_page[y] = row[:]
+                self.changed = self.changed or dst == self.vpagenum
+
+    def put(self, pagenum, row, col, char, attr, is_fullwidth):
+        """Put a character at a given position."""
+        textrow = self.pages[pagenum][row-1]
+        textrow[col-1] = char, attr
+        if is_fullwidth:
+            textrow[col] = u'', attr
+        self.changed = self.changed or pagenum == self.vpagenum
+
+    def clear_rows(self, start, stop, blank):
+        """Clear rows on the active page."""
+        self.pages[self.apagenum][start-1:stop] = [
+            [blank] * self.width for _ in range(start-1, stop)
+        ]
+        self.changed = self.changed or self.apagenum == self.vpagenum
+
+    def scroll_up(self, from_line, scroll_height, blank, count):
+        """Scroll the active page up; if it is visible, the terminal will be scrolled too."""
+        count = min(count, scroll_height - from_line + 1)
+        blanks = [[blank] * self.width for _ in range(count)]
+        page = self.pages[self.apagenum]
+        page[from_line-1:scroll_height] = page[from_line-1+count:scroll_height] + blanks
+        if self.apagenum == self.vpagenum:
+            # keep track of what the terminal will show after scrolling
+            self._shown[from_line-1:scroll_height] = (
+                self._shown[from_line-1+count:scroll_height] + [_row[:] for _row in blanks]
+            )
+            self._scrolls.append((from_line, scroll_height, count, blank))
+            self.changed = True
+
+    def scroll_down(self, from_line, scroll_height, blank, count):
+        """Scroll the active page down; if it is visible, the terminal will be scrolled too."""
+        count = min(count, scroll_height - from_line + 1)
+        blanks = [[blank] * self.width for _ in range(count)]
+        page = self.pages[self.apagenum]
+        page[from_line-1:scroll_height] = blanks + page[from_line-1:scroll_height-count]
+        if self.apagenum == self.vpagenum:
+            self._shown[from_line-1:scroll_height] = (
+                [_row[:] for _row in blanks] + self._shown[from_line-1:scroll_height-count]
+            )
+            self._scrolls.append((from_line, scroll_height, -count, blank))
+            self.changed = True
+
+    def pop_updates(self):
+        """Get the scrolls and changed runs to show, in that order, and consider them shown.
+
+        Scrolls are (from_line, scroll_height, rows, blank) with rows positive for up;
+        the terminal should fill the new rows with blank cells.
+        Runs are (row, col, cells) with cells a list of (char, attr) tuples.
+        """
+        scrolls, runs = self._scrolls, []
+        self._scrolls = []
+        if not self.changed:
+            return scrolls, runs
+        self.changed = False
+        for y, (new, old) in enumerate(zip(self.pages[self.vpagenum], self._shown)):
+            if new == old:
+                continue
+            changed = [x for x in xrange(self.width) if new[x] != old[x]]
+            start = last = changed[0]
+            for x in changed[1:]:
+                if x - last > self.max_gap + 1:
+                    runs.append(self._run(new, y, start, last))
+                    start = x
+                last = x
+            runs.append(self._run(new, y, start, last))
+            self._shown[y] = new[:]
+        return scrolls, runs
+
+    def _run(self, textrow, y, start, stop):
+        """Run of cells in a row, not starting halfway a fullwidth character."""
+        while start > 0 and textrow[start][0] == u'':
+            start -= 1
+        return y+1, start+1, textrow[start:stop+1]
@@ -15,6 +15,9 @@ from ..basic.base import signals
 class VideoPlugin(object):
     """Base class for display/input interface plugins."""
 
+    # plugin can read graphics directly from the interpreter's pixel buffer
+    shared_framebuffer = False
+
     def __init__(self, input_queue, video_queue, **kwargs):
         """Setup the interface."""
         self.alive = True
@@ -24,6 +27,7 @@ class VideoPlugin(object):
         self._handlers = {
             signals.VIDEO_SET_MODE: self.set_mode,
             signals.VIDEO_PUT_GLYPH: self.put_glyph,
+            signals.VIDEO_PUT_TEXT: self.put_text,
             signals.VIDEO_CLEAR_ROWS: self.clear_rows,
             signals.VIDEO_SCROLL_UP: self.scroll_up,
             signals.VIDEO_SCROLL_DOWN: self.scroll_down,
@@ -44,6 +48,9 @@ class VideoPlugin(object):
             signals.VIDEO_FILL_RECT: self.fill_rect,
             signals.VIDEO_SET_CAPTION: self.set_caption_message,
             signals.VIDEO_SET_CLIPBOARD_TEXT: self.set_clipboard_text,
+            signals.VIDEO_SET_FRAMEBUFFER: self.set_framebuffer,
+            signals.VIDEO_UPDATE_RECT: self.update_rect,
+            signals.VIDEO_CAPTURE_FRAME: self.capture_frame,
         }
 
     # called by Interface
@@ -133,17 +140,26 @@ class VideoPlugin(object):
     def set_cursor_attr(self, attr):
         """Change attribute of cursor."""
 
-    def scroll_up(self, from_line, scroll_height, back_attr):
-        """Scroll the screen up between from_line and scroll_height."""
+    def scroll_up(self, from_line, scroll_height, back_attr, count):
+        """Scroll the screen up by count rows between from_line and scroll_height."""
 
-    def scroll_down(self, from_line, scroll_height, back_attr):
-        """Scroll the screen down between from_line and scroll_height."""
+    def scroll_down(self, from_line, scroll_height, back_attr, count):
+        """Scroll the screen down by count rows between from_line and scroll_height."""
 
     def put_glyph(self, pagenum, row, col, char, is_fullwidth, fore, back, blink, underline):
         """Put a character at a given position."""
 
+    def put_text(self, pagenum, row, col, chars, fore, back, blink, underline):
+        """Put a run of halfwidth characters on a row, starting at a given position."""
+        for i, char in enumerate(chars):
+            self.put_glyph(pagenum, row, col+i, char, False, fore, back, blink, underline)
+
     def build_glyphs(self, new_dict):
-        """Build a dict of glyphs for use in text mode."""
+        """
+        Build a dict of glyphs for use in text mode; glyphs set to None are dropped.
+        Glyphs are kept by font size across mode switches; the interpreter resends them only
+        for a size it has not used before.
+        """
 
     def set_cursor_shape(self, width, height, from_line, to_line):
         """Build a sprite for the cursor."""
@@ -162,3 +178,12 @@ class VideoPlugin(object):
 
     def put_rect(self, pagenum, x0, y0, x1, y1, array):
         """Apply numpy array [y][x] of attribytes to an area."""
+
+    def set_framebuffer(self, pixels):
+        """Use the interpreter's pixel buffer for graphics; None in text mode."""
+
+    def update_rect(self, pagenum, x0, y0, x1, y1):
+        """Area of the shared pixel buffer has changed."""
+
+    def capture_frame(self, filename):
+        """Write the visible screen to an image file."""
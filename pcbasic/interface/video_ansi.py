@@ -13,6 +13,7 @@ from .video import VideoPlugin
 from .base import video_plugins
 from . import video_cli
 from . import ansi
+from .shadow import ShadowScreen
 from ..compat import console, TERM_SIZE
 
 
@@ -24,6 +25,8 @@ class VideoANSI(video_cli.VideoTextBase):
         """Initialise the text interface."""
         video_cli.VideoTextBase.__init__(self, input_queue, video_queue)
         self.caption = caption
+        # output to be written to the terminal at the end of the cycle
+        self._output = []
         self.set_caption_message(u'')
         # cursor is visible
         self.cursor_visible = True
@@ -32,17 +35,16 @@ class VideoANSI(video_cli.VideoTextBase):
         # current cursor position
         self.cursor_row = 1
         self.cursor_col = 1
+        # terminal cursor position; None if unknown
+        self._term_pos = None
         # last used colour attributes
         self.last_attributes = None
         # text and colour buffer
-        self.num_pages = 1
-        self.vpagenum, self.apagenum = 0, 0
         self.height = 25
         self.width = 80
         self._set_default_colours(16)
-        self.text = [[[(u' ', (7, 0, False, False))]*80 for _ in range(25)]]
+        self._shadow = ShadowScreen(25, 80, 1, (u' ', (7, 0, False, False)))
         self.logger = logging.getLogger()
-        #console.flush()
 
     def __enter__(self):
         """Open ANSI interface."""
@@ -58,26 +60,69 @@ class VideoANSI(video_cli.VideoTextBase):
             console.write(ansi.RESIZE_TERM % TERM_SIZE)
             console.write(ansi.CLEAR_SCREEN)
             console.write(ansi.MOVE_CURSOR % (1, 1))
-            self.show_cursor(True)
-            #console.flush()
+            console.write(ansi.SHOW_CURSOR)
             # re-enable logger
             self.logger.disabled = False
         finally:
             video_cli.VideoTextBase.__exit__(self, type, value, traceback)
 
     def _work(self):
-        """Handle screen and interface events."""
-
-    def _redraw(self):
-        """Redraw the screen."""
-        console.write(ansi.CLEAR_SCREEN)
-        for row, textrow in enumerate(self.text[self.vpagenum]):
-            console.write(ansi.MOVE_CURSOR % (row+1, 1))
-            for col, charattr in enumerate(textrow):
-                self._set_attributes(*charattr[1])
-                console.write(charattr[0])
-        console.write(ansi.MOVE_CURSOR % (self.cursor_row, self.cursor_col))
-        #console.flush()
+        """Write the changes to the screen in one go."""
+        scrolls, runs = self._shadow.pop_updates()
+        for from_line, scroll_height, rows, blank in scrolls:
+            self._scroll(from_line, scroll_height, rows, blank)
+        for row, col, cells in runs:
+            self._write_run(row, col, cells)
+        if self.cursor_visible:
+            self._move_to(self.cursor_row, self.cursor_col)
+        if self._output:
+            console.write(u''.join(self._output))
+            self._output = []
+
+    def _move_to(self, row, col):
+        """Move the terminal cursor, if it isn't there already."""
+        if self._term_pos == (row, col):
+            return
+        if self._term_pos and self._term_pos[0] == row and self._term_pos[1] < col:
+            self._output.append(ansi.MOVE_N_RIGHT % (col - self._term_pos[1]))
+        else:
+            self._output.append(ansi.MOVE_CURSOR % (row, col))
+        self._term_pos = row, col
+
+    def _write_run(self, row, col, cells):
+        """Write a run of cells."""
+        self._move_to(row, col)
+        # clear trailing blanks rather than writing them out
+        end = len(cells)
+        if col + end > self.width:
+            char, attr = cells[-1]
+            while end > 0 and cells[end-1] == (u' ', attr):
+                end -= 1
+            if len(cells) - end <= len(ansi.CLEAR_TO_EOL):
+                end = len(cells)
+        for char, attr in cells[:end]:
+            self._set_attributes(*attr)
+            self._output.append(char)
+        if end < len(cells):
+            self._set_attributes(*cells[-1][1])
+            self._output.append(ansi.CLEAR_TO_EOL)
+        self._term_pos = row, col + end
+
+    def _scroll(self, from_line, scroll_height, rows, blank):
+        """Scroll a region of the terminal by a number of rows, positive for up."""
+        self._output.append(ansi.SET_SCROLL_REGION % (from_line, scroll_height))
+        self._output.append((ansi.SCROLL_UP if rows > 0 else ansi.SCROLL_DOWN) % abs(rows))
+        self._output.append(ansi.SET_SCROLL_SCREEN)
+        # clear the new rows in the background attribute
+        self._term_pos = None
+        self._set_attributes(*blank[1])
+        if rows > 0:
+            new_rows = range(scroll_height - rows + 1, scroll_height + 1)
+        else:
+            new_rows = range(from_line, from_line - rows)
+        for row in new_rows:
+            self._move_to(row, 1)
+            self._output.append(ansi.CLEAR_LINE)
 
     def _set_default_colours(self, num_attr):
         """Set colours for default palette."""
@@ -99,60 +144,40 @@ class VideoANSI(video_cli.VideoTextBase):
         else:
             fore = 90 + self.default_colours[fore%8]
         back = 40 + self.default_colours[back%8]
-        console.write(ansi.SET_COLOUR % 0)
-        console.write(ansi.SET_COLOUR % back)
-        console.write(ansi.SET_COLOUR % fore)
         if blink:
-            console.write(ansi.SET_COLOUR % 5)
-        #console.flush()
+            self._output.append(ansi.SET_ATTRIBUTES % u'0;%i;%i;5' % (back, fore))
+        else:
+            self._output.append(ansi.SET_ATTRIBUTES % u'0;%i;%i' % (back, fore))
 
     def set_mode(self, mode_info):
         """Change screen mode."""
         self.height = mode_info.height
         self.width = mode_info.width
-        self.num_pages = mode_info.num_pages
-        self.text = [[[(u' ', (7, 0, False, False))]*self.width
-                            for _ in range(self.height)]
-                            for _ in range(self.num_pages)]
+        blank = u' ', (7, 0, False, False)
+        self._shadow.set_mode(self.height, self.width, mode_info.num_pages, blank)
         self._set_default_colours(len(mode_info.palette))
-        console.write(ansi.RESIZE_TERM % (self.height, self.width))
-        self._set_attributes(7, 0, False, False)
-        console.write(ansi.CLEAR_SCREEN)
-        #console.flush()
+        self._output.append(ansi.RESIZE_TERM % (self.height, self.width))
+        self._set_attributes(*blank[1])
+        self._output.append(ansi.CLEAR_SCREEN)
+        self._term_pos = None
+        self._shadow.clear_shown(blank)
         return True
 
     def set_page(self, new_vpagenum, new_apagenum):
         """Set visible and active page."""
-        if (self.vpagenum, self.apagenum) == (new_vpagenum, new_apagenum):
-            return
-        self.vpagenum, self.apagenum = new_vpagenum, new_apagenum
-        self._redraw()
+        self._shadow.set_page(new_vpagenum, new_apagenum)
 
     def copy_page(self, src, dst):
         """Copy screen pages."""
-        self.text[dst] = [row[:] for row in self.text[src]]
-        if dst == self.vpagenum:
-            self._redraw()
+        self._shadow.copy_page(src, dst)
 
     def clear_rows(self, back_attr, start, stop):
         """Clear screen rows."""
-        self.text[self.apagenum][start-1:stop] = [
-            [(u' ', (7, 0, False, False))]*len(self.text[self.apagenum][0])
-                        for _ in range(start-1, stop)]
-        if self.vpagenum == self.apagenum:
-            self._set_attributes(7, back_attr, False, False)
-            for r in range(start, stop+1):
-                console.write(ansi.MOVE_CURSOR % (r, 1))
-                console.write(ansi.CLEAR_LINE)
-            console.write(ansi.MOVE_CURSOR % (self.cursor_row, self.cursor_col))
-            #console.flush()
+        self._shadow.clear_rows(start, stop, (u' ', (7, back_attr, False, False)))
 
     def move_cursor(self, row, col):
         """Move the cursor to a new position."""
-        if (row, col) != (self.cursor_row, self.cursor_col):
-            self.cursor_row, self.cursor_col = row, col
-            console.write(ansi.MOVE_CURSOR % (self.cursor_row, self.cursor_col))
-            #console.flush()
+        self.cursor_row, self.cursor_col = row, col
 
     def set_cursor_attr(self, attr):
         """Change attribute of cursor."""
@@ -160,14 +185,15 @@ class VideoANSI(video_cli.VideoTextBase):
 
     def show_cursor(self, cursor_on):
         """Change visibility of cursor."""
+        if cursor_on == self.cursor_visible:
+            return
         self.cursor_visible = cursor_on
         if cursor_on:
-            console.write(ansi.SHOW_CURSOR)
+            self._output.append(ansi.SHOW_CURSOR)
             #console.write(ansi.SET_CURSOR_SHAPE % cursor_shape)
         else:
             # force move when made visible again
-            console.write(ansi.HIDE_CURSOR)
-        #console.flush()
+            self._output.append(ansi.HIDE_CURSOR)
 
     def set_cursor_shape(self, width, height, from_line, to_line):
         """Set the cursor shape."""
@@ -185,48 +211,23 @@ class VideoANSI(video_cli.VideoTextBase):
         """Put a character at a given position."""
         if char == u'\0':
             char = u' '
-        self.text[pagenum][row-1][col-1] = char, (fore, back, blink, underline)
-        if is_fullwidth:
-            self.text[pagenum][row-1][col] = u'', (fore, back, blink, underline)
-        if self.vpagenum != pagenum:
-            return
-        if (row, col) != (self.cursor_row, self.cursor_col):
-            console.write(ansi.MOVE_CURSOR % (row, col))
-        self._set_attributes(fore, back, blink, underline)
-        console.write(char)
-        if is_fullwidth:
-            console.write(u' ')
-        self.cursor_row, self.cursor_col = row, col+1
-        #console.flush()
-
-    def scroll_up(self, from_line, scroll_height, back_attr):
-        """Scroll the screen up between from_line and scroll_height."""
-        self.text[self.apagenum][from_line-1:scroll_height] = (
-                self.text[self.apagenum][from_line:scroll_height] +
-                [[(u' ', 0)]*len(self.text[self.apagenum][0])])
-        if self.apagenum != self.vpagenum:
-            return
-        console.write(ansi.SET_SCROLL_REGION % (from_line, scroll_height))
-        console.write(ansi.SCROLL_UP % 1)
-        console.write(ansi.SET_SCROLL_SCREEN)
-        self.clear_rows(back_attr, scroll_height, scroll_height)
-
-    def scroll_down(self, from_line, scroll_height, back_attr):
-        """Scroll the screen down between from_line and scroll_height."""
-        self.text[self.apagenum][from_line-1:scroll_height] = (
-                [[(u' ', 0)]*len(self.text[self.apagenum][0])] +
-                self.text[self.apagenum][from_line-1:scroll_height-1])
-        if self.apagenum != self.vpagenum:
-            return
-        console.write(ansi.SET_SCROLL_REGION % (from_line, scroll_height))
-        console.write(ansi.SCROLL_DOWN % 1)
-        console.write(ansi.SET_SCROLL_SCREEN)
-        self.clear_rows(back_attr, from_line, from_line)
+        self._shadow.put(pagenum, row, col, char, (fore, back, blink, underline), is_fullwidth)
+
+    def scroll_up(self, from_line, scroll_height, back_attr, count):
+        """Scroll the screen up by count rows between from_line and scroll_height."""
+        self._shadow.scroll_up(
+            from_line, scroll_height, (u' ', (7, back_attr, False, False)), count
+        )
+
+    def scroll_down(self, from_line, scroll_height, back_attr, count):
+        """Scroll the screen down by count rows between from_line and scroll_height."""
+        self._shadow.scroll_down(
+            from_line, scroll_height, (u' ', (7, back_attr, False, False)), count
+        )
 
     def set_caption_message(self, msg):
         """Add a message to the window caption."""
         if msg:
-            console.write(ansi.SET_TITLE % (self.caption + u' - ' + msg))
+            self._output.append(ansi.SET_TITLE % (self.caption + u' - ' + msg))
         else:
-            console.write(ansi.SET_TITLE % self.caption)
-        #console.flush()
+            self._output.append(ansi.SET_TITLE % self.caption)
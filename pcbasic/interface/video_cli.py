@@ -148,22 +148,24 @@ class VideoCLI(VideoTextBase):
             console.write(ansi.CLEAR_LINE.decode('ascii'))
             #console.flush()
 
-    def scroll_up(self, from_line, scroll_height, back_attr):
-        """Scroll the screen up between from_line and scroll_height."""
+    def scroll_up(self, from_line, scroll_height, back_attr, count):
+        """Scroll the screen up by count rows between from_line and scroll_height."""
+        count = min(count, scroll_height - from_line + 1)
         self._text[self._apagenum][from_line-1:scroll_height] = (
-                self._text[self._apagenum][from_line:scroll_height]
-                + [[u' '] * len(self._text[self._apagenum][0])]
+                self._text[self._apagenum][from_line-1+count:scroll_height]
+                + [[u' '] * len(self._text[self._apagenum][0]) for _ in range(count)]
             )
         if self._vpagenum != self._apagenum:
             return
-        console.write(u'\r\n')
+        console.write(u'\r\n' * count)
         #console.flush()
 
-    def scroll_down(self, from_line, scroll_height, back_attr):
-        """Scroll the screen down between from_line and scroll_height."""
+    def scroll_down(self, from_line, scroll_height, back_attr, count):
+        """Scroll the screen down by count rows between from_line and scroll_height."""
+        count = min(count, scroll_height - from_line + 1)
         self._text[self._apagenum][from_line-1:scroll_height] = (
-                [[u' '] * len(self._text[self._apagenum][0])] +
-                self._text[self._apagenum][from_line-1:scroll_height-1]
+                [[u' '] * len(self._text[self._apagenum][0]) for _ in range(count)] +
+                self._text[self._apagenum][from_line-1:scroll_height-count]
             )
 
     def set_mode(self, mode_info):
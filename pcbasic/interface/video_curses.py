@@ -25,6 +25,7 @@ from .base import video_plugins, InitFailed
 # only use these if you clear the screen afterwards,
 # so you don't see gibberish if the terminal doesn't support the sequence.
 from . import ansi
+from .shadow import ShadowScreen
 
 
 # sys.stdout expects bytes
@@ -87,7 +88,6 @@ class VideoCurses(VideoPlugin):
         self.cursor_col = 1
         # last colour used
         self.last_colour = None
-        self.vpagenum, self.apagenum = 0, 0
         self.f12_active = False
         # initialised by __enter__
         self.screen = None
@@ -95,7 +95,7 @@ class VideoCurses(VideoPlugin):
         self.underlay = None
         self.window = None
         self.can_change_palette = None
-        self.text = None
+        self._shadow = None
 
     def __enter__(self):
         """Open ANSI interface."""
@@ -123,7 +123,7 @@ class VideoCurses(VideoPlugin):
         self._set_default_colours(16)
         bgcolor = self._curses_colour(7, 0, False)
         # text and colour buffer
-        self.text = [[[(u' ', bgcolor)]*self.width for _ in range(self.height)]]
+        self._shadow = ShadowScreen(self.height, self.width, 1, (u' ', bgcolor))
         self.set_border_attr(0)
         self.screen.clear()
 
@@ -144,6 +144,11 @@ class VideoCurses(VideoPlugin):
 
     def _work(self):
         """Handle screen and interface events."""
+        scrolls, runs = self._shadow.pop_updates()
+        for from_line, scroll_height, rows, blank in scrolls:
+            self._scroll(from_line, scroll_height, rows, blank)
+        for row, col, cells in runs:
+            self._write_run(row, col, cells)
         if self.cursor_visible:
             self.window.move(self.cursor_row-1, self.cursor_col-1)
         self.window.refresh()
@@ -210,21 +215,40 @@ class VideoCurses(VideoPlugin):
         self.set_border_attr(self.border_attr)
 
     def _redraw(self):
-        """Redraw the screen."""
+        """Redraw the whole screen on the next cycle."""
         self.window.clear()
-        if self.last_colour != 0:
-            self.window.bkgdset(32, self._curses_colour(7, 0, False))
-        for row, textrow in enumerate(self.text[self.vpagenum]):
-            for col, charattr in enumerate(textrow):
+        self._shadow.invalidate()
+
+    def _write_run(self, row, col, cells):
+        """Write a run of cells, one call per colour."""
+        start = 0
+        for stop in xrange(1, len(cells) + 1):
+            if stop == len(cells) or cells[stop][1] != cells[start][1]:
+                colour = cells[start][1]
+                if colour != self.last_colour:
+                    self.last_colour = colour
+                    self.window.bkgdset(32, colour)
+                text = u''.join(char for char, _ in cells[start:stop])
                 try:
-                    self.window.addstr(
-                        row, col, charattr[0].encode(ENCODING, 'replace'), charattr[1]
-                    )
+                    self.window.addstr(row-1, col-1+start, text.encode(ENCODING, 'replace'), colour)
                 except curses.error:
+                    # writing to the bottom right corner moves the cursor off the window
                     pass
-        if self.cursor_visible:
-            self.window.move(self.cursor_row-1, self.cursor_col-1)
-        self.window.refresh()
+                start = stop
+
+    def _scroll(self, from_line, scroll_height, rows, blank):
+        """Scroll a region of the window by a number of rows, positive for up."""
+        # the new row is filled with the background
+        self.last_colour = blank[1]
+        self.window.bkgdset(32, blank[1])
+        self.window.scrollok(True)
+        self.window.setscrreg(from_line-1, scroll_height-1)
+        try:
+            self.window.scroll(rows)
+        except curses.error:
+            pass
+        self.window.scrollok(False)
+        self.window.setscrreg(1, self.height-1)
 
     def _set_default_colours(self, num_attrs):
         """Initialise the default colours for the palette."""
@@ -292,43 +316,27 @@ class VideoCurses(VideoPlugin):
         self.width = mode_info.width
         self._set_default_colours(len(mode_info.palette))
         bgcolor = self._curses_colour(7, 0, False)
-        self.text = [
-            [[(u' ', bgcolor)]*self.width for _ in xrange(self.height)]
-            for _ in xrange(mode_info.num_pages)
-        ]
+        self._shadow.set_mode(self.height, self.width, mode_info.num_pages, (u' ', bgcolor))
         self._resize(self.height, self.width)
         self._set_curses_palette()
+        self.last_colour = bgcolor
+        self.window.bkgdset(32, bgcolor)
         self.window.clear()
         self.window.refresh()
         self.window.move(0, 0)
+        self._shadow.clear_shown((u' ', bgcolor))
 
     def set_page(self, new_vpagenum, new_apagenum):
         """Set visible and active page."""
-        self.vpagenum, self.apagenum = new_vpagenum, new_apagenum
-        self._redraw()
+        self._shadow.set_page(new_vpagenum, new_apagenum)
 
     def copy_page(self, src, dst):
         """Copy screen pages."""
-        self.text[dst] = [row[:] for row in self.text[src]]
-        if dst == self.vpagenum:
-            self._redraw()
+        self._shadow.copy_page(src, dst)
 
     def clear_rows(self, back_attr, start, stop):
         """Clear screen rows."""
-        bgcolor = self._curses_colour(7, back_attr, False)
-        self.text[self.apagenum][start-1:stop] = [
-            [(u' ', bgcolor)]*len(self.text[self.apagenum][0])
-            for _ in range(start-1, stop)
-        ]
-        if self.apagenum != self.vpagenum:
-            return
-        self.window.bkgdset(32, bgcolor)
-        for r in range(start, stop+1):
-            try:
-                self.window.move(r-1, 0)
-                self.window.clrtoeol()
-            except curses.error:
-                pass
+        self._shadow.clear_rows(start, stop, (u' ', self._curses_colour(7, back_attr, False)))
 
     def set_palette(self, new_palette, new_palette1):
         """Build the game palette."""
@@ -371,60 +379,17 @@ class VideoCurses(VideoPlugin):
         """Put a character at a given position."""
         if c == u'\0':
             c = u' '
-        colour = self._curses_colour(fore, back, blink)
-        self.text[pagenum][row-1][col-1] = c, colour
-        if is_fullwidth:
-            self.text[pagenum][row-1][col] = u'', colour
-        if pagenum == self.vpagenum:
-            if colour != self.last_colour:
-                self.last_colour = colour
-                self.window.bkgdset(32, colour)
-            try:
-                self.window.addstr(row-1, col-1, c.encode(ENCODING, 'replace'), colour)
-            except curses.error:
-                pass
-
-    def scroll_up(self, from_line, scroll_height, back_attr):
-        """Scroll the screen up between from_line and scroll_height."""
+        self._shadow.put(pagenum, row, col, c, self._curses_colour(fore, back, blink), is_fullwidth)
+
+    def scroll_up(self, from_line, scroll_height, back_attr, count):
+        """Scroll the screen up by count rows between from_line and scroll_height."""
         bgcolor = self._curses_colour(7, back_attr, False)
-        self.text[self.apagenum][from_line-1:scroll_height] = (
-            self.text[self.apagenum][from_line:scroll_height]
-            + [[(u' ', bgcolor)] * len(self.text[self.apagenum][0])]
-        )
-        if self.apagenum != self.vpagenum:
-            return
-        self.window.scrollok(True)
-        self.window.setscrreg(from_line-1, scroll_height-1)
-        try:
-            self.window.scroll(1)
-        except curses.error:
-            pass
-        self.window.scrollok(False)
-        self.window.setscrreg(1, self.height-1)
-        self.clear_rows(back_attr, scroll_height, scroll_height)
-        if self.cursor_row > 1:
-            self.window.move(self.cursor_row-2, self.cursor_col-1)
+        self._shadow.scroll_up(from_line, scroll_height, (u' ', bgcolor), count)
 
-    def scroll_down(self, from_line, scroll_height, back_attr):
-        """Scroll the screen down between from_line and scroll_height."""
+    def scroll_down(self, from_line, scroll_height, back_attr, count):
+        """Scroll the screen down by count rows between from_line and scroll_height."""
         bgcolor = self._curses_colour(7, back_attr, False)
-        self.text[self.apagenum][from_line-1:scroll_height] = (
-            [[(u' ', bgcolor)] * len(self.text[self.apagenum][0])]
-            + self.text[self.apagenum][from_line-1:scroll_height-1]
-        )
-        if self.apagenum != self.vpagenum:
-            return
-        self.window.scrollok(True)
-        self.window.setscrreg(from_line-1, scroll_height-1)
-        try:
-            self.window.scroll(-1)
-        except curses.error:
-            pass
-        self.window.scrollok(False)
-        self.window.setscrreg(1, self.height-1)
-        self.clear_rows(back_attr, from_line, from_line)
-        if self.cursor_row < self.height:
-            self.window.move(self.cursor_row, self.cursor_col-1)
+        self._shadow.scroll_down(from_line, scroll_height, (u' ', bgcolor), count)
 
     def set_caption_message(self, msg):
         """Add a message to the window caption."""
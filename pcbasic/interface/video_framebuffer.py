@@ -0,0 +1,274 @@
+"""
+PC-BASIC - video_framebuffer.py
+Headless interface keeping the screen in memory, with frame capture to image files
+
+(c) 2018 Rob Hagemans
+This file is released under the GNU GPL version 3 or later.
+"""
+
+import io
+import zlib
+import struct
+import logging
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .video import VideoPlugin
+from .base import video_plugins, InitFailed
+from . import window
+
+
+# PNG file signature
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+@video_plugins.register('framebuffer')
+class VideoFramebuffer(VideoPlugin):
+    """Headless interface that keeps the visible frame in memory."""
+
+    # graphics are read directly from the interpreter's pixel buffer
+    shared_framebuffer = True
+
+    def __init__(self, input_queue, video_queue, capture_file=u'', capture_interval=0, **kwargs):
+        """Initialise headless interface."""
+        if not numpy:
+            raise InitFailed('Module `numpy` not found')
+        VideoPlugin.__init__(self, input_queue, video_queue)
+        # file to capture frames to, may contain a %d-style frame number pattern
+        self._capture_file = capture_file
+        # capture a frame every so many interface cycles; 0 for no periodic capture
+        self._capture_interval = capture_interval
+        self._cycle = 0
+        # number of frames captured to the capture file
+        self._frame_number = 0
+        # open PPM stream for frame sequences
+        self._stream = None
+        # screen pages, [y][x] attributes
+        self._pages = []
+        self._framebuffer = None
+        self.vpagenum, self.apagenum = 0, 0
+        self.text_mode = True
+        self.font_width, self.font_height = 8, 16
+        self.size = 0, 0
+        self.bitsperpixel = 4
+        self.num_fore_attrs = 16
+        self._glyphs = {}
+        # glyphs by font size, kept across mode switches as the interpreter expects
+        self._glyph_dicts = {}
+        # RGB palette for each attribute; non-blinking state
+        self._palette = numpy.zeros((256, 3), dtype=numpy.uint8)
+        self._saved_palette = self._palette
+        self._composite = False
+        # numpy palettes for each game palette
+        self._palettes = window.PaletteCache(lambda rgb: numpy.array(rgb, dtype=numpy.uint8))
+
+    def __exit__(self, type, value, traceback):
+        """Capture the final frame and close the interface."""
+        try:
+            if self._capture_file and self._pages:
+                self._capture()
+        finally:
+            if self._stream:
+                self._stream.close()
+            VideoPlugin.__exit__(self, type, value, traceback)
+
+    def _work(self):
+        """Capture frames periodically."""
+        if self._capture_interval and self._capture_file and self._pages:
+            self._cycle += 1
+            if self._cycle >= self._capture_interval:
+                self._cycle = 0
+                self._capture()
+
+    def get_frame(self):
+        """RGB frame of the visible page, as a numpy array [y][x][rgb]."""
+        page = self._get_page(self.vpagenum)
+        if self._composite:
+            return window.apply_composite_rgb(page, self._palette, 4//self.bitsperpixel)
+        return self._palette[page]
+
+    def _get_page(self, pagenum):
+        """Attributes of a screen page, as a numpy array [y][x]."""
+        if self._framebuffer:
+            return self._framebuffer.pages[pagenum].buffer.view(numpy.uint8)
+        return self._pages[pagenum]
+
+    def _capture(self):
+        """Write the visible frame to the capture file."""
+        if u'%' in self._capture_file:
+            self._write(self._capture_file % (self._frame_number,))
+        elif self._capture_file.lower().endswith(u'.png'):
+            self._write(self._capture_file)
+        else:
+            # uncompressed frame sequence as a stream of PPM images
+            try:
+                if not self._stream:
+                    self._stream = io.open(self._capture_file, 'wb')
+                write_ppm(self._stream, self.get_frame())
+            except EnvironmentError as e:
+                logging.error('Could not write frame to %s: %s', self._capture_file, e)
+                self._capture_file = u''
+        self._frame_number += 1
+
+    def _write(self, filename):
+        """Write the visible frame to an image file."""
+        writer = write_png if filename.lower().endswith(u'.png') else write_ppm
+        try:
+            with io.open(filename, 'wb') as image_file:
+                writer(image_file, self.get_frame())
+        except EnvironmentError as e:
+            logging.error('Could not write frame to %s: %s', filename, e)
+
+    # signal handlers
+
+    def capture_frame(self, filename):
+        """Write the visible screen to an image file; by default, to the capture file."""
+        if not self._pages:
+            return
+        if filename:
+            self._write(filename)
+        elif self._capture_file:
+            self._capture()
+
+    def set_mode(self, mode_info):
+        """Initialise a given text or graphics mode."""
+        self.text_mode = mode_info.is_text_mode
+        # the interpreter will send the new pixel buffer
+        self._framebuffer = None
+        self.font_height = mode_info.font_height
+        self.font_width = mode_info.font_width
+        if not self.text_mode:
+            self.bitsperpixel = mode_info.bitsperpixel
+        self.size = mode_info.pixel_width, mode_info.pixel_height
+        self._glyphs = self._glyph_dicts.setdefault(
+            (self.font_height, self.font_width),
+            {u'\0': numpy.zeros((self.font_height, self.font_width), dtype=bool)}
+        )
+        self._pages = [
+            numpy.zeros((mode_info.pixel_height, mode_info.pixel_width), dtype=numpy.uint8)
+            for _ in range(mode_info.num_pages)
+        ]
+
+    def set_framebuffer(self, pixels):
+        """Use the interpreter's pixel buffer for graphics; None in text mode."""
+        self._framebuffer = pixels
+
+    def set_page(self, vpage, apage):
+        """Set the visible and active page."""
+        self.vpagenum, self.apagenum = vpage, apage
+
+    def set_palette(self, rgb_palette_0, rgb_palette_1):
+        """Build the palette."""
+        self.num_fore_attrs = min(16, len(rgb_palette_0))
+        # blinking attributes are shown in their visible state
+        # bottom 128 are non-blink, top 128 blink
+        self._palette, _ = self._palettes.get_show_palettes(rgb_palette_0, rgb_palette_1)
+
+    def set_composite(self, on, composite_colors):
+        """Enable/disable composite artifacts."""
+        if on != self._composite:
+            self._palette, self._saved_palette = self._saved_palette, self._palette
+        if on:
+            self._palette = self._palettes.get_composite_palette(composite_colors)
+        self._composite = on
+
+    def build_glyphs(self, new_dict):
+        """Build a dict of glyphs for use in text mode."""
+        for char, glyph in new_dict.iteritems():
+            if glyph is None:
+                # the interpreter has let go of this glyph
+                self._glyphs.pop(char, None)
+            else:
+                self._glyphs[char] = numpy.asarray(glyph, dtype=bool)
+
+    def put_glyph(self, pagenum, row, col, cp, is_fullwidth, fore, back, blink, underline):
+        """Put a character at a given position."""
+        if not self.text_mode:
+            # in graphics mode, the pixel buffer holds the glyphs
+            return
+        attr = fore + self.num_fore_attrs*back + 128*blink
+        x0, y0 = (col-1)*self.font_width, (row-1)*self.font_height
+        try:
+            glyph = self._glyphs[cp]
+        except KeyError:
+            logging.warning('No glyph received for code point %s', hex(ord(cp)))
+            glyph = self._glyphs[u'\0']
+        height, width = glyph.shape
+        self._pages[pagenum][y0:y0+height, x0:x0+width] = numpy.where(glyph, attr, back)
+        if underline:
+            self._pages[pagenum][y0 + self.font_height - 1, x0:x0+width] = attr
+
+    def clear_rows(self, back_attr, start, stop):
+        """Clear a range of screen rows."""
+        if not self._framebuffer:
+            self._pages[self.apagenum][(start-1)*self.font_height:stop*self.font_height] = back_attr
+
+    def scroll_up(self, from_line, scroll_height, back_attr, count):
+        """Scroll the screen up by count rows between from_line and scroll_height."""
+        if not self._framebuffer:
+            page = self._pages[self.apagenum]
+            y0, y1 = (from_line-1)*self.font_height, scroll_height*self.font_height
+            height = min(count*self.font_height, y1-y0)
+            page[y0:y1-height] = page[y0+height:y1]
+            page[y1-height:y1] = back_attr
+
+    def scroll_down(self, from_line, scroll_height, back_attr, count):
+        """Scroll the screen down by count rows between from_line and scroll_height."""
+        if not self._framebuffer:
+            page = self._pages[self.apagenum]
+            y0, y1 = (from_line-1)*self.font_height, scroll_height*self.font_height
+            height = min(count*self.font_height, y1-y0)
+            page[y0+height:y1] = page[y0:y1-height]
+            page[y0:y0+height] = back_attr
+
+    def copy_page(self, src, dst):
+        """Copy source to destination page."""
+        if not self._framebuffer:
+            self._pages[dst][:] = self._pages[src]
+
+    def put_pixel(self, pagenum, x, y, index):
+        """Put a pixel on the screen."""
+        self._pages[pagenum][y, x] = index
+
+    def fill_rect(self, pagenum, x0, y0, x1, y1, index):
+        """Fill a rectangle in a solid attribute."""
+        self._pages[pagenum][y0:y1+1, x0:x1+1] = index
+
+    def fill_interval(self, pagenum, x0, x1, y, index):
+        """Fill a scanline interval in a solid attribute."""
+        self._pages[pagenum][y, x0:x1+1] = index
+
+    def put_interval(self, pagenum, x, y, colours):
+        """Write a list of attributes to a scanline interval."""
+        self._pages[pagenum][y, x:x+len(colours)] = colours
+
+    def put_rect(self, pagenum, x0, y0, x1, y1, array):
+        """Apply numpy array [y][x] of attributes to an area."""
+        self._pages[pagenum][y0:y1+1, x0:x1+1] = array
+
+
+def write_ppm(stream, frame):
+    """Write an RGB frame [y][x][rgb] to a stream as a binary PPM image."""
+    height, width, _ = frame.shape
+    stream.write(b'P6\n%d %d\n255\n' % (width, height))
+    stream.write(numpy.ascontiguousarray(frame, dtype=numpy.uint8).tostring())
+
+def write_png(stream, frame):
+    """Write an RGB frame [y][x][rgb] to a stream as a PNG image."""
+    height, width, _ = frame.shape
+    # each scanline starts with filter type 0
+    scanlines = numpy.zeros((height, 1 + 3*width), dtype=numpy.uint8)
+    scanlines[:, 1:] = frame.reshape(height, 3*width)
+    stream.write(PNG_SIGNATURE)
+    _write_png_chunk(stream, b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+    _write_png_chunk(stream, b'IDAT', zlib.compress(scanlines.tostring()))
+    _write_png_chunk(stream, b'IEND', b'')
+
+def _write_png_chunk(stream, chunk_type, data):
+    """Write a PNG chunk."""
+    stream.write(struct.pack('>I', len(data)))
+    stream.write(chunk_type + data)
+    stream.write(struct.pack('>I', zlib.crc32(chunk_type + data) & 0xffffffff))
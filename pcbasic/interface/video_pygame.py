@@ -80,6 +80,8 @@ class VideoPygame(VideoPlugin):
         # display & border
         # display buffer
         self.canvas = []
+        # canvas surfaces by size, reused on mode switches
+        self._canvases = {}
         # border attribute
         self.border_attr = 0
         # palette and colours
@@ -90,11 +92,23 @@ class VideoPygame(VideoPlugin):
         # display palettes for blink states 0, 1
         self._palette = [None, None]
         self._saved_palette = [None, None]
+        # display palettes for each game palette
+        self._palettes = window.PaletteCache(list)
+        # game palette last set, to skip repeated changes
+        self._palette_key = None
         # text attributes supported
         self.mode_has_blink = True
         # update cycle
         # update flag
         self.busy = False
+        # areas of the visible page that need to be presented
+        self._dirty = window.DirtyRects()
+        # blink state and clipboard feedback at last presentation
+        self._flip_blink_state = 0
+        self._flip_overlay = False
+        # work surface with border and its copy in display format
+        self._screen = None
+        self._converted = None
         # refresh cycle parameters
         self._cycle = 0
         self.last_cycle = 0
@@ -111,6 +125,8 @@ class VideoPygame(VideoPlugin):
         # fonts
         # prebuilt glyphs
         self.glyph_dict = {}
+        # glyphs by font size, kept across mode switches as the interpreter expects
+        self._glyph_dicts = {}
         # joystick and mouse
         # available joysticks
         self.joysticks = []
@@ -355,13 +371,27 @@ class VideoPygame(VideoPlugin):
 
     def _do_flip(self):
         """Draw the canvas to the screen."""
-        # create the screen that will be stretched onto the display
+        # remove the cursor from where we drew it and draw it where it is now
+        self._dirty.add(*self._cursor_rect(self.last_row, self.last_col))
+        self._dirty.add(*self._cursor_rect(self.cursor_row, self.cursor_col))
+        full, rects = self._dirty.pop()
+        # a change in blink state only shows if anything blinks
+        if self.blink_state != self._flip_blink_state:
+            self._flip_blink_state = self.blink_state
+            full = full or bool((pygame.surfarray.pixels2d(self.canvas[self.vpagenum]) >= 128).any())
+        # clipboard feedback, composite artifacts and smooth scaling affect the whole screen
+        overlay = self.clipboard.active()
+        full = full or overlay or self._flip_overlay or self._composite or self._smooth
+        self._flip_overlay = overlay
+        if full:
+            self._present_all()
+        else:
+            self._present_rects(rects)
+
+    def _present_all(self):
+        """Draw the whole canvas and border to the screen."""
         border_x, border_y = self._window_sizer.border_start()
-        # surface depth and flags match those of canvas
-        # pylint: disable=E1121,E1123
-        screen = pygame.Surface(
-            (self.size[0] + 2*border_x, self.size[1] + 2*border_y),
-            0, self.canvas[self.vpagenum])
+        screen = self._screen
         screen.set_palette(self.work_palette)
         # border colour
         border_colour = pygame.Color(0, 0, self.border_attr % self.num_fore_attrs)
@@ -375,14 +405,51 @@ class VideoPygame(VideoPlugin):
         if self._composite:
             screen = apply_composite_artifacts(screen, 4//self.bitsperpixel)
         screen.set_palette(self._palette[self.blink_state])
+        self._converted = screen.convert(self.display)
         if self._smooth:
-            pygame.transform.smoothscale(screen.convert(self.display),
-                                         self.display.get_size(), self.display)
+            pygame.transform.smoothscale(self._converted, self.display.get_size(), self.display)
         else:
-            pygame.transform.scale(screen.convert(self.display),
-                                   self.display.get_size(), self.display)
+            pygame.transform.scale(self._converted, self.display.get_size(), self.display)
         pygame.display.flip()
 
+    def _present_rects(self, rects):
+        """Draw areas of the canvas to the screen."""
+        border_x, border_y = self._window_sizer.border_start()
+        screen = self._screen
+        # canvas and screen must share a palette for attributes to be copied unchanged
+        screen.set_palette(self.work_palette)
+        for x, y, width, height in rects:
+            screen.blit(self.canvas[self.vpagenum], (border_x + x, border_y + y), (x, y, width, height))
+        self._draw_cursor(screen.subsurface((border_x, border_y, self.size[0], self.size[1])))
+        screen.set_palette(self._palette[self.blink_state])
+        work_size, display_size = screen.get_size(), self.display.get_size()
+        update_rects = []
+        for x, y, width, height in rects:
+            src, dst = window.scale_rect(
+                (border_x + x, border_y + y, width, height), work_size, display_size
+            )
+            self._converted.blit(screen, src[:2], src)
+            self.display.blit(
+                pygame.transform.scale(self._converted.subsurface(src), dst[2:]), dst[:2]
+            )
+            update_rects.append(dst)
+        pygame.display.update(update_rects)
+
+    def _rows_rect(self, start, stop):
+        """Canvas area covered by a range of text rows."""
+        return 0, (start-1) * self.font_height, self.size[0], (stop-start+1) * self.font_height
+
+    def _cursor_rect(self, row, col):
+        """Canvas area covered by the cursor at a given position."""
+        # leave room for a fullwidth cursor
+        return (col-1) * self.font_width, (row-1) * self.font_height, 2*self.font_width, self.font_height
+
+    def _set_dirty(self, pagenum, x, y, width, height):
+        """Area of a page has changed; present it if the page is visible."""
+        if pagenum == self.vpagenum:
+            self._dirty.add(x, y, width, height)
+            self.busy = True
+
     def _draw_cursor(self, screen):
         """Draw the cursor on the surface provided."""
         if not self.cursor_visible or self.vpagenum != self.apagenum:
@@ -424,6 +491,7 @@ class VideoPygame(VideoPlugin):
         self.display = pygame.display.set_mode((width, height), flags)
         self._window_sizer.window_size = width, height
         # load display if requested
+        self._dirty.set_full()
         self.busy = True
 
 
@@ -436,6 +504,8 @@ class VideoPygame(VideoPlugin):
         # unpack mode info struct
         self.font_height = mode_info.font_height
         self.font_width = mode_info.font_width
+        # glyphs are kept for each font size
+        self.glyph_dict = self._glyph_dicts.setdefault((self.font_height, self.font_width), {})
         self.num_pages = mode_info.num_pages
         self.mode_has_blink = mode_info.has_blink
         if not self.text_mode:
@@ -447,11 +517,23 @@ class VideoPygame(VideoPlugin):
         # set standard cursor
         self.set_cursor_shape(self.font_width, self.font_height,
                               0, self.font_height)
-        # whole screen (blink on & off)
-        self.canvas = [ pygame.Surface(self.size, depth=8) # pylint: disable=E1121,E1123
-                        for _ in range(self.num_pages)]
-        for i in range(self.num_pages):
-            self.canvas[i].set_palette(self.work_palette)
+        # whole screen (blink on & off); clear and reuse those of a mode with the same size
+        canvases = self._canvases.setdefault(self.size, [])
+        for canvas in canvases[:self.num_pages]:
+            canvas.fill((0, 0, 0))
+        for _ in range(len(canvases), self.num_pages):
+            canvas = pygame.Surface(self.size, depth=8) # pylint: disable=E1121,E1123
+            canvas.set_palette(self.work_palette)
+            canvases.append(canvas)
+        self.canvas = canvases[:self.num_pages]
+        # work surface that will be stretched onto the display
+        # surface depth and flags match those of canvas
+        border_x, border_y = self._window_sizer.border_start()
+        work_size = self.size[0] + 2*border_x, self.size[1] + 2*border_y
+        if self._screen is None or self._screen.get_size() != work_size:
+            self._screen = pygame.Surface(work_size, 0, self.canvas[0]) # pylint: disable=E1121,E1123
+        self._dirty.size = self.size
+        self._dirty.set_full()
         # initialise clipboard
         self.clipboard = clipboard.ClipboardInterface(
                 self.clipboard_handler, self._input_queue,
@@ -470,31 +552,33 @@ class VideoPygame(VideoPlugin):
 
     def set_palette(self, rgb_palette_0, rgb_palette_1):
         """Build the palette."""
+        key = rgb_palette_0, rgb_palette_1
+        if key == self._palette_key:
+            return
+        self._palette_key = key
         self.num_fore_attrs = min(16, len(rgb_palette_0))
         self.num_back_attrs = min(8, self.num_fore_attrs)
-        rgb_palette_1 = rgb_palette_1 or rgb_palette_0
-        # fill up the 8-bit palette with all combinations we need
-        # blink states: 0 light up, 1 light down
-        # bottom 128 are non-blink, top 128 blink to background
-        self._palette[0] = rgb_palette_0[:self.num_fore_attrs] * (256//self.num_fore_attrs)
-        self._palette[1] = rgb_palette_1[:self.num_fore_attrs] * (128//self.num_fore_attrs)
-        for b in rgb_palette_1[:self.num_back_attrs] * (
-                    128 // self.num_fore_attrs // self.num_back_attrs):
-            self._palette[1] += [b]*self.num_fore_attrs
+        self._palette[0], self._palette[1] = self._palettes.get_show_palettes(
+            rgb_palette_0, rgb_palette_1
+        )
+        self._dirty.set_full()
         self.busy = True
 
     def set_border_attr(self, attr):
         """Change the border attribute."""
         self.border_attr = attr
+        self._dirty.set_full()
         self.busy = True
 
     def set_composite(self, on, composite_colors):
         """Enable/disable composite artifacts."""
         if on != self._composite:
             self._palette, self._saved_palette = self._saved_palette, self._palette
+            self._palette_key = None
         if on:
-            self._palette = [composite_colors] * 2
+            self._palette = [self._palettes.get_composite_palette(composite_colors)] * 2
         self._composite = on
+        self._dirty.set_full()
         self.busy = True
 
     def clear_rows(self, back_attr, start, stop):
@@ -503,17 +587,21 @@ class VideoPygame(VideoPlugin):
         scroll_area = pygame.Rect(
                 0, (start-1)*self.font_height, self.size[0], (stop-start+1)*self.font_height)
         self.canvas[self.apagenum].fill(bg, scroll_area)
-        self.busy = True
+        self._set_dirty(self.apagenum, *self._rows_rect(start, stop))
 
     def set_page(self, vpage, apage):
         """Set the visible and active page."""
         self.vpagenum, self.apagenum = vpage, apage
+        self._dirty.set_full()
         self.busy = True
 
     def copy_page(self, src, dst):
         """Copy source to destination page."""
+        if not self.text_mode:
+            # in graphics mode, the changed pixels arrive as a put_rect call
+            return
         self.canvas[dst].blit(self.canvas[src], (0, 0))
-        self.busy = True
+        self._set_dirty(dst, 0, 0, self.size[0], self.size[1])
 
     def show_cursor(self, cursor_on):
         """Change visibility of cursor."""
@@ -529,38 +617,40 @@ class VideoPygame(VideoPlugin):
         self.cursor_attr = attr % self.num_fore_attrs
         self.cursor.set_palette_at(254, pygame.Color(0, self.cursor_attr, self.cursor_attr))
 
-    def scroll_up(self, from_line, scroll_height, back_attr):
-        """Scroll the screen up between from_line and scroll_height."""
+    def scroll_up(self, from_line, scroll_height, back_attr, count):
+        """Scroll the screen up by count rows between from_line and scroll_height."""
+        count = min(count, scroll_height - from_line + 1)
         temp_scroll_area = pygame.Rect(
             0, (from_line-1)*self.font_height,
             self.size[0], (scroll_height-from_line+1) * self.font_height
         )
-        # scroll
+        # scroll all rows in one blit
         self.canvas[self.apagenum].set_clip(temp_scroll_area)
-        self.canvas[self.apagenum].scroll(0, -self.font_height)
-        # empty new line
+        self.canvas[self.apagenum].scroll(0, -count*self.font_height)
+        # empty new lines
         bg = (0, 0, back_attr)
-        self.canvas[self.apagenum].fill(
-            bg, (0, (scroll_height-1) * self.font_height, self.size[0], self.font_height)
-        )
+        self.canvas[self.apagenum].fill(bg, (
+            0, (scroll_height-count) * self.font_height, self.size[0], count*self.font_height
+        ))
         self.canvas[self.apagenum].set_clip(None)
-        self.busy = True
+        self._set_dirty(self.apagenum, *self._rows_rect(from_line, scroll_height))
 
-    def scroll_down(self, from_line, scroll_height, back_attr):
-        """Scroll the screen down between from_line and scroll_height."""
+    def scroll_down(self, from_line, scroll_height, back_attr, count):
+        """Scroll the screen down by count rows between from_line and scroll_height."""
+        count = min(count, scroll_height - from_line + 1)
         temp_scroll_area = pygame.Rect(
             0, (from_line-1) * self.font_height,
             self.size[0], (scroll_height-from_line+1) * self.font_height
         )
         self.canvas[self.apagenum].set_clip(temp_scroll_area)
-        self.canvas[self.apagenum].scroll(0, self.font_height)
-        # empty new line
+        self.canvas[self.apagenum].scroll(0, count*self.font_height)
+        # empty new lines
         bg = (0, 0, back_attr)
-        self.canvas[self.apagenum].fill(
-            bg, (0, (from_line-1) * self.font_height, self.size[0], self.font_height)
-        )
+        self.canvas[self.apagenum].fill(bg, (
+            0, (from_line-1) * self.font_height, self.size[0], count*self.font_height
+        ))
         self.canvas[self.apagenum].set_clip(None)
-        self.busy = True
+        self._set_dirty(self.apagenum, *self._rows_rect(from_line, scroll_height))
 
     def put_glyph(self, pagenum, row, col, cp, is_fullwidth, fore, back, blink, underline):
         """Put a single-byte character at a given position."""
@@ -589,12 +679,16 @@ class VideoPygame(VideoPlugin):
             self.canvas[pagenum].blit(glyph, (x0, y0))
         if underline:
             self.canvas[pagenum].fill(color, (x0, y0 + self.font_height - 1, self.font_width, 1))
-        self.busy = True
+        self._set_dirty(pagenum, x0, y0, self.font_width, self.font_height)
 
     def build_glyphs(self, new_dict):
         """Build a dict of glyphs for use in text mode."""
         for char, glyph in new_dict.iteritems():
-            self.glyph_dict[char] = glyph_to_surface(glyph)
+            if glyph is None:
+                # the interpreter has let go of this glyph
+                self.glyph_dict.pop(char, None)
+            else:
+                self.glyph_dict[char] = glyph_to_surface(glyph)
 
     def set_cursor_shape(self, width, height, from_line, to_line):
         """Build a sprite for the cursor."""
@@ -610,26 +704,26 @@ class VideoPygame(VideoPlugin):
     def put_pixel(self, pagenum, x, y, index):
         """Put a pixel on the screen; callback to empty character buffer."""
         self.canvas[pagenum].set_at((x,y), index)
-        self.busy = True
+        self._set_dirty(pagenum, x, y, 1, 1)
 
     def fill_rect(self, pagenum, x0, y0, x1, y1, index):
         """Fill a rectangle in a solid attribute."""
         rect = pygame.Rect(x0, y0, x1-x0+1, y1-y0+1)
         self.canvas[pagenum].fill(index, rect)
-        self.busy = True
+        self._set_dirty(pagenum, x0, y0, x1-x0+1, y1-y0+1)
 
     def fill_interval(self, pagenum, x0, x1, y, index):
         """Fill a scanline interval in a solid attribute."""
         dx = x1 - x0 + 1
         self.canvas[pagenum].fill(index, (x0, y, dx, 1))
-        self.busy = True
+        self._set_dirty(pagenum, x0, y, dx, 1)
 
     def put_interval(self, pagenum, x, y, colours):
         """Write a list of attributes to a scanline interval."""
         # reference the interval on the canvas
         pygame.surfarray.pixels2d(self.canvas[pagenum]
                 )[x:x+len(colours), y] = numpy.array(colours).astype(int)
-        self.busy = True
+        self._set_dirty(pagenum, x, y, len(colours), 1)
 
     def put_rect(self, pagenum, x0, y0, x1, y1, array):
         """Apply numpy array [y][x] of attribytes to an area."""
@@ -638,7 +732,7 @@ class VideoPygame(VideoPlugin):
         # reference the destination area
         pygame.surfarray.pixels2d(self.canvas[pagenum].subsurface(
             pygame.Rect(x0, y0, x1-x0+1, y1-y0+1)))[:] = numpy.array(array).T
-        self.busy = True
+        self._set_dirty(pagenum, x0, y0, x1-x0+1, y1-y0+1)
 
 
 ###############################################################################
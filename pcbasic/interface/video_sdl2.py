@@ -394,6 +394,8 @@ def _pixels2d(psurface):
 class VideoSDL2(VideoPlugin):
     """SDL2-based graphical interface."""
 
+    shared_framebuffer = True
+
     def __init__(
             self, input_queue, video_queue,
             caption=u'', icon=ICON,
@@ -421,6 +423,12 @@ class VideoSDL2(VideoPlugin):
         # palette and colours
         # composite colour artifacts are active
         self._composite = False
+        # SDL colour arrays for each game palette
+        self._palettes = window.PaletteCache(
+            lambda rgb: (sdl2.SDL_Color * 256)(*(sdl2.SDL_Color(r, g, b, 255) for (r, g, b) in rgb))
+        )
+        # game palette last set, to skip repeated changes
+        self._palette_key = None
         # update cycle
         self._cycle = 0
         self._last_tick = 0
@@ -437,6 +445,13 @@ class VideoSDL2(VideoPlugin):
         self._f11_active = False
         # we need a set_mode call to be really up and running
         self._has_window = False
+        # interpreter's pixel buffer, in graphics mode
+        self._framebuffer = None
+        # areas of the visible page that need to be presented
+        self._dirty = window.DirtyRects()
+        # blink state and clipboard feedback at last presentation
+        self._flip_blink_state = 0
+        self._flip_overlay = False
         # ensure the correct SDL2 video driver is chosen for Windows
         # since this gets messed up if we also import pygame
         self._env = EnvironmentCache()
@@ -461,7 +476,16 @@ class VideoSDL2(VideoPlugin):
         # https://wiki.libsdl.org/CategoryThread
         # http://stackoverflow.com/questions/27751533/sdl2-threading-seg-fault
         self._display = None
+        # canvas surfaces and their pixel arrays by size, reused on mode switches
+        self._canvases = {}
+        # glyphs by font size, kept across mode switches as the interpreter expects
+        self._glyph_dicts = {}
+        self.canvas, self.pixels = [], []
         self._work_surface = None
+        self._conv_surface = None
+        self.overlay = None
+        # canvas size and border the work surfaces were made for
+        self._work_geometry = None
         self._do_create_window(*self._window_sizer.find_display_size(720, 400))
         # pop up as black rather than background, looks nicer
         sdl2.SDL_UpdateWindowSurface(self._display)
@@ -514,9 +538,11 @@ class VideoSDL2(VideoPlugin):
             # free windows
             sdl2.SDL_DestroyWindow(self._display)
             # free surfaces
-            for s in self.canvas:
-                sdl2.SDL_FreeSurface(s)
+            for canvases in self._canvases.itervalues():
+                for s, _ in canvases:
+                    sdl2.SDL_FreeSurface(s)
             sdl2.SDL_FreeSurface(self._work_surface)
+            sdl2.SDL_FreeSurface(self._conv_surface)
             sdl2.SDL_FreeSurface(self.overlay)
             # free palettes
             for p in self._palette + self._saved_palette:
@@ -554,6 +580,7 @@ class VideoSDL2(VideoPlugin):
         self._set_icon()
         self._display_surface = sdl2.SDL_GetWindowSurface(self._display)
         self._window_sizer.window_size = width, height
+        self._dirty.set_full()
         self.busy = True
 
 
@@ -791,22 +818,50 @@ class VideoSDL2(VideoPlugin):
 
     def _do_flip(self):
         """Draw the canvas to the screen."""
-        sdl2.SDL_FillRect(self._work_surface, None, self._border_attr)
-        if self._composite:
-            self._work_pixels[:] = window.apply_composite_artifacts(
-                self.pixels[self.vpagenum], 4//self.bitsperpixel
+        # remove the cursor from where we drew it and draw it where it is now
+        self._dirty.add(*self._cursor_rect(self._last_row, self._last_col))
+        self._dirty.add(*self._cursor_rect(self.cursor_row, self.cursor_col))
+        full, rects = self._dirty.pop()
+        # a change in blink state only shows if anything blinks
+        if self.blink_state != self._flip_blink_state:
+            self._flip_blink_state = self.blink_state
+            full = full or bool((self._get_page(self.vpagenum) >= 128).any())
+        # clipboard feedback and smooth scaling affect the whole screen
+        overlay = self._clipboard_interface.active()
+        full = full or overlay or self._flip_overlay or self._smooth
+        self._flip_overlay = overlay
+        if full:
+            sdl2.SDL_FillRect(self._work_surface, None, self._border_attr)
+            if self._composite:
+                self._work_pixels[:] = window.apply_composite_artifacts(
+                    self._get_page(self.vpagenum), 4//self.bitsperpixel
+                )
+            else:
+                self._work_pixels[:] = self._get_page(self.vpagenum)
+        elif self._composite:
+            # composite artifacts depend on whole groups of pixels
+            rects = window.update_composite_artifacts(
+                self._work_pixels, self._get_page(self.vpagenum), rects, 4//self.bitsperpixel
             )
         else:
-            self._work_pixels[:] = self.pixels[self.vpagenum]
+            page = self._get_page(self.vpagenum)
+            for x, y, width, height in rects:
+                self._work_pixels[x:x+width, y:y+height] = page[x:x+width, y:y+height]
         sdl2.SDL_SetSurfacePalette(self._work_surface, self._palette[self.blink_state])
         # apply cursor to work surface
         self._show_cursor(True)
+        if full:
+            self._present_all()
+        else:
+            self._present_rects(rects)
+
+    def _present_all(self):
+        """Convert, scale and present the whole work surface."""
         # convert 8-bit work surface to (usually) 32-bit display surface format
-        pixelformat = self._display_surface.contents.format
-        conv = sdl2.SDL_ConvertSurface(self._work_surface, pixelformat, 0)
+        sdl2.SDL_BlitSurface(self._work_surface, None, self._conv_surface, None)
         # scale converted surface and blit onto display
         if not self._smooth:
-            sdl2.SDL_BlitScaled(conv, None, self._display_surface, None)
+            sdl2.SDL_BlitScaled(self._conv_surface, None, self._display_surface, None)
         else:
             # smooth-scale converted surface
             scalex, scaley = self._window_sizer.scale()
@@ -815,7 +870,7 @@ class VideoSDL2(VideoPlugin):
             # so that the memory block is highly likely to be easily available
             # this seems to avoid unpredictable delays
             sdl2.SDL_FreeSurface(self.zoomed)
-            self.zoomed = zoomSurface(conv, zoomx, zoomy, SMOOTHING_ON)
+            self.zoomed = zoomSurface(self._conv_surface, zoomx, zoomy, SMOOTHING_ON)
             # blit onto display
             sdl2.SDL_BlitSurface(self.zoomed, None, self._display_surface, None)
         # create clipboard feedback
@@ -832,8 +887,43 @@ class VideoSDL2(VideoPlugin):
             sdl2.SDL_BlitScaled(self.overlay, None, self._display_surface, None)
         # flip the display
         sdl2.SDL_UpdateWindowSurface(self._display)
-        # destroy the temporary surface
-        sdl2.SDL_FreeSurface(conv)
+
+    def _present_rects(self, rects):
+        """Convert, scale and present areas of the canvas."""
+        work_size = self._conv_surface.contents.w, self._conv_surface.contents.h
+        display_size = self._display_surface.contents.w, self._display_surface.contents.h
+        update_rects = []
+        for x, y, width, height in rects:
+            # the work surface has a border around the canvas
+            src, dst = window.scale_rect(
+                (x + self.border_x, y + self.border_y, width, height), work_size, display_size
+            )
+            sdl2.SDL_BlitSurface(
+                self._work_surface, sdl2.SDL_Rect(*src), self._conv_surface, sdl2.SDL_Rect(*src)
+            )
+            sdl2.SDL_BlitScaled(
+                self._conv_surface, sdl2.SDL_Rect(*src), self._display_surface, sdl2.SDL_Rect(*dst)
+            )
+            update_rects.append(sdl2.SDL_Rect(*dst))
+        if update_rects:
+            sdl2.SDL_UpdateWindowSurfaceRects(
+                self._display, (sdl2.SDL_Rect*len(update_rects))(*update_rects), len(update_rects)
+            )
+
+    def _rows_rect(self, start, stop):
+        """Canvas area covered by a range of text rows."""
+        return 0, (start-1) * self.font_height, self.size[0], (stop-start+1) * self.font_height
+
+    def _cursor_rect(self, row, col):
+        """Canvas area covered by the cursor at a given position."""
+        # leave room for a fullwidth cursor
+        return (col-1) * self.font_width, (row-1) * self.font_height, 2*self.font_width, self.font_height
+
+    def _get_page(self, pagenum):
+        """Pixels of a screen page, in [x][y] format."""
+        if self._framebuffer:
+            return self._framebuffer.pages[pagenum].buffer.T
+        return self.pixels[pagenum]
 
     def _show_cursor(self, do_show):
         """Draw or remove the cursor on the visible page."""
@@ -890,6 +980,7 @@ class VideoSDL2(VideoPlugin):
         sdl2.SDL_GetWindowSize(self._display, ctypes.byref(w), ctypes.byref(h))
         self._window_sizer.window_size = w.value, h.value
         self._display_surface = sdl2.SDL_GetWindowSurface(self._display)
+        self._dirty.set_full()
         self.busy = True
 
 
@@ -899,12 +990,17 @@ class VideoSDL2(VideoPlugin):
     def set_mode(self, mode_info):
         """Initialise a given text or graphics mode."""
         self.text_mode = mode_info.is_text_mode
+        # the interpreter will send the new pixel buffer
+        self._framebuffer = None
         # unpack mode info struct
         self.font_height = mode_info.font_height
         self.font_width = mode_info.font_width
         # prebuilt glyphs
         # NOTE: [x][y] format - change this if we change _pixels2d
-        self.glyph_dict = {u'\0': numpy.zeros((self.font_width, self.font_height))}
+        self.glyph_dict = self._glyph_dicts.setdefault(
+            (self.font_height, self.font_width),
+            {u'\0': numpy.zeros((self.font_width, self.font_height))}
+        )
         self.num_pages = mode_info.num_pages
         self.mode_has_blink = mode_info.has_blink
         if not self.text_mode:
@@ -915,27 +1011,41 @@ class VideoSDL2(VideoPlugin):
         self._resize_display(*self._window_sizer.find_display_size(*self.size))
         # set standard cursor
         self.set_cursor_shape(self.font_width, self.font_height, 0, self.font_height)
-        # screen pages
+        # screen pages; clear and reuse those of a mode with the same size
         canvas_width, canvas_height = self.size
-        self.canvas = [
-            sdl2.SDL_CreateRGBSurface(0, canvas_width, canvas_height, 8, 0, 0, 0, 0)
-            for _ in range(self.num_pages)
-        ]
-        self.pixels = [_pixels2d(canvas.contents) for canvas in self.canvas]
+        canvases = self._canvases.setdefault(self.size, [])
+        for canvas, _ in canvases[:self.num_pages]:
+            sdl2.SDL_FillRect(canvas, None, 0)
+        for _ in range(len(canvases), self.num_pages):
+            canvas = sdl2.SDL_CreateRGBSurface(0, canvas_width, canvas_height, 8, 0, 0, 0, 0)
+            canvases.append((canvas, _pixels2d(canvas.contents)))
+        self.canvas = [_canvas for _canvas, _ in canvases[:self.num_pages]]
+        self.pixels = [_pixels for _, _pixels in canvases[:self.num_pages]]
         # create work surface for border and composite
         self.border_x, self.border_y = self._window_sizer.border_start()
         work_width = canvas_width + 2 * self.border_x
         work_height = canvas_height + 2 * self.border_y
-        sdl2.SDL_FreeSurface(self._work_surface)
-        self._work_surface = sdl2.SDL_CreateRGBSurface(0, work_width, work_height, 8, 0, 0, 0, 0)
-        self._work_pixels = _pixels2d(self._work_surface.contents)[
-            self.border_x:work_width-self.border_x, self.border_y:work_height-self.border_y
-        ]
-        # create overlay for clipboard selection feedback
-        # use convertsurface to create a copy of the display surface format
-        pixelformat = self._display_surface.contents.format
-        self.overlay = sdl2.SDL_ConvertSurface(self._work_surface, pixelformat, 0)
-        sdl2.SDL_SetSurfaceBlendMode(self.overlay, sdl2.SDL_BLENDMODE_ADD)
+        # the work pixels are a view of the canvas area within the border
+        if (self.size, self.border_x, self.border_y) != self._work_geometry:
+            self._work_geometry = self.size, self.border_x, self.border_y
+            sdl2.SDL_FreeSurface(self._work_surface)
+            self._work_surface = sdl2.SDL_CreateRGBSurface(
+                0, work_width, work_height, 8, 0, 0, 0, 0
+            )
+            self._work_pixels = _pixels2d(self._work_surface.contents)[
+                self.border_x:work_width-self.border_x, self.border_y:work_height-self.border_y
+            ]
+            # converted work surface, in display format
+            pixelformat = self._display_surface.contents.format
+            sdl2.SDL_FreeSurface(self._conv_surface)
+            self._conv_surface = sdl2.SDL_ConvertSurface(self._work_surface, pixelformat, 0)
+            # create overlay for clipboard selection feedback
+            # use convertsurface to create a copy of the display surface format
+            sdl2.SDL_FreeSurface(self.overlay)
+            self.overlay = sdl2.SDL_ConvertSurface(self._work_surface, pixelformat, 0)
+            sdl2.SDL_SetSurfaceBlendMode(self.overlay, sdl2.SDL_BLENDMODE_ADD)
+        self._dirty.size = self.size
+        self._dirty.set_full()
         # initialise clipboard
         self._clipboard_interface = clipboard.ClipboardInterface(
             self._clipboard_handler, self._input_queue,
@@ -955,69 +1065,79 @@ class VideoSDL2(VideoPlugin):
 
     def set_palette(self, rgb_palette_0, rgb_palette_1):
         """Build the palette."""
+        key = rgb_palette_0, rgb_palette_1
+        if key == self._palette_key:
+            return
+        self._palette_key = key
         self.num_fore_attrs = min(16, len(rgb_palette_0))
         self.num_back_attrs = min(8, self.num_fore_attrs)
-        rgb_palette_1 = rgb_palette_1 or rgb_palette_0
-        # fill up the 8-bit palette with all combinations we need
-        # blink states: 0 light up, 1 light down
-        # bottom 128 are non-blink, top 128 blink to background
-        show_palette_0 = rgb_palette_0[:self.num_fore_attrs] * (256//self.num_fore_attrs)
-        show_palette_1 = rgb_palette_1[:self.num_fore_attrs] * (128//self.num_fore_attrs)
-        for b in (
-                rgb_palette_1[:self.num_back_attrs] *
-                (128 // self.num_fore_attrs // self.num_back_attrs)
-            ):
-            show_palette_1 += [b]*self.num_fore_attrs
-        colors_0 = (sdl2.SDL_Color * 256)(*(
-            sdl2.SDL_Color(r, g, b, 255)
-            for (r, g, b) in show_palette_0)
-        )
-        colors_1 = (sdl2.SDL_Color * 256)(*(
-            sdl2.SDL_Color(r, g, b, 255)
-            for (r, g, b) in show_palette_1)
-        )
+        colors_0, colors_1 = self._palettes.get_show_palettes(rgb_palette_0, rgb_palette_1)
         sdl2.SDL_SetPaletteColors(self._palette[0], colors_0, 0, 256)
         sdl2.SDL_SetPaletteColors(self._palette[1], colors_1, 0, 256)
+        self._dirty.set_full()
         self.busy = True
 
     def set_border_attr(self, attr):
         """Change the border attribute."""
         self._border_attr = attr
+        self._dirty.set_full()
         self.busy = True
 
     def set_composite(self, on, composite_colors):
         """Enable/disable composite artifacts."""
         if on != self._composite:
             self._palette, self._saved_palette = self._saved_palette, self._palette
+            self._palette_key = None
         if on:
-            colors = (sdl2.SDL_Color * 256)(*(
-                sdl2.SDL_Color(r, g, b, 255)
-                for (r, g, b) in composite_colors
-            ))
+            colors = self._palettes.get_composite_palette(composite_colors)
             sdl2.SDL_SetPaletteColors(self._palette[0], colors, 0, 256)
             sdl2.SDL_SetPaletteColors(self._palette[1], colors, 0, 256)
         self._composite = on
+        self._dirty.set_full()
         self.busy = True
 
+    def set_framebuffer(self, pixels):
+        """Use the interpreter's pixel buffer for graphics; None in text mode."""
+        self._framebuffer = pixels
+        self._dirty.set_full()
+        self.busy = True
+
+    def update_rect(self, pagenum, x0, y0, x1, y1):
+        """Area of the shared pixel buffer has changed."""
+        self._set_dirty(pagenum, x0, y0, x1-x0+1, y1-y0+1)
+
+    def _set_dirty(self, pagenum, x, y, width, height):
+        """Area of a page has changed; present it if the page is visible."""
+        if pagenum == self.vpagenum:
+            self._dirty.add(x, y, width, height)
+            self.busy = True
+
     def clear_rows(self, back_attr, start, stop):
         """Clear a range of screen rows."""
+        if self._framebuffer:
+            # the interpreter has cleared the pixel buffer
+            return
         scroll_area = sdl2.SDL_Rect(
             0, (start-1)*self.font_height, self.size[0], (stop-start+1)*self.font_height
         )
         sdl2.SDL_FillRect(self.canvas[self.apagenum], scroll_area, back_attr)
-        self.busy = True
+        self._set_dirty(self.apagenum, *self._rows_rect(start, stop))
 
     def set_page(self, vpage, apage):
         """Set the visible and active page."""
         self.vpagenum, self.apagenum = vpage, apage
+        self._dirty.set_full()
         self.busy = True
 
     def copy_page(self, src, dst):
         """Copy source to destination page."""
+        if not self.text_mode:
+            # in graphics mode, the changed pixels arrive as a put_rect or update_rect call
+            return
         self.pixels[dst][:] = self.pixels[src][:]
         # alternative:
         # sdl2.SDL_BlitSurface(self.canvas[src], None, self.canvas[dst], None)
-        self.busy = True
+        self._set_dirty(dst, 0, 0, self.size[0], self.size[1])
 
     def show_cursor(self, cursor_on):
         """Change visibility of cursor."""
@@ -1032,27 +1152,29 @@ class VideoSDL2(VideoPlugin):
         """Change attribute of cursor."""
         self.cursor_attr = attr % self.num_fore_attrs
 
-    def scroll_up(self, from_line, scroll_height, back_attr):
-        """Scroll the screen up between from_line and scroll_height."""
+    def scroll_up(self, from_line, scroll_height, back_attr, count):
+        """Scroll the screen up by count rows between from_line and scroll_height."""
+        if self._framebuffer:
+            return
         pixels = self.pixels[self.apagenum]
-        # these are exclusive ranges [x0, x1) etc
-        x0, x1 = 0, self.size[0]
-        new_y0, new_y1 = (from_line-1)*self.font_height, (scroll_height-1)*self.font_height
-        old_y0, old_y1 = from_line*self.font_height, scroll_height*self.font_height
-        pixels[x0:x1, new_y0:new_y1] = pixels[x0:x1, old_y0:old_y1]
-        pixels[x0:x1, new_y1:old_y1] = numpy.full((x1-x0, old_y1-new_y1), back_attr, dtype=int)
-        self.busy = True
-
-    def scroll_down(self, from_line, scroll_height, back_attr):
-        """Scroll the screen down between from_line and scroll_height."""
+        # these are exclusive ranges [y0, y1); move all rows at once, then clear the exposed ones
+        y0, y1 = (from_line-1)*self.font_height, scroll_height*self.font_height
+        height = min(count*self.font_height, y1-y0)
+        pixels[:, y0:y1-height] = pixels[:, y0+height:y1]
+        pixels[:, y1-height:y1] = back_attr
+        self._set_dirty(self.apagenum, *self._rows_rect(from_line, scroll_height))
+
+    def scroll_down(self, from_line, scroll_height, back_attr, count):
+        """Scroll the screen down by count rows between from_line and scroll_height."""
+        if self._framebuffer:
+            return
         pixels = self.pixels[self.apagenum]
-        # these are exclusive ranges [x0, x1) etc
-        x0, x1 = 0, self.size[0]
-        old_y0, old_y1 = (from_line-1)*self.font_height, (scroll_height-1)*self.font_height
-        new_y0, new_y1 = from_line*self.font_height, scroll_height*self.font_height
-        pixels[x0:x1, new_y0:new_y1] = pixels[x0:x1, old_y0:old_y1]
-        pixels[x0:x1, old_y0:new_y0] = numpy.full((x1-x0, new_y0-old_y0), back_attr, dtype=int)
-        self.busy = True
+        # these are exclusive ranges [y0, y1); move all rows at once, then clear the exposed ones
+        y0, y1 = (from_line-1)*self.font_height, scroll_height*self.font_height
+        height = min(count*self.font_height, y1-y0)
+        pixels[:, y0+height:y1] = pixels[:, y0:y1-height]
+        pixels[:, y0:y0+height] = back_attr
+        self._set_dirty(self.apagenum, *self._rows_rect(from_line, scroll_height))
 
     def put_glyph(self, pagenum, row, col, cp, is_fullwidth, fore, back, blink, underline):
         """Put a character at a given position."""
@@ -1085,14 +1207,18 @@ class VideoSDL2(VideoPlugin):
                 sdl2.SDL_Rect(x0, y0 + self.font_height - 1, glyph_width, 1),
                 attr
             )
-        self.busy = True
+        self._set_dirty(pagenum, x0, y0, glyph_width, self.font_height)
 
     def build_glyphs(self, new_dict):
         """Build a dict of glyphs for use in text mode."""
         for char, glyph in new_dict.iteritems():
-            # transpose because _pixels2d uses column-major mode and hence [x][y] indexing
-            # (we can change this)
-            self.glyph_dict[char] = numpy.asarray(glyph).T
+            if glyph is None:
+                # the interpreter has let go of this glyph
+                self.glyph_dict.pop(char, None)
+            else:
+                # transpose because _pixels2d uses column-major mode and hence [x][y] indexing
+                # (we can change this)
+                self.glyph_dict[char] = numpy.asarray(glyph).T
 
     def set_cursor_shape(self, width, height, from_line, to_line):
         """Build a sprite for the cursor."""
@@ -1103,25 +1229,25 @@ class VideoSDL2(VideoPlugin):
     def put_pixel(self, pagenum, x, y, index):
         """Put a pixel on the screen; callback to empty character buffer."""
         self.pixels[pagenum][x, y] = index
-        self.busy = True
+        self._set_dirty(pagenum, x, y, 1, 1)
 
     def fill_rect(self, pagenum, x0, y0, x1, y1, index):
         """Fill a rectangle in a solid attribute."""
         rect = sdl2.SDL_Rect(x0, y0, x1-x0+1, y1-y0+1)
         sdl2.SDL_FillRect(self.canvas[pagenum], rect, index)
-        self.busy = True
+        self._set_dirty(pagenum, x0, y0, x1-x0+1, y1-y0+1)
 
     def fill_interval(self, pagenum, x0, x1, y, index):
         """Fill a scanline interval in a solid attribute."""
         rect = sdl2.SDL_Rect(x0, y, x1-x0+1, 1)
         sdl2.SDL_FillRect(self.canvas[pagenum], rect, index)
-        self.busy = True
+        self._set_dirty(pagenum, x0, y, x1-x0+1, 1)
 
     def put_interval(self, pagenum, x, y, colours):
         """Write a list of attributes to a scanline interval."""
         # reference the interval on the canvas
         self.pixels[pagenum][x:x+len(colours), y] = numpy.array(colours).astype(int)
-        self.busy = True
+        self._set_dirty(pagenum, x, y, len(colours), 1)
 
     def put_rect(self, pagenum, x0, y0, x1, y1, array):
         """Apply numpy array [y][x] of attribytes to an area."""
@@ -1129,4 +1255,4 @@ class VideoSDL2(VideoPlugin):
             return
         # reference the destination area
         self.pixels[pagenum][x0:x1+1, y0:y1+1] = numpy.array(array).T
-        self.busy = True
+        self._set_dirty(pagenum, x0, y0, x1-x0+1, y1-y0+1)
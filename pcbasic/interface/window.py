@@ -23,15 +23,142 @@ set_dpi_aware()
 DISPLAY_SLACK = 15
 
 
-def apply_composite_artifacts(src_array, pixels=4):
-    """Process the canvas to apply composite colour artifacts."""
+def get_composite_windows(src_array, pixels=4):
+    """4-bit composite colour index for each group of pixels in an array [x][y]."""
     width, _ = src_array.shape
     s = [None] * pixels
     for p in range(pixels):
         s[p] = src_array[p:width:pixels] & (4//pixels)
     for p in range(1,pixels):
         s[0] = s[0]*2 + s[p]
-    return numpy.repeat(s[0], pixels, axis=0)
+    return s[0]
+
+
+def apply_composite_artifacts(src_array, pixels=4):
+    """Process the canvas to apply composite colour artifacts."""
+    return numpy.repeat(get_composite_windows(src_array, pixels), pixels, axis=0)
+
+
+def apply_composite_rgb(src_array, lookup, pixels=4):
+    """Array [y][x] with composite artifacts as RGB [y][x][rgb], given the RGB for each index."""
+    return numpy.repeat(lookup[get_composite_windows(src_array.T, pixels).T], pixels, axis=1)
+
+
+def update_composite_artifacts(dst_array, src_array, rects, pixels=4):
+    """Apply composite artifacts to areas of an array [x][y]; return the areas as widened."""
+    widened = []
+    for x, y, width, height in rects:
+        x0, x1 = x - x % pixels, -(-(x + width) // pixels) * pixels
+        dst_array[x0:x1, y:y+height] = apply_composite_artifacts(
+            src_array[x0:x1, y:y+height], pixels
+        )
+        widened.append((x0, y, x1-x0, height))
+    return widened
+
+
+class DirtyRects(object):
+    """Areas of the canvas that need to be presented again."""
+
+    # beyond this number of rects, present their bounding box
+    max_rects = 16
+
+    def __init__(self):
+        """Start with the full canvas dirty."""
+        self.size = 0, 0
+        self.full = True
+        self._rects = []
+
+    def __nonzero__(self):
+        """Anything needs presenting."""
+        return self.full or bool(self._rects)
+
+    def set_full(self):
+        """The full canvas needs presenting."""
+        self.full = True
+        self._rects = []
+
+    def add(self, x, y, width, height):
+        """Add an area, in canvas pixel coordinates."""
+        if self.full:
+            return
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(self.size[0], x + width), min(self.size[1], y + height)
+        if x1 <= x0 or y1 <= y0:
+            return
+        self._rects.append((x0, y0, x1-x0, y1-y0))
+        if len(self._rects) > self.max_rects:
+            x0 = min(r[0] for r in self._rects)
+            y0 = min(r[1] for r in self._rects)
+            x1 = max(r[0] + r[2] for r in self._rects)
+            y1 = max(r[1] + r[3] for r in self._rects)
+            self._rects = [(x0, y0, x1-x0, y1-y0)]
+
+    def pop(self):
+        """Return whether the full canvas is dirty and the list of dirty rects; reset."""
+        full, rects = self.full, self._rects
+        self.full, self._rects = False, []
+        return full, rects
+
+
+def scale_rect(rect, from_size, to_size, margin=1):
+    """Scale a rect (x, y, width, height) outwards, widened by a margin in source pixels."""
+    x, y, width, height = rect
+    x0, y0 = max(0, x - margin), max(0, y - margin)
+    x1, y1 = min(from_size[0], x + width + margin), min(from_size[1], y + height + margin)
+    # round start down and end up
+    sx0, sy0 = x0 * to_size[0] // from_size[0], y0 * to_size[1] // from_size[1]
+    sx1, sy1 = -(-x1 * to_size[0] // from_size[0]), -(-y1 * to_size[1] // from_size[1])
+    return (x0, y0, x1-x0, y1-y0), (sx0, sy0, sx1-sx0, sy1-sy0)
+
+
+def build_show_palettes(rgb_palette_0, rgb_palette_1):
+    """Expand a game palette to 256-entry display palettes for blink states 0, 1."""
+    num_fore_attrs = min(16, len(rgb_palette_0))
+    num_back_attrs = min(8, num_fore_attrs)
+    rgb_palette_1 = rgb_palette_1 or rgb_palette_0
+    # fill up the 8-bit palette with all combinations we need
+    # blink states: 0 light up, 1 light down
+    # bottom 128 are non-blink, top 128 blink to background
+    show_palette_0 = list(rgb_palette_0[:num_fore_attrs]) * (256//num_fore_attrs)
+    show_palette_1 = list(rgb_palette_1[:num_fore_attrs]) * (128//num_fore_attrs)
+    for b in rgb_palette_1[:num_back_attrs] * (128 // num_fore_attrs // num_back_attrs):
+        show_palette_1 += [b]*num_fore_attrs
+    return show_palette_0, show_palette_1
+
+
+class PaletteCache(object):
+    """Display palettes in the interface's own format, built once for each game palette."""
+
+    # beyond this number of palettes, the cache is cleared
+    max_palettes = 256
+
+    def __init__(self, convert):
+        """Set up the cache with a function converting a list of RGB triples."""
+        self._convert = convert
+        self._cache = {}
+
+    def _get(self, key, build):
+        """Retrieve or build and store a cache entry."""
+        try:
+            return self._cache[key]
+        except KeyError:
+            if len(self._cache) >= self.max_palettes:
+                self._cache.clear()
+            entry = self._cache[key] = build()
+            return entry
+
+    def get_show_palettes(self, rgb_palette_0, rgb_palette_1):
+        """Converted display palettes for blink states 0, 1."""
+        key = tuple(rgb_palette_0), tuple(rgb_palette_1 or ())
+        return self._get(key, lambda: tuple(
+            self._convert(_palette)
+            for _palette in build_show_palettes(rgb_palette_0, rgb_palette_1)
+        ))
+
+    def get_composite_palette(self, composite_colors):
+        """Converted display palette for composite artifacts."""
+        key = None, tuple(composite_colors)
+        return self._get(key, lambda: self._convert(composite_colors))
 
 
 class WindowSizer(object):
@@ -18,8 +18,9 @@ from . import state
 from . import config
 from .guard import ExceptionGuard, NOGUARD
 from .metadata import NAME, VERSION, COPYRIGHT
-from .basic import debug
-from .interface import Interface, InitFailed
+
+# interface, plugins and debugging tools are imported only when needed
+# to keep start-up time low for --convert and --interface=none runs
 
 def main(*arguments):
     """Wrapper for run() to deal with argv encodings, Ctrl-C, stdio and pipes."""
@@ -72,6 +73,7 @@ def show_version(settings):
     """Show version with optional debugging details."""
     sys.stdout.write((u'%s %s\n%s\n' % (NAME, VERSION, COPYRIGHT)).encode(sys.stdout.encoding))
     if settings.debug:
+        from .basic import debug
         sys.stdout.write(debug.get_platform_info())
 
 def convert(settings):
@@ -87,6 +89,7 @@ def convert(settings):
 
 def launch_session(settings):
     """Start an interactive interpreter session."""
+    from .interface import Interface, InitFailed
     guard = ExceptionGuard(**settings.guard_params)
     try:
         Interface(guard, **settings.iface_params).launch(run_session, **settings.launch_params)
@@ -98,7 +101,10 @@ def run_session(
         resume=False, debug=False, state_file=None,
         prog=None, commands=(), **session_params):
     """Run an interactive BASIC session."""
-    Session = basic.DebugSession if debug else basic.Session
+    if debug:
+        from .basic.debug import DebugSession as Session
+    else:
+        Session = basic.Session
     with Session(interface, **session_params) as s:
         with state.manage_state(s, state_file, resume) as session:
             with guard.protect(interface, session):
@@ -0,0 +1,103 @@
+#!/usr/bin/env python2
+
+""" PC-BASIC array transfer benchmark
+Checks that NumPy array transfer through the Session API agrees with BASIC
+and with the list interface, and reports transfer times for both.
+
+(c) 2018 Rob Hagemans
+This file is released under the GNU GPL version 3 or later.
+"""
+
+import sys
+import os
+import time
+
+import numpy
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, '..', '..'))
+
+import pcbasic
+from pcbasic.basic import BASICError, SUBSCRIPT_OUT_OF_RANGE
+
+# rows and columns of the benchmark arrays
+SIZE = 500, 500
+# size of the arrays for the checks against BASIC
+CHECK_SIZE = 7, 5
+
+
+def check(session):
+    """Check that element values and index order agree with BASIC."""
+    failed = []
+    rows, cols = CHECK_SIZE
+    data = {
+        b'I%': numpy.arange(rows*cols).reshape(rows, cols) - 17,
+        b'S!': numpy.linspace(-3.3, 1e20, rows*cols).reshape(rows, cols),
+        b'D#': numpy.linspace(-1e-30, 1./3., rows*cols).reshape(rows, cols),
+        b'T$': numpy.array([[b'%d,%d' % (i, j) for j in range(cols)] for i in range(rows)]),
+    }
+    for name, array in data.iteritems():
+        session.set_variable(name + b'()', array)
+        back = session.get_variable(name + b'()', as_numpy=True)
+        for i in range(rows):
+            for j in range(cols):
+                basic = session.evaluate(b'%s(%d,%d)' % (name, i, j))
+                # the scalar interface is the reference
+                session.set_variable(b'X' + name[-1], array[i, j].item())
+                expected = session.get_variable(b'X' + name[-1])
+                if basic != expected or back[i, j] != basic:
+                    failed.append((name, i, j, array[i, j], basic, back[i, j]))
+        if back.shape != array.shape:
+            failed.append((name, back.shape))
+    # writing a smaller array into a dimensioned array
+    session.execute(b'DIM P%(9,9)')
+    session.set_variable(b'P%()', numpy.ones((2, 3)))
+    if session.evaluate(b'P%(1,2)+P%(2,2)+P%(1,3)') != 1:
+        failed.append((b'P%', 'partial'))
+    # bigger than dimensioned
+    try:
+        session.set_variable(b'P%()', numpy.ones((11, 3)))
+    except BASICError as e:
+        if e.err != SUBSCRIPT_OUT_OF_RANGE:
+            failed.append((b'P%', 'error', e.err))
+    else:
+        failed.append((b'P%', 'no error'))
+    return failed
+
+def time_call(func, *args, **kwargs):
+    """Time a function call."""
+    start = time.time()
+    func(*args, **kwargs)
+    return time.time() - start
+
+def benchmark(session, name):
+    """Time transfer of a big array in both directions."""
+    array = numpy.arange(SIZE[0]*SIZE[1]).reshape(SIZE) % 30000
+    as_list = array.tolist()
+    session.execute(b'DIM %s(%d, %d)' % (name, SIZE[0]-1, SIZE[1]-1))
+    print '%s(%d, %d)' % (name, SIZE[0]-1, SIZE[1]-1)
+    print '    set  numpy %7.3fs   list %7.3fs' % (
+        time_call(session.set_variable, name + b'()', array),
+        time_call(session.set_variable, name + b'()', as_list),
+    )
+    print '    get  numpy %7.3fs   list %7.3fs' % (
+        time_call(session.get_variable, name + b'()', as_numpy=True),
+        time_call(session.get_variable, name + b'()'),
+    )
+
+def main():
+    with pcbasic.Session(input_streams=None, output_streams=None) as session:
+        failed = check(session)
+    for f in failed:
+        print 'FAILED:', f
+    for name in (b'I%', b'S!', b'D#'):
+        # the array does not fit in 64 KiB, so raise the memory limit
+        with pcbasic.Session(
+                input_streams=None, output_streams=None, max_memory=SIZE[0]*SIZE[1]*16
+            ) as session:
+            benchmark(session, name)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
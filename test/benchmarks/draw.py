@@ -0,0 +1,63 @@
+#!/usr/bin/env python2
+
+""" PC-BASIC DRAW benchmark
+Times DRAW strings executed repeatedly, as games and plotters do,
+and prints a checksum of the resulting pixels for comparison across versions.
+
+(c) 2018 Rob Hagemans
+This file is released under the GNU GPL version 3 or later.
+"""
+
+import sys
+import os
+import time
+import zlib
+
+import numpy
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, '..', '..'))
+
+import pcbasic
+
+# setup, then statement to time
+PROGRAMS = {
+    'sprite': (
+        b'SCREEN 1: S$ = "C3 U4 E2 R6 F2 D4 G2 L6 H2 BR3 C2 U2 R4 D2 L4"',
+        b'FOR I = 1 TO 300: DRAW "BM" + STR$(I MOD 300) + ",100 XS$;": NEXT',
+    ),
+    'turtle': (
+        b'SCREEN 2',
+        b'FOR I = 0 TO 359 STEP 2: DRAW "BM320,100 TA=I; R80 U10 L20 D5": NEXT',
+    ),
+    'scaled': (
+        b'SCREEN 1: S$ = "U10 E5 R10 F5 D10 G5 L10 H5"',
+        b'FOR I = 1 TO 200: DRAW "S" + STR$(I MOD 20 + 1) + " BM160,100 C" + STR$(I MOD 4) + S$: NEXT',
+    ),
+    'variables': (
+        b'SCREEN 1',
+        b'FOR I = 1 TO 300: DRAW "BM=I;,50 U=I; R5 D=I; L5": NEXT',
+    ),
+}
+
+
+def run(setup, statement):
+    """Run a DRAW workload; return time taken and checksum of the pixels."""
+    with pcbasic.Session(input_streams=None, output_streams=None) as s:
+        s.execute(setup)
+        start = time.time()
+        s.execute(statement)
+        elapsed = time.time() - start
+        pixels = numpy.array(s._impl.display.pixels.pages[0].buffer)
+    return elapsed, zlib.crc32(pixels.tostring()) & 0xffffffff
+
+
+def main():
+    for name, (setup, statement) in sorted(PROGRAMS.iteritems()):
+        elapsed, checksum = run(setup, statement)
+        print '%-12s  %7.3fs  checksum %08x' % (name, elapsed, checksum)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python2
+
+""" PC-BASIC glyph benchmark
+Times switching between video modes and writing every character after each switch,
+and reports the glyphs held by the interpreter and the interface while printing
+many different fullwidth characters.
+
+(c) 2018 Rob Hagemans
+This file is released under the GNU GPL version 3 or later.
+"""
+
+import sys
+import os
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, '..', '..'))
+
+import pcbasic
+from pcbasic import data
+from videoqueue import ShadowInterface
+
+SWITCHES = 50
+REPEATS = 5
+# pairs of statements to switch between, after each switch every character is written
+SWITCH_SETUPS = {
+    'screen 0/9': ((b'SCREEN 0', b'SCREEN 9'), 'ega'),
+    'screen 0/2': ((b'SCREEN 0', b'SCREEN 2'), 'cga'),
+    'screen 1/2': ((b'SCREEN 1', b'SCREEN 2'), 'cga'),
+    'width 40/80': ((b'WIDTH 40', b'WIDTH 80'), 'cga'),
+}
+CHARS = b''.join(chr(_c) for _c in range(32, 256))
+# EGA modes need a 14-pixel font
+FONTS = data.read_fonts(data.read_codepage(u'437'), [u'freedos'], warn=False)
+
+# print Big5 characters, each lead byte with all its trail bytes
+DBCS_PROGRAM = (
+    b'10 FOR L = &HA4 TO &HC6: FOR T = &HA1 TO &HFE\n'
+    b'20 PRINT CHR$(L); CHR$(T);: NEXT: NEXT'
+)
+DBCS_CHARS = (0xc6 - 0xa4 + 1) * (0xfe - 0xa1 + 1)
+
+
+def run_switches(statements, video):
+    """Switch modes and write every character; return processor time per switch."""
+    iface = ShadowInterface()
+    with pcbasic.Session(
+            iface, video=video, font=FONTS, input_streams=None, output_streams=None
+        ) as s:
+        s.start()
+        text_screen = s._impl.display.text_screen
+        times = []
+        for _ in range(REPEATS):
+            iface.wait()
+            # processor time includes the interface thread
+            start = time.clock()
+            for i in range(SWITCHES):
+                s.execute(statements[i % 2])
+                text_screen.write(CHARS)
+            iface.wait()
+            times.append(time.clock() - start)
+    return min(times) / SWITCHES
+
+
+def glyph_bytes(glyphs):
+    """Size of a collection of glyph arrays or packed glyphs."""
+    return sum(getattr(_g, 'nbytes', None) or len(_g) for _g in glyphs)
+
+
+def run_dbcs():
+    """Print many fullwidth characters; return chars/s, glyphs held and missing glyphs."""
+    codepage = data.read_codepage(u'950')
+    fonts = data.read_fonts(codepage, [u'unifont'], warn=False)
+    iface = ShadowInterface()
+    with pcbasic.Session(
+            iface, video='vga', codepage=codepage, font=fonts,
+            input_streams=None, output_streams=None
+        ) as s:
+        s.execute(DBCS_PROGRAM)
+        iface.wait()
+        start = time.time()
+        s.execute(b'RUN')
+        iface.wait()
+        elapsed = time.time() - start
+        packed = [
+            _packed
+            for _font in s._impl.display.text_screen.fonts.itervalues()
+            for _packed in _font.get_cached_glyphs()
+        ]
+    return (
+        DBCS_CHARS / elapsed, len(packed), glyph_bytes(packed),
+        len(iface.plugin.glyphs), glyph_bytes(iface.plugin.glyphs.itervalues()),
+        iface.plugin.missing
+    )
+
+
+def main():
+    for name, (statements, video) in sorted(SWITCH_SETUPS.iteritems()):
+        print '%-12s %7.2f ms per switch' % (name, run_switches(statements, video) * 1000)
+    rate, font_count, font_bytes, iface_count, iface_bytes, missing = run_dbcs()
+    print 'fullwidth    %7.1f chars/s' % (rate,)
+    print '    font cache %6d glyphs %8d bytes' % (font_count, font_bytes)
+    print '    interface  %6d glyphs %8d bytes' % (iface_count, iface_bytes)
+    if missing:
+        print 'FAILED: %d glyphs missing in interface' % (missing,)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
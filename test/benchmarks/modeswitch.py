@@ -0,0 +1,101 @@
+#!/usr/bin/env python2
+
+""" PC-BASIC mode switch benchmark
+Times switching back and forth between video modes and widths, in the interpreter and
+in the framebuffer interface, and checks that each switch leaves a blank screen.
+
+(c) 2018 Rob Hagemans
+This file is released under the GNU GPL version 3 or later.
+"""
+
+import sys
+import os
+import time
+import Queue
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, '..', '..'))
+
+import pcbasic
+from pcbasic import data
+from pcbasic.interface.video_framebuffer import VideoFramebuffer
+from videoqueue import ShadowInterface
+
+SWITCHES = 100
+REPEATS = 5
+# pairs of statements to switch between, with the mode numbers and widths they set
+SETUPS = {
+    'screen 0/9': ((b'SCREEN 0', b'SCREEN 9'), ((0, 80), (9, 80)), 'ega'),
+    'screen 7/9': ((b'SCREEN 7', b'SCREEN 9'), ((7, 40), (9, 80)), 'ega'),
+    'screen 1/2': ((b'SCREEN 1', b'SCREEN 2'), ((1, 40), (2, 80)), 'cga'),
+    'width 40/80': ((b'WIDTH 40', b'WIDTH 80'), ((0, 40), (0, 80)), 'cga'),
+}
+# put something on the screen before switching
+DRAW_TEXT = b'PRINT "Hello"'
+DRAW_GRAPHICS = b'PRINT "Hello": LINE (0, 0)-(99, 99), 1, BF'
+# EGA modes need a 14-pixel font
+FONTS = data.read_fonts(data.read_codepage(u'437'), [u'freedos'], warn=False)
+
+
+def is_blank(session):
+    """Text and pixels are all cleared."""
+    chars, _ = session.get_text_screen()
+    pixels = session._impl.display.pixels
+    return not any(_row.strip() for _row in chars) and (
+        not pixels or not any(_page.buffer.any() for _page in pixels.pages)
+    )
+
+
+def run(statements, video):
+    """Switch modes; return processor time per switch and whether each switch cleared the screen."""
+    iface = ShadowInterface()
+    with pcbasic.Session(
+            iface, video=video, font=FONTS, input_streams=None, output_streams=None
+        ) as s:
+        blank = True
+        for i in range(4):
+            s.execute(statements[i % 2])
+            blank = blank and is_blank(s)
+            s.execute(DRAW_TEXT if s._impl.display.mode.is_text_mode else DRAW_GRAPHICS)
+        times = []
+        for _ in range(REPEATS):
+            iface.wait()
+            # processor time includes the interface thread
+            start = time.clock()
+            for i in range(SWITCHES):
+                s.execute(statements[i % 2])
+            iface.wait()
+            times.append(time.clock() - start)
+        video_modes = s._impl.display.video
+    return min(times) / SWITCHES, blank, video_modes
+
+
+def run_plugin(video_modes, modes):
+    """Time the framebuffer interface switching modes; return time per switch."""
+    infos = [video_modes.get_mode(_number, _width) for _number, _width in modes]
+    plugin = VideoFramebuffer(Queue.Queue(), Queue.Queue())
+    times = []
+    for _ in range(REPEATS):
+        start = time.clock()
+        for i in range(SWITCHES):
+            plugin.set_mode(infos[i % 2])
+        times.append(time.clock() - start)
+    return min(times) / SWITCHES
+
+
+def main():
+    failed = []
+    for name, (statements, modes, video) in sorted(SETUPS.iteritems()):
+        per_switch, blank, video_modes = run(statements, video)
+        plugin_per_switch = run_plugin(video_modes, modes)
+        print '%-12s  interpreter %6.3f ms  framebuffer %6.3f ms per switch' % (
+            name, per_switch * 1000, plugin_per_switch * 1000
+        )
+        if not blank:
+            print '    FAILED: screen not cleared'
+            failed.append(name)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
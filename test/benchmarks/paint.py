@@ -0,0 +1,71 @@
+#!/usr/bin/env python2
+
+""" PC-BASIC PAINT benchmark
+Times flood fills with solid colours, tiles and background tiles
+and prints a checksum of the resulting pixels for comparison across versions.
+
+(c) 2018 Rob Hagemans
+This file is released under the GNU GPL version 3 or later.
+"""
+
+import sys
+import os
+import time
+import zlib
+
+import numpy
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, '..', '..'))
+
+import pcbasic
+from pcbasic import data
+
+# setup, then PAINT statements to time
+PROGRAMS = {
+    'solid screen 9': (
+        b'SCREEN 9: CIRCLE (320, 175), 300, 15: CIRCLE (320, 175), 100, 15',
+        b'PAINT (320, 20), 4, 15: PAINT (320, 175), 2, 15',
+    ),
+    'tile screen 9': (
+        b'SCREEN 9: CIRCLE (320, 175), 300, 15: CIRCLE (320, 175), 100, 15',
+        b'PAINT (320, 20), CHR$(&H18) + CHR$(&H3C) + CHR$(&H7E) + CHR$(&HFF), 15',
+    ),
+    'background screen 9': (
+        b'SCREEN 9: LINE (10, 10)-(629, 339), 15, B: '
+        b'PAINT (320, 175), CHR$(&HAA) + CHR$(&H55) + CHR$(0) + CHR$(0), 15',
+        b'PAINT (320, 175), CHR$(&HAA) + CHR$(&H55) + CHR$(&HF0), 15, CHR$(&HAA)',
+    ),
+    'maze screen 2': (
+        b'SCREEN 2: FOR X = 4 TO 636 STEP 8: LINE (X, (X MOD 16) \\ 8 * 8)-(X, 191 + (X MOD 16) \\ 8 * 8), 1: NEXT',
+        b'PAINT (2, 100), 1',
+    ),
+    'tile screen 1': (
+        b'SCREEN 1: FOR R = 10 TO 90 STEP 10: CIRCLE (160, 100), R * 2, 3: NEXT',
+        b'PAINT (160, 100), CHR$(&H1B) + CHR$(&HE4), 3: PAINT (5, 5), CHR$(&H55) + CHR$(&HAA), 3',
+    ),
+}
+# EGA modes need a 14-pixel font
+FONTS = data.read_fonts(data.read_codepage(u'437'), [u'freedos'], warn=False)
+
+
+def run(setup, statement):
+    """Run a PAINT workload; return time taken and checksum of the pixels."""
+    with pcbasic.Session(video='ega', font=FONTS, input_streams=None, output_streams=None) as s:
+        s.execute(setup)
+        start = time.time()
+        s.execute(statement)
+        elapsed = time.time() - start
+        pixels = numpy.array(s._impl.display.pixels.pages[0].buffer)
+    return elapsed, zlib.crc32(pixels.tostring()) & 0xffffffff
+
+
+def main():
+    for name, (setup, statement) in sorted(PROGRAMS.iteritems()):
+        elapsed, checksum = run(setup, statement)
+        print '%-20s  %7.3fs  checksum %08x' % (name, elapsed, checksum)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
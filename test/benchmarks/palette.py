@@ -0,0 +1,94 @@
+#!/usr/bin/env python2
+
+""" PC-BASIC palette benchmark
+Times palette-cycling programs and counts the palette changes that reach the interface,
+then times the interface building display palettes for a cycle of game palettes.
+
+(c) 2018 Rob Hagemans
+This file is released under the GNU GPL version 3 or later.
+"""
+
+import sys
+import os
+import time
+import Queue
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, '..', '..'))
+
+import pcbasic
+from pcbasic import data
+from pcbasic.basic.base import signals
+from pcbasic.interface.video_framebuffer import VideoFramebuffer
+from videoqueue import ShadowInterface
+
+FRAMES = 100
+PROGRAMS = {
+    # rotate all colours one step per frame
+    'rotate': (
+        b'10 SCREEN 9: FOR I = 1 TO 15: LINE (I*40, 0)-(I*40+39, 349), I, BF: NEXT\n'
+        b'20 FOR F = 1 TO %d: FOR I = 1 TO 15: PALETTE I, (I + F) MOD 16: NEXT: NEXT' % FRAMES
+    ),
+    # flash the background
+    'flash': b'10 SCREEN 9: FOR F = 1 TO %d: PALETTE 0, F MOD 2 * 4: NEXT' % (FRAMES * 15),
+    # set the whole palette from an array
+    'using': (
+        b'10 SCREEN 9: DEFINT A-Z: DIM P(16)\n'
+        b'20 FOR F = 1 TO %d: FOR I = 0 TO 15: P(I) = (I + F) MOD 16: NEXT: PALETTE USING P(0): NEXT'
+        % FRAMES
+    ),
+}
+# EGA modes need a 14-pixel font
+FONTS = data.read_fonts(data.read_codepage(u'437'), [u'freedos'], warn=False)
+
+
+class PaletteCounter(object):
+    """Count palette events passing through to the interface."""
+
+    def __init__(self, iface):
+        """Wrap the interface handler."""
+        self.count = 0
+        handler = iface.plugin._handlers[signals.VIDEO_SET_PALETTE]
+        def _handler(*args):
+            self.count += 1
+            handler(*args)
+        iface.plugin._handlers[signals.VIDEO_SET_PALETTE] = _handler
+
+
+def run(program):
+    """Run a palette program; return time taken and the number of palette events."""
+    iface = ShadowInterface(shared_framebuffer=True)
+    counter = PaletteCounter(iface)
+    with pcbasic.Session(iface, video='ega', font=FONTS, input_streams=None, output_streams=None) as s:
+        s.execute(program)
+        iface.wait()
+        counter.count = 0
+        start = time.time()
+        s.execute(b'RUN')
+        iface.wait()
+        elapsed = time.time() - start
+    return elapsed, counter.count
+
+
+def run_plugin():
+    """Time the interface setting a cycle of game palettes; return time per palette."""
+    colours = [(_i*16, 255 - _i*16, (_i*64) % 256) for _i in range(16)]
+    palettes = [colours[_f:] + colours[:_f] for _f in range(16)]
+    plugin = VideoFramebuffer(Queue.Queue(), Queue.Queue())
+    start = time.time()
+    for _ in range(FRAMES):
+        for palette in palettes:
+            plugin.set_palette(list(palette), None)
+    return (time.time() - start) / FRAMES / len(palettes)
+
+
+def main():
+    for name, program in sorted(PROGRAMS.iteritems()):
+        elapsed, count = run(program)
+        print '%-8s  %6.3fs  %6d palette events' % (name, elapsed, count)
+    print 'interface %6.1fus per palette' % (run_plugin() * 1e6,)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
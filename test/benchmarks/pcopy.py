@@ -0,0 +1,78 @@
+#!/usr/bin/env python2
+
+""" PC-BASIC PCOPY animation benchmark
+Measures the frame rate of double-buffered animation loops that draw on a hidden page
+and PCOPY it to the visible page, with the pixel area the interface is asked to redraw,
+and checks that the interface ends up with the same pixels as the session.
+
+(c) 2018 Rob Hagemans
+This file is released under the GNU GPL version 3 or later.
+"""
+
+import sys
+import os
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, '..', '..'))
+
+import pcbasic
+from videoqueue import ShadowInterface
+
+FRAMES = 200
+PROGRAMS = {
+    # small sprite moving over a static background
+    'sprite': (
+        b'10 SCREEN 5, , 1, 0: FOR I = 0 TO 15: LINE (I*20, 0)-(I*20+19, 199), I, BF: NEXT\n'
+        b'20 PCOPY 1, 0: PCOPY 1, 2\n'
+        b'30 FOR F = 1 TO %d: X = F MOD 300: PCOPY 2, 1\n'
+        b'40 LINE (X, 90)-(X+15, 105), 15, BF: PCOPY 1, 0: NEXT' % FRAMES
+    ),
+    # nothing changes between frames
+    'static': (
+        b'10 SCREEN 5, , 1, 0: CIRCLE (160, 100), 80, 3\n'
+        b'20 FOR F = 1 TO %d: PCOPY 1, 0: NEXT' % FRAMES
+    ),
+    # the whole page is redrawn every frame
+    'full': (
+        b'10 SCREEN 5, , 1, 0\n'
+        b'20 FOR F = 1 TO %d: LINE (0, 0)-(319, 199), F MOD 16, BF: PCOPY 1, 0: NEXT' % FRAMES
+    ),
+}
+
+
+def run(program, shared):
+    """Run an animation; return frames per second, redrawn pixels per frame and whether pixels match."""
+    iface = ShadowInterface(shared)
+    with pcbasic.Session(iface, video='pcjr', video_memory=65536, input_streams=None, output_streams=None) as s:
+        s.execute(program)
+        iface.wait()
+        iface.plugin.area = 0
+        start = time.time()
+        s.execute(b'RUN')
+        iface.wait()
+        elapsed = time.time() - start
+        pixels = s._impl.display.pixels
+        match = all(
+            (ours.buffer == theirs).all()
+            for ours, theirs in zip(pixels.pages, iface.plugin.pages)
+        )
+    return FRAMES / elapsed, iface.plugin.area // FRAMES, match
+
+
+def main():
+    failed = []
+    for name, program in sorted(PROGRAMS.iteritems()):
+        copied_fps, copied_area, copied_match = run(program, False)
+        shared_fps, shared_area, shared_match = run(program, True)
+        print '%-8s  copied %7.1f fps %6d px/frame  shared %7.1f fps %6d px/frame' % (
+            name, copied_fps, copied_area, shared_fps, shared_area
+        )
+        if not copied_match or not shared_match:
+            print '    FAILED: pixels differ'
+            failed.append(name)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
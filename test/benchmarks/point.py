@@ -0,0 +1,134 @@
+#!/usr/bin/env python2
+
+""" PC-BASIC coordinate transform benchmark
+Times POINT, PSET and PMAP in window and viewport coordinates, and checks that reading
+points in batch from Python gives the same attributes as POINT, also for coordinates
+that single precision cannot represent.
+
+(c) 2018 Rob Hagemans
+This file is released under the GNU GPL version 3 or later.
+"""
+
+import sys
+import os
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, '..', '..'))
+
+import pcbasic
+
+# coordinate setups, drawn over a pattern of circles
+SETUP = b'10 SCREEN 1: FOR R = 5 TO 150 STEP 5: CIRCLE (160, 100), R, R MOD 4: NEXT: %s\n'
+SETUPS = {
+    'physical': b'',
+    'window': b'WINDOW (-1, -1)-(1, 1)',
+    # half-pixel scale, many coordinates round at .5
+    'half scale': b'WINDOW SCREEN (0, 0)-(638, 398)',
+    'view+window': b'VIEW (20, 10)-(299, 189): WINDOW (-1, -1)-(1, 1)',
+}
+# loop bounds covering the window and some points outside
+BOUNDS = {
+    'physical': (-10, 330, 2, -10, 210, 2),
+    'window': (-1.1, 1.1, .01, -1.1, 1.1, .02),
+    'half scale': (-10, 660, 3, -10, 410, 3),
+    'view+window': (-1.1, 1.1, .01, -1.1, 1.1, .02),
+}
+PROGRAMS = {
+    'POINT': b'A = POINT(X, Y)',
+    'PSET': b'PSET (X, Y), 3',
+    'PMAP': b'A = PMAP(X, 0): B = PMAP(Y, 1)',
+}
+# coarser grid for the stored coordinates, to fit in memory
+BATCH_STEP = 3
+# repeat the stored coordinates for timing
+BATCH_REPEATS = 20
+LOOP = b'20 FOR Y = %r TO %r STEP %r: FOR X = %r TO %r STEP %r: %s: N = N + 1: NEXT: NEXT\n'
+# store coordinates and POINT results to compare with the batch API
+STORE = (
+    b'20 DIM X(%d), Y(%d), P(%d)\n'
+    b'30 FOR Y = %r TO %r STEP %r: FOR X = %r TO %r STEP %r\n'
+    b'40 X(N) = X: Y(N) = Y: P(N) = POINT(X, Y): N = N + 1: NEXT: NEXT\n'
+)
+# diagonal stripes, so that neighbouring pixels differ in both directions
+STRIPES = b'10 SCREEN 1: FOR X = -199 TO 319: LINE (X, 0)-(X + 199, 199), (X + 200) MOD 4: NEXT: %s\n'
+# nudges off half-pixel coordinates, relative and below single precision
+NUDGES = (-1e-8, 0., 1e-8)
+
+
+def loop_bounds(name, step=1):
+    """Loop bounds in the order of the FOR statements."""
+    x0, x1, dx, y0, y1, dy = BOUNDS[name]
+    return y0, y1, dy*step, x0, x1, dx*step
+
+
+def run(setup, program):
+    """Time a program plotting or sampling points; return calls per second."""
+    with pcbasic.Session(input_streams=None, output_streams=None) as s:
+        s.execute(SETUP % SETUPS[setup] + LOOP % (loop_bounds(setup) + (PROGRAMS[program],)))
+        start = time.time()
+        s.execute(b'RUN')
+        elapsed = time.time() - start
+        count = s.get_variable(b'N!')
+    return count / elapsed
+
+
+def run_batch(setup):
+    """Read points in batch; return points per second and whether they match POINT."""
+    with pcbasic.Session(input_streams=None, output_streams=None) as s:
+        x0, x1, dx, y0, y1, dy = BOUNDS[setup]
+        size = int((x1 - x0) / dx / BATCH_STEP + 2) * int((y1 - y0) / dy / BATCH_STEP + 2)
+        s.execute(
+            SETUP % SETUPS[setup] + STORE % ((size,)*3 + loop_bounds(setup, BATCH_STEP))
+            + b'RUN'
+        )
+        count = int(s.get_variable(b'N!'))
+        xs = s.get_variable(b'X!()')[:count]
+        ys = s.get_variable(b'Y!()')[:count]
+        expected = s.get_variable(b'P!()')[:count]
+        points = s.get_points(xs, ys)
+        start = time.time()
+        s.get_points(xs * BATCH_REPEATS, ys * BATCH_REPEATS)
+        elapsed = time.time() - start
+    return count * BATCH_REPEATS / elapsed, bool(count) and list(points) == expected
+
+
+def check_precision(setup):
+    """Check that batch points round double-precision coordinates like POINT."""
+    with pcbasic.Session(input_streams=None, output_streams=None) as s:
+        s.execute(STRIPES % SETUPS[setup] + b'RUN')
+        drawing = s._impl.display.drawing
+        xs, ys = [], []
+        for i in range(0, 330, 3):
+            fx, fy = drawing.get_window_logical(i + .5, i // 2 + .5)
+            for nudge_x in NUDGES:
+                for nudge_y in NUDGES:
+                    xs.append(fx + nudge_x * max(1., abs(fx)))
+                    ys.append(fy + nudge_y * max(1., abs(fy)))
+        expected = []
+        for x, y in zip(xs, ys):
+            s.set_variable(b'X#', x)
+            s.set_variable(b'Y#', y)
+            expected.append(s.evaluate(b'POINT(X#, Y#)'))
+        return list(s.get_points(xs, ys)) == expected
+
+
+def main():
+    failed = []
+    for setup in sorted(SETUPS):
+        rates = '  '.join(
+            '%s %7.0f/s' % (_name, run(setup, _name)) for _name in sorted(PROGRAMS)
+        )
+        batch_rate, match = run_batch(setup)
+        print '%-12s %s  batch %9.0f/s' % (setup, rates, batch_rate)
+        if not match:
+            print '    FAILED: batch points differ from POINT'
+            failed.append(setup)
+        if not check_precision(setup):
+            print '    FAILED: batch points differ from POINT in double precision'
+            failed.append(setup)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python2
+
+""" PC-BASIC screen presentation benchmark
+Measures CPU time per frame presented by the graphical video plugins,
+presenting only changed areas and redrawing the full screen every frame.
+Runs on SDL's dummy video driver; plugins that cannot start are skipped.
+
+(c) 2018 Rob Hagemans
+This file is released under the GNU GPL version 3 or later.
+"""
+
+import sys
+import os
+import time
+import Queue
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, '..', '..'))
+
+import pcbasic
+from pcbasic.interface.base import video_plugins, InitFailed
+
+PLUGINS = ('sdl2', 'pygame')
+# setup, then statement executed before each frame
+WORKLOADS = {
+    'idle cursor': (b'CLS', b''),
+    'text': (b'CLS', b'PRINT "The quick brown fox";'),
+    'graphics': (b'SCREEN 1', b'PSET (RND*320, RND*200), RND*4'),
+}
+FRAMES = 200
+
+
+class PluginInterface(object):
+    """Interface that runs a video plugin on the main thread."""
+
+    def __init__(self, plugin_class):
+        """Set up queues and the plugin."""
+        self.inputs, self.video = Queue.Queue(), Queue.Queue()
+        self.plugin = plugin_class(self.inputs, self.video)
+        self.shared_framebuffer = self.plugin.shared_framebuffer
+        self.flip_time, self.flips = 0., 0
+        self._do_flip = self.plugin._do_flip
+        self.plugin._do_flip = self._timed_flip
+        self.full = False
+
+    def _timed_flip(self):
+        """Present a frame and record the CPU time taken."""
+        if self.full:
+            self.plugin._dirty.set_full()
+        start = time.clock()
+        self._do_flip()
+        self.flip_time += time.clock() - start
+        self.flips += 1
+
+    def get_queues(self):
+        """Video, audio and input queues."""
+        return self.inputs, self.video, None
+
+
+def run(plugin_class, setup, statement, full):
+    """Run a workload and return CPU time per frame in ms, and number of frames presented."""
+    iface = PluginInterface(plugin_class)
+    with iface.plugin:
+        with pcbasic.Session(iface, input_streams=None, output_streams=None) as s:
+            s.execute(setup)
+            s._impl.queues.flush_video()
+            iface.plugin.cycle()
+            iface.full = full
+            iface.flip_time, iface.flips = 0., 0
+            for _ in range(FRAMES):
+                if statement:
+                    s.execute(statement)
+                    s._impl.queues.flush_video()
+                # present every cycle, as a busy program would cause
+                iface.plugin.busy = True
+                iface.plugin.cycle()
+    return 1000. * iface.flip_time / max(1, iface.flips), iface.flips
+
+
+def main():
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    for name in PLUGINS:
+        try:
+            plugin_class = video_plugins[name]
+            plugin_class(Queue.Queue(), Queue.Queue()).__exit__(None, None, None)
+        except (ImportError, InitFailed) as e:
+            print '%-8s  skipped: %s' % (name, e)
+            continue
+        for workload, (setup, statement) in sorted(WORKLOADS.iteritems()):
+            dirty_ms, _ = run(plugin_class, setup, statement, False)
+            full_ms, frames = run(plugin_class, setup, statement, True)
+            print '%-8s  %-12s  dirty %7.3fms  full %7.3fms per frame  %5.1fx  (%d frames)' % (
+                name, workload, dirty_ms, full_ms, full_ms / max(dirty_ms, 1e-6), frames
+            )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,60 @@
+#!/usr/bin/env python2
+
+""" PC-BASIC console output benchmark
+Compares PRINT throughput with and without rendering to the video queue
+and checks that output, POS and CSRLIN agree.
+
+(c) 2018 Rob Hagemans
+This file is released under the GNU GPL version 3 or later.
+"""
+
+import sys
+import os
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, '..', '..'))
+
+import pcbasic
+
+PROGRAMS = {
+    'short lines': b'10 FOR I = 1 TO 2000: PRINT "The quick brown fox"; I: NEXT',
+    'long lines': b'10 A$ = STRING$(200, "x"): FOR I = 1 TO 500: PRINT A$; I: NEXT',
+    'fields': b'10 FOR I = 1 TO 2000: PRINT I, I*2, "abc"; : NEXT',
+    'width 40': b'10 WIDTH 40: FOR I = 1 TO 2000: PRINT "The quick brown fox"; I: NEXT',
+    'screen 1': b'10 SCREEN 1: FOR I = 1 TO 300: PRINT "The quick brown fox"; I: NEXT',
+}
+# state to compare after each run
+PROBES = (b'POS(0)', b'CSRLIN', b'SCREEN(1, 1)', b'SCREEN(CSRLIN-1, 5)')
+
+
+def run(program, headless):
+    """Run a program and return time taken, output and probed state."""
+    with pcbasic.Session(input_streams=None, output_streams=None, capture_output=True) as s:
+        s.execute(program)
+        # without an interface, the session is headless; override to compare
+        s._impl.screen.set_headless(headless)
+        start = time.time()
+        s.execute(b'RUN')
+        elapsed = time.time() - start
+        output = b''.join(s.iter_output())
+        probes = [s.evaluate(p) for p in PROBES]
+    return elapsed, output, probes
+
+
+def main():
+    failed = []
+    for name, program in sorted(PROGRAMS.iteritems()):
+        render_time, render_output, render_probes = run(program, False)
+        headless_time, headless_output, headless_probes = run(program, True)
+        print '%-12s  render %6.3fs  headless %6.3fs  %5.1fx  (%d bytes)' % (
+            name, render_time, headless_time, render_time / headless_time, len(headless_output)
+        )
+        if render_output != headless_output or render_probes != headless_probes:
+            print '    FAILED: %s vs %s' % (render_probes, headless_probes)
+            failed.append(name)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python2
+
+""" PC-BASIC scroll benchmark
+Measures the throughput of scrolling log output in text and graphics modes,
+with the pixel area the interface is asked to redraw per line, and checks that the
+interface ends up with the same text and pixels as the session.
+
+(c) 2018 Rob Hagemans
+This file is released under the GNU GPL version 3 or later.
+"""
+
+import sys
+import os
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, '..', '..'))
+
+import pcbasic
+from pcbasic import data
+from videoqueue import ShadowInterface
+
+LINES = 1000
+# scrolling log output after setting up the screen
+PROGRAM = b'10 %s: FOR I = 1 TO %d: PRINT "Log line"; I; STRING$(I MOD 40, 42): NEXT'
+SETUPS = {
+    'text': (b'SCREEN 0', 'cga'),
+    'screen 2': (b'SCREEN 2', 'cga'),
+    'screen 9': (b'SCREEN 9', 'ega'),
+    # scroll region below a header
+    'view print': (b'SCREEN 9: PRINT "Header": VIEW PRINT 3 TO 20', 'ega'),
+}
+# EGA modes need a 14-pixel font
+FONTS = data.read_fonts(data.read_codepage(u'437'), [u'freedos'], warn=False)
+
+
+def run(setup, video, shared):
+    """Scroll log output; return lines per second, redrawn pixels per line and screen match."""
+    iface = ShadowInterface(shared)
+    with pcbasic.Session(
+            iface, video=video, font=FONTS, input_streams=None, output_streams=None
+        ) as s:
+        s.execute(PROGRAM % (setup, LINES))
+        iface.wait()
+        iface.plugin.area = 0
+        start = time.time()
+        s.execute(b'RUN')
+        iface.wait()
+        elapsed = time.time() - start
+        chars, _ = s.get_text_screen()
+        match = chars == [
+            u''.join(_row).encode('ascii') for _row in iface.plugin.text[iface.plugin.apage]
+        ]
+        pixels = s._impl.display.pixels
+        match = match and (not pixels or all(
+            (ours.buffer == theirs).all()
+            for ours, theirs in zip(pixels.pages, iface.plugin.pages)
+        ))
+    return LINES / elapsed, iface.plugin.area // LINES, match
+
+
+def main():
+    failed = []
+    for name, (setup, video) in sorted(SETUPS.iteritems()):
+        copied_lps, copied_area, copied_match = run(setup, video, False)
+        shared_lps, shared_area, shared_match = run(setup, video, True)
+        print '%-10s  copied %7.1f lines/s %6d px/line  shared %7.1f lines/s %6d px/line' % (
+            name, copied_lps, copied_area, shared_lps, shared_area
+        )
+        if not copied_match or not shared_match:
+            print '    FAILED: screens differ'
+            failed.append(name)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
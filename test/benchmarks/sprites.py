@@ -0,0 +1,71 @@
+#!/usr/bin/env python2
+
+""" PC-BASIC sprite benchmark
+Times GET and PUT of sprites as animated games use them: encoding with GET,
+putting from the sprite cache and decoding changed sprite arrays,
+and prints a checksum of the resulting pixels for comparison across versions.
+
+(c) 2018 Rob Hagemans
+This file is released under the GNU GPL version 3 or later.
+"""
+
+import sys
+import os
+import time
+import zlib
+
+import numpy
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, '..', '..'))
+
+import pcbasic
+from pcbasic import data
+
+MODES = {
+    'screen 1': (b'SCREEN 1', 'cga'),
+    'screen 2': (b'SCREEN 2', 'cga'),
+    'screen 7': (b'SCREEN 7', 'ega'),
+    'screen 9': (b'SCREEN 9', 'ega'),
+}
+SETUP = (
+    b'DEFINT A-Z: DIM A(2000): FOR I = 0 TO 15: LINE (I * 5, I * 2)-(I * 5 + 40, I * 2 + 30), I, BF: NEXT'
+)
+# statements to time
+WORKLOADS = {
+    'get': b'FOR I = 1 TO 200: GET (I MOD 20, 0)-(I MOD 20 + 47, 31), A: NEXT',
+    'put cached': (
+        b'GET (0, 0)-(47, 31), A: '
+        b'FOR I = 1 TO 200: PUT (100 + I MOD 50, 50 + I MOD 30), A, XOR: NEXT'
+    ),
+    'put changed': (
+        b'GET (0, 0)-(47, 31), A: '
+        b'FOR I = 1 TO 200: A(10) = I: PUT (100 + I MOD 50, 50 + I MOD 30), A, PSET: NEXT'
+    ),
+}
+# EGA modes need a 14-pixel font
+FONTS = data.read_fonts(data.read_codepage(u'437'), [u'freedos'], warn=False)
+
+
+def run(mode, video, statement):
+    """Run a sprite workload; return time taken and checksum of the pixels."""
+    with pcbasic.Session(video=video, font=FONTS, input_streams=None, output_streams=None) as s:
+        s.execute(mode)
+        s.execute(SETUP)
+        start = time.time()
+        s.execute(statement)
+        elapsed = time.time() - start
+        pixels = numpy.array(s._impl.display.pixels.pages[0].buffer)
+    return elapsed, zlib.crc32(pixels.tostring()) & 0xffffffff
+
+
+def main():
+    for mode_name, (mode, video) in sorted(MODES.iteritems()):
+        for name, statement in sorted(WORKLOADS.iteritems()):
+            elapsed, checksum = run(mode, video, statement)
+            print '%-9s %-12s  %7.3fs  checksum %08x' % (mode_name, name, elapsed, checksum)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python2
+
+""" PC-BASIC start-up benchmark
+Reports font and codepage loading and start-up times with a cold and a warm cache.
+
+(c) 2018 Rob Hagemans
+This file is released under the GNU GPL version 3 or later.
+"""
+
+import sys
+import os
+import time
+import subprocess
+import tempfile
+import shutil
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, '..', '..'))
+
+from pcbasic import data
+
+FONTS = [u'unifont', u'univga', u'freedos']
+CODEPAGES = [u'437', u'936']
+REPEATS = 5
+
+
+def time_call(func, *args, **kwargs):
+    """Time a function call."""
+    start = time.time()
+    func(*args, **kwargs)
+    return time.time() - start
+
+def load(codepage, cache_dir):
+    """Load the codepage and fonts."""
+    codepage_dict = data.read_codepage(codepage, cache_dir=cache_dir)
+    data.read_fonts(codepage_dict, FONTS, warn=False, cache_dir=cache_dir)
+
+def start_session(cache_home, codepage):
+    """Time a full --interface=none start-up in a fresh interpreter."""
+    env = dict(os.environ)
+    env['XDG_CACHE_HOME'] = cache_home
+    cmd = [
+        sys.executable, os.path.join(HERE, '..', '..', 'run.py'),
+        '--interface=none', '--codepage=%s' % (codepage,), '--exec=SYSTEM'
+    ]
+    with open(os.devnull, 'r+b') as null:
+        start = time.time()
+        subprocess.check_call(cmd, stdin=null, stdout=null, env=env)
+        return time.time() - start
+
+
+def main():
+    print 'font and codepage loading [ms]'
+    print '%-10s %10s %10s %10s' % ('codepage', 'no cache', 'cold', 'warm')
+    for codepage in CODEPAGES:
+        no_cache = min(time_call(load, codepage, None) for _ in range(REPEATS))
+        cold, warm = [], []
+        for _ in range(REPEATS):
+            cache_dir = tempfile.mkdtemp(prefix='pcbasic-cache-')
+            try:
+                cold.append(time_call(load, codepage, cache_dir))
+                warm.append(time_call(load, codepage, cache_dir))
+            finally:
+                shutil.rmtree(cache_dir)
+        print '%-10s %10.1f %10.1f %10.1f' % (
+            codepage, no_cache*1000, min(cold)*1000, min(warm)*1000)
+    print
+    print 'start-up with --interface=none [ms]'
+    print '%-10s %10s %10s' % ('codepage', 'cold', 'warm')
+    for codepage in CODEPAGES:
+        cold, warm = [], []
+        for _ in range(REPEATS):
+            cache_home = tempfile.mkdtemp(prefix='pcbasic-cache-')
+            try:
+                cold.append(start_session(cache_home, codepage))
+                warm.append(start_session(cache_home, codepage))
+            finally:
+                shutil.rmtree(cache_home)
+        print '%-10s %10.1f %10.1f' % (codepage, min(cold)*1000, min(warm)*1000)
+
+
+if __name__ == '__main__':
+    main()
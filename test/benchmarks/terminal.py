@@ -0,0 +1,158 @@
+#!/usr/bin/env python2
+
+""" PC-BASIC terminal output benchmark
+Runs full-screen text workloads on the text-based video plugins in a pseudo-terminal
+and reports the number of bytes written to the terminal and the time per frame.
+
+(c) 2018 Rob Hagemans
+This file is released under the GNU GPL version 3 or later.
+"""
+
+import sys
+import os
+import pty
+import time
+import Queue
+import logging
+import threading
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, '..', '..'))
+
+import pcbasic
+from pcbasic.interface.base import video_plugins, InitFailed
+from pcbasic.basic.base import signals
+from pcbasic.compat import console
+
+PLUGINS = ('ansi', 'curses')
+# setup, then statement executed before each frame
+WORKLOADS = {
+    'editor': (
+        b'DIM L$(24): FOR R = 1 TO 24: L$(R) = "Line" + STR$(R) + STRING$(60, 46): NEXT',
+        # redraw the full screen with one changed character, as a full-screen editor would
+        b'K = K + 1: MID$(L$(K MOD 24 + 1), K MOD 60 + 1, 1) = "#": '
+        b'FOR R = 1 TO 24: LOCATE R, 1: PRINT L$(R);: NEXT: LOCATE K MOD 24 + 1, K MOD 60 + 1'
+    ),
+    'scroll': (
+        b'CLS',
+        b'FOR I = 1 TO 3: K = K + 1: PRINT "The quick brown fox jumps over the lazy dog"; K: NEXT'
+    ),
+    'typing': (b'CLS', b'PRINT "x";'),
+}
+FRAMES = 200
+
+
+class PluginInterface(object):
+    """Interface that runs a video plugin on a separate thread and times its cycles."""
+
+    def __init__(self, plugin_class):
+        """Set up queues and the plugin."""
+        self.inputs, self.video = Queue.Queue(), Queue.Queue()
+        self.plugin = plugin_class(self.inputs, self.video)
+        # time spent handling events and updating the display
+        self.work_time = 0.
+        # set after each cycle
+        self.cycled = threading.Event()
+
+    def _run(self):
+        """Plugin cycle."""
+        with self.plugin:
+            while self.plugin.alive:
+                start = time.time()
+                self.plugin.cycle()
+                self.work_time += time.time() - start
+                self.cycled.set()
+                time.sleep(0.001)
+
+    def start(self):
+        """Start the plugin thread."""
+        self._thread = threading.Thread(target=self._run)
+        self._thread.start()
+
+    def wait(self):
+        """Wait until the plugin has processed all events and updated the display."""
+        self.video.join()
+        self.cycled.clear()
+        self.cycled.wait()
+
+    def quit(self):
+        """Stop the plugin."""
+        self.video.put(signals.Event(signals.VIDEO_QUIT))
+        self._thread.join()
+
+    def get_queues(self):
+        """Video, audio and input queues."""
+        return self.inputs, self.video, None
+
+
+def child(name, workload, result_fd):
+    """Run a workload on a plugin; report time spent in plugin cycles."""
+    # the parent's console module was set up before we had a terminal
+    console.is_tty = sys.stdin.isatty()
+    logging.basicConfig(stream=open(os.devnull, 'w'))
+    setup, statement = WORKLOADS[workload]
+    iface = PluginInterface(video_plugins[name])
+    iface.start()
+    try:
+        with pcbasic.Session(iface, input_streams=None, output_streams=None) as s:
+            s.execute(setup)
+            s._impl.queues.flush_video()
+            iface.wait()
+            iface.work_time = 0.
+            for _ in range(FRAMES):
+                s.execute(statement)
+                s._impl.queues.flush_video()
+                iface.wait()
+    finally:
+        iface.quit()
+    os.write(result_fd, b'%f' % (iface.work_time,))
+
+
+def run(name, workload):
+    """Run a workload in a pseudo-terminal; return bytes written and ms per frame."""
+    read_fd, write_fd = os.pipe()
+    pid, pty_fd = pty.fork()
+    if not pid:
+        os.close(read_fd)
+        os.environ['TERM'] = 'xterm'
+        try:
+            child(name, workload, write_fd)
+        except InitFailed as e:
+            os.write(write_fd, b'skipped: %s' % (e,))
+        finally:
+            os._exit(0)
+    os.close(write_fd)
+    count = 0
+    while True:
+        try:
+            data = os.read(pty_fd, 65536)
+        except OSError:
+            break
+        if not data:
+            break
+        count += len(data)
+    os.waitpid(pid, 0)
+    result = os.read(read_fd, 1024)
+    os.close(read_fd)
+    if not result:
+        return None, 'failed'
+    if result.startswith(b'skipped'):
+        return None, result
+    return count, 1000. * float(result) / FRAMES
+
+
+def main():
+    for name in PLUGINS:
+        for workload in sorted(WORKLOADS):
+            count, per_frame = run(name, workload)
+            if count is None:
+                print '%-8s  %-8s  %s' % (name, workload, per_frame)
+            else:
+                print '%-8s  %-8s  %8d bytes  %7.3fms per frame' % (
+                    name, workload, count, per_frame
+                )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
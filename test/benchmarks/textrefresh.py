@@ -0,0 +1,95 @@
+#!/usr/bin/env python2
+
+""" PC-BASIC graphics-mode text refresh benchmark
+Compares redrawing full rows of text in graphics modes as row spans with
+redrawing them one cell at a time, and checks that the pixels agree.
+
+(c) 2018 Rob Hagemans
+This file is released under the GNU GPL version 3 or later.
+"""
+
+import sys
+import os
+import time
+
+import numpy
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, '..', '..'))
+
+import pcbasic
+from pcbasic import data
+
+MODES = {
+    'screen 1': (b'SCREEN 1', 'cga'),
+    'screen 2': (b'SCREEN 2', 'cga'),
+    'screen 7': (b'SCREEN 7', 'ega'),
+    'screen 9': (b'SCREEN 9', 'ega'),
+}
+# fill the screen with text in varying colours
+FILL = (
+    b'FOR R = 1 TO 24: COLOR R MOD 3 + 1: LOCATE R, 1: '
+    b'PRINT LEFT$(STRING$(100, R + 64) + "the quick brown fox", 40);: NEXT'
+)
+REPEATS = 5
+# EGA modes need a 14-pixel font
+FONTS = data.read_fonts(data.read_codepage(u'437'), [u'freedos'], warn=False)
+
+
+class EventCounter(object):
+    """Video queue that counts events."""
+
+    def __init__(self):
+        """Initialise."""
+        self.events = 0
+
+    def put(self, item, block=True, timeout=None):
+        """Count an event."""
+        self.events += 1
+
+    def put_nowait(self, item):
+        """Count an event."""
+        self.put(item)
+
+
+def run(setup, video, by_cell):
+    """Redraw the screen; return time taken, number of events and the pixels."""
+    with pcbasic.Session(video=video, font=FONTS, input_streams=None, output_streams=None) as s:
+        s.execute(setup)
+        s.execute(FILL)
+        screen = s._impl.screen
+        pixels = s._impl.display.pixels.pages[screen.apagenum]
+        # without an interface, the session is headless; send events to our counter instead
+        screen.set_headless(False)
+        counter = EventCounter()
+        s._impl.queues.video = counter
+        start = time.time()
+        for _ in range(REPEATS):
+            pixels.fill_rect(0, 0, pixels.width-1, pixels.height-1, 0)
+            for row in range(1, screen.mode.height+1):
+                if by_cell:
+                    for col in range(1, screen.mode.width+1):
+                        screen.refresh_range(screen.apagenum, row, col, col)
+                else:
+                    screen.refresh_range(screen.apagenum, row, 1, screen.mode.width)
+        elapsed = time.time() - start
+        result = numpy.array(pixels.buffer)
+    return elapsed, counter.events, result
+
+
+def main():
+    failed = []
+    for name, (setup, video) in sorted(MODES.iteritems()):
+        cell_time, cell_events, cell_pixels = run(setup, video, True)
+        span_time, span_events, span_pixels = run(setup, video, False)
+        print '%-9s  by cell %6.3fs %6d events  by row %6.3fs %6d events  %5.1fx' % (
+            name, cell_time, cell_events, span_time, span_events, cell_time / span_time
+        )
+        if (cell_pixels != span_pixels).any() or not cell_pixels.any():
+            print '    FAILED: pixels differ'
+            failed.append(name)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
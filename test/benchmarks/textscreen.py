@@ -0,0 +1,95 @@
+#!/usr/bin/env python2
+
+""" PC-BASIC text screen benchmark
+Times reading the text screen from BASIC through SCREEN() and PEEK and from Python,
+cell by cell and as a whole page, and checks that both ways agree.
+
+(c) 2018 Rob Hagemans
+This file is released under the GNU GPL version 3 or later.
+"""
+
+import sys
+import os
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, '..', '..'))
+
+import pcbasic
+
+REPEATS = 20
+SETUP = (
+    b'10 CLS: FOR I = 1 TO 24: LOCATE I, 1: COLOR I MOD 16, I MOD 8\n'
+    b'20 PRINT STRING$(80, 64 + I);: NEXT: COLOR 7, 0'
+)
+PROGRAMS = {
+    # read every character and attribute with the SCREEN function
+    'SCREEN()': (
+        b'30 FOR N = 1 TO %d: FOR R = 1 TO 25: FOR C = 1 TO 80\n'
+        b'40 A = SCREEN(R, C): B = SCREEN(R, C, 1): NEXT: NEXT: NEXT' % REPEATS
+    ),
+    # read the whole page of video memory
+    'PEEK': (
+        b'30 DEF SEG = &HB800: FOR N = 1 TO %d: FOR I = 0 TO 3999\n'
+        b'40 A = PEEK(I): NEXT: NEXT' % REPEATS
+    ),
+    # copy video memory onto itself
+    'POKE': (
+        b'30 DEF SEG = &HB800: FOR N = 1 TO %d: FOR I = 0 TO 3999\n'
+        b'40 POKE I, PEEK(I): NEXT: NEXT' % REPEATS
+    ),
+}
+
+
+def run(program):
+    """Time a program reading the text screen; return cells per second."""
+    with pcbasic.Session(peek_values={}, input_streams=None, output_streams=None) as s:
+        s.execute(SETUP + b'\n' + program)
+        start = time.time()
+        s.execute(b'RUN')
+        elapsed = time.time() - start
+    return REPEATS * 2000 / elapsed
+
+
+def run_api():
+    """Time reading the page from Python; return pages per second per cell and whole, and match."""
+    with pcbasic.Session(input_streams=None, output_streams=None) as s:
+        s.execute(SETUP + b'\nRUN')
+        start = time.time()
+        for _ in range(REPEATS):
+            cells = [
+                [
+                    (
+                        s.evaluate(b'SCREEN(%d,%d)' % (_r, _c)),
+                        s.evaluate(b'SCREEN(%d,%d,1)' % (_r, _c))
+                    )
+                    for _c in range(1, 81)
+                ]
+                for _r in range(1, 26)
+            ]
+        per_cell = REPEATS / (time.time() - start)
+        start = time.time()
+        for _ in range(REPEATS * 100):
+            chars, attrs = s.get_text_screen()
+        whole = REPEATS * 100 / (time.time() - start)
+    match = all(
+        (ord(chars[_r][_c]), attrs[_r][_c]) == cells[_r][_c]
+        for _r in range(25) for _c in range(80)
+    )
+    return per_cell, whole, match
+
+
+def main():
+    for name, program in sorted(PROGRAMS.iteritems()):
+        print '%-10s %9.0f cells/s' % (name, run(program))
+    per_cell, whole, match = run_api()
+    print 'evaluate   %9.1f pages/s' % (per_cell,)
+    print 'get_text_screen %9.1f pages/s' % (whole,)
+    if not match:
+        print 'FAILED: pages differ'
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python2
+
+""" PC-BASIC text output benchmark
+Compares writing text to the screen a row span at a time with writing it
+one character at a time, in text and graphics modes, and checks that the
+screen and the glyphs sent to the interface agree.
+
+(c) 2018 Rob Hagemans
+This file is released under the GNU GPL version 3 or later.
+"""
+
+import sys
+import os
+import time
+
+import numpy
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, '..', '..'))
+
+import pcbasic
+from pcbasic.basic.base import signals
+
+MODES = {
+    'width 80': b'SCREEN 0: WIDTH 80',
+    'width 40': b'SCREEN 0: WIDTH 40',
+    'screen 1': b'SCREEN 1',
+    'screen 2': b'SCREEN 2',
+}
+TEXTS = {
+    'report': b''.join(
+        b'%5d  The quick brown fox jumps over the lazy dog %10.2f\r' % (i, i*3.14159)
+        for i in range(500)
+    ),
+    'long lines': (b'x' * 200 + b'\r') * 50,
+    'columns': b''.join(b'%-14d' % (i,) for i in range(2000)),
+}
+
+
+class EventSink(object):
+    """Video queue that counts events and keeps the last glyph written to each cell."""
+
+    def __init__(self):
+        """Initialise."""
+        self.events = 0
+        self.cells = {}
+
+    def put(self, item, block=True, timeout=None):
+        """Record an event."""
+        self.events += 1
+        if item.event_type == signals.VIDEO_PUT_GLYPH:
+            pagenum, row, col, char, _, fore, back, blink, underline = item.params
+            self.cells[pagenum, row, col] = char, fore, back, blink, underline
+        elif item.event_type == signals.VIDEO_PUT_TEXT:
+            pagenum, row, col, chars, fore, back, blink, underline = item.params
+            for i, char in enumerate(chars):
+                self.cells[pagenum, row, col+i] = char, fore, back, blink, underline
+
+    def put_nowait(self, item):
+        """Record an event."""
+        self.put(item)
+
+
+def write_by_char(screen):
+    """Make the screen write runs of characters one at a time."""
+    def write_chars(chars):
+        for c in chars:
+            screen.write_char(c)
+    screen.write_chars = write_chars
+
+
+def run(setup, text, by_char):
+    """Write text to the screen; return time taken, number of events and the screen state."""
+    with pcbasic.Session(input_streams=None, output_streams=None) as s:
+        s.execute(setup)
+        screen = s._impl.screen
+        # without an interface, the session is headless; send events to our sink instead
+        screen.set_headless(False)
+        sink = EventSink()
+        s._impl.queues.video = sink
+        if by_char:
+            write_by_char(screen)
+        start = time.time()
+        screen.write(text, do_echo=False)
+        elapsed = time.time() - start
+        state = (
+            screen.text.get_text_raw(screen.apagenum),
+            [[cell[1] for cell in row.buf] for row in screen.text.pages[screen.apagenum].row],
+            [row.end for row in screen.text.pages[screen.apagenum].row],
+            screen.current_row, screen.current_col, screen.overflow,
+        )
+        pixels = s._impl.display.pixels
+        if pixels:
+            pixels = numpy.array(pixels.pages[screen.apagenum].buffer)
+    return elapsed, sink.events, state, sink.cells, pixels
+
+
+def main():
+    failed = []
+    for mode, setup in sorted(MODES.iteritems()):
+        for name, text in sorted(TEXTS.iteritems()):
+            char_time, char_events, char_state, char_cells, char_pixels = run(setup, text, True)
+            run_time, run_events, run_state, run_cells, run_pixels = run(setup, text, False)
+            print '%-9s %-11s  by char %6.3fs %6d events  by run %6.3fs %6d events  %5.1fx' % (
+                mode, name, char_time, char_events, run_time, run_events, char_time / run_time
+            )
+            same_pixels = (char_pixels is None) or (char_pixels == run_pixels).all()
+            if char_state != run_state or char_cells != run_cells or not same_pixels:
+                print '    FAILED: screens differ'
+                failed.append((mode, name))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
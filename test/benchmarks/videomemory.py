@@ -0,0 +1,79 @@
+#!/usr/bin/env python2
+
+""" PC-BASIC video memory benchmark
+Times BSAVE and BLOAD of full screens and single-byte PEEK and POKE into video memory,
+and prints a checksum of the resulting pixels for comparison across versions.
+
+(c) 2018 Rob Hagemans
+This file is released under the GNU GPL version 3 or later.
+"""
+
+import sys
+import os
+import time
+import zlib
+import shutil
+import tempfile
+
+import numpy
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, '..', '..'))
+
+import pcbasic
+from pcbasic import data
+
+MODES = {
+    'screen 0': (b'SCREEN 0: WIDTH 80', 'cga', 0xb800, 4000),
+    'screen 1': (b'SCREEN 1', 'cga', 0xb800, 16384),
+    'screen 2': (b'SCREEN 2', 'cga', 0xb800, 16384),
+    'screen 7': (b'SCREEN 7', 'ega', 0xa000, 8000),
+    'screen 9': (b'SCREEN 9', 'ega', 0xa000, 28000),
+}
+SETUP = (
+    b'FOR I = 0 TO 15: LINE (I * 5, I * 2)-(I * 5 + 40, I * 2 + 30), I, BF: NEXT: '
+    b'PRINT STRING$(500, "x")'
+)
+# statements to time
+WORKLOADS = {
+    'bload': b'FOR I = 1 TO 10: CLS: BLOAD "SCREEN.BSV", 0: NEXT',
+    'bsave': b'FOR I = 1 TO 10: BSAVE "SCREEN.BSV", 0, %d: NEXT',
+    'peek poke': b'FOR I = 0 TO 1999: POKE I * 7 + 1, PEEK(I * 3): NEXT',
+}
+# EGA modes need a 14-pixel font
+FONTS = data.read_fonts(data.read_codepage(u'437'), [u'freedos'], warn=False)
+
+
+def run(mode, video, segment, size, statement, path):
+    """Run a video memory workload; return time taken and checksum of the screen."""
+    with pcbasic.Session(
+            video=video, font=FONTS, input_streams=None, output_streams=None,
+            peek_values={}, mount={b'A': (path, u'')}, current_device=b'A:'
+        ) as s:
+        s.execute(mode)
+        s.execute(SETUP)
+        s.execute(b'DEF SEG = %d: BSAVE "SCREEN.BSV", 0, %d' % (segment, size))
+        start = time.time()
+        s.execute(statement.replace(b'%d', b'%d' % size))
+        elapsed = time.time() - start
+        if s._impl.display.pixels:
+            screen = numpy.array(s._impl.display.pixels.pages[0].buffer).tostring()
+        else:
+            screen = b''.join(s._impl.display.text_screen.text.get_text_raw(0))
+    return elapsed, zlib.crc32(screen) & 0xffffffff
+
+
+def main():
+    path = tempfile.mkdtemp()
+    try:
+        for mode_name, (mode, video, segment, size) in sorted(MODES.iteritems()):
+            for name, statement in sorted(WORKLOADS.iteritems()):
+                elapsed, checksum = run(mode, video, segment, size, statement, path)
+                print '%-9s %-10s  %7.3fs  checksum %08x' % (mode_name, name, elapsed, checksum)
+    finally:
+        shutil.rmtree(path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
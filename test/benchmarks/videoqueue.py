@@ -0,0 +1,252 @@
+#!/usr/bin/env python2
+
+""" PC-BASIC video queue benchmark
+Compares drawing with and without coalescing of video events, and with a shared
+framebuffer, and checks that the interface ends up with the same pixels as the session.
+
+(c) 2018 Rob Hagemans
+This file is released under the GNU GPL version 3 or later.
+"""
+
+import sys
+import os
+import time
+import Queue
+import threading
+
+import numpy
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, '..', '..'))
+
+import pcbasic
+from pcbasic.interface.video import VideoPlugin
+
+PROGRAMS = {
+    'pset': (
+        b'10 SCREEN 1: FOR Y = 0 TO 199 STEP 2: FOR X = 0 TO 319 STEP 2\n'
+        b'20 PSET (X, Y), (X+Y) MOD 4: NEXT: NEXT'
+    ),
+    'line': b'10 SCREEN 2: FOR I = 0 TO 639 STEP 2: LINE (I, 0)-(639-I, 199), 1: NEXT',
+    'box': b'10 SCREEN 5: FOR I = 0 TO 99: LINE (I, I)-(319-I, 199-I), I MOD 16, BF: NEXT',
+    'circle': b'10 SCREEN 1: FOR R = 1 TO 99: CIRCLE (160, 100), R, R MOD 4: NEXT',
+    'print': b'10 SCREEN 1: FOR I = 1 TO 300: PRINT "The quick brown fox"; I: NEXT',
+    'pcopy': (
+        b'10 SCREEN 5, , 1, 0: FOR I = 0 TO 99: PSET (I, I), 2: LINE (0, I)-(I, 0), 3\n'
+        b'20 PCOPY 1, 0: NEXT'
+    ),
+}
+
+
+class ShadowPlugin(VideoPlugin):
+    """Video plugin that keeps a copy of the text and pixels it is sent."""
+
+    def __init__(self, input_queue, video_queue):
+        """Initialise."""
+        VideoPlugin.__init__(self, input_queue, video_queue)
+        self.pages = []
+        # characters on each text page, as lists of rows
+        self.text = []
+        self.apage = 0
+        self.font_height = 8
+        # glyphs held for text modes, by code point
+        self.glyphs = {}
+        # glyphs by font size, kept across mode switches
+        self._glyph_dicts = {}
+        # number of glyph writes for which no glyph was held
+        self.missing = 0
+        self.events = 0
+        # number of pixels received or updated as rects
+        self.area = 0
+        self.framebuffer = None
+        self._handlers = {
+            event_type: self._counted(handler)
+            for event_type, handler in self._handlers.iteritems()
+        }
+        # set after each cycle
+        self.cycled = threading.Event()
+
+    def _counted(self, handler):
+        """Count calls to an event handler."""
+        def _handler(*args):
+            self.events += 1
+            handler(*args)
+        return _handler
+
+    def _work(self):
+        """Signal that a cycle has been completed."""
+        self.cycled.set()
+
+    def set_mode(self, mode_info):
+        """Initialise a given text or graphics mode."""
+        self.framebuffer = None
+        self.font_height = mode_info.font_height
+        self.glyphs = self._glyph_dicts.setdefault(
+            (mode_info.font_height, mode_info.font_width), {}
+        )
+        self.text = [
+            [[u' '] * mode_info.width for _ in range(mode_info.height)]
+            for _ in range(mode_info.num_pages)
+        ]
+        if mode_info.is_text_mode:
+            self.pages = []
+        else:
+            self.pages = [
+                numpy.zeros((mode_info.pixel_height, mode_info.pixel_width), dtype=numpy.int8)
+                for _ in range(mode_info.num_pages)
+            ]
+
+    def set_page(self, vpage, apage):
+        """Set the visible and active page."""
+        self.apage = apage
+
+    def set_framebuffer(self, pixels):
+        """Use the interpreter's pixel buffer."""
+        self.framebuffer = pixels
+
+    def update_rect(self, pagenum, x0, y0, x1, y1):
+        """Copy changed area from the shared pixel buffer."""
+        self.area += (x1-x0+1) * (y1-y0+1)
+        self.pages[pagenum][y0:y1+1, x0:x1+1] = (
+            self.framebuffer.pages[pagenum].buffer[y0:y1+1, x0:x1+1]
+        )
+
+    def build_glyphs(self, new_dict):
+        """Keep the glyphs sent; drop those set to None."""
+        for char, glyph in new_dict.iteritems():
+            if glyph is None:
+                self.glyphs.pop(char, None)
+            else:
+                self.glyphs[char] = glyph
+
+    def put_glyph(self, pagenum, row, col, char, is_fullwidth, fore, back, blink, underline):
+        """Put a character at a given position."""
+        self.text[pagenum][row-1][col-1] = char
+        if not self.pages and char not in self.glyphs:
+            self.missing += 1
+
+    def clear_rows(self, back_attr, start, stop):
+        """Clear a range of screen rows."""
+        self.text[self.apage][start-1:stop] = [
+            [u' '] * len(self.text[self.apage][0]) for _ in range(start-1, stop)
+        ]
+        if self.pages and not self.framebuffer:
+            self.pages[self.apage][(start-1)*self.font_height:stop*self.font_height] = 0
+
+    def scroll_up(self, from_line, scroll_height, back_attr, count):
+        """Scroll the screen up by count rows between from_line and scroll_height."""
+        text, count = self.text[self.apage], min(count, scroll_height - from_line + 1)
+        text[from_line-1:scroll_height] = (
+            text[from_line-1+count:scroll_height] + [[u' '] * len(text[0]) for _ in range(count)]
+        )
+        if self.pages and not self.framebuffer:
+            page = self.pages[self.apage]
+            y0, y1 = (from_line-1)*self.font_height, scroll_height*self.font_height
+            height = min(count*self.font_height, y1-y0)
+            page[y0:y1-height] = page[y0+height:y1]
+            page[y1-height:y1] = 0
+
+    def scroll_down(self, from_line, scroll_height, back_attr, count):
+        """Scroll the screen down by count rows between from_line and scroll_height."""
+        text, count = self.text[self.apage], min(count, scroll_height - from_line + 1)
+        text[from_line-1:scroll_height] = (
+            [[u' '] * len(text[0]) for _ in range(count)] + text[from_line-1:scroll_height-count]
+        )
+        if self.pages and not self.framebuffer:
+            page = self.pages[self.apage]
+            y0, y1 = (from_line-1)*self.font_height, scroll_height*self.font_height
+            height = min(count*self.font_height, y1-y0)
+            page[y0+height:y1] = page[y0:y1-height]
+            page[y0:y0+height] = 0
+
+    def put_pixel(self, pagenum, x, y, index):
+        """Put a pixel on the screen."""
+        self.pages[pagenum][y, x] = index
+
+    def fill_interval(self, pagenum, x0, x1, y, index):
+        """Fill a scanline interval in a solid attribute."""
+        self.pages[pagenum][y, x0:x1+1] = index
+
+    def put_interval(self, pagenum, x, y, colours):
+        """Write a list of attributes to a scanline interval."""
+        self.pages[pagenum][y, x:x+len(colours)] = colours
+
+    def fill_rect(self, pagenum, x0, y0, x1, y1, index):
+        """Fill a rectangle in a solid attribute."""
+        self.pages[pagenum][y0:y1+1, x0:x1+1] = index
+
+    def put_rect(self, pagenum, x0, y0, x1, y1, array):
+        """Apply numpy array [y][x] of attributes to an area."""
+        self.area += (x1-x0+1) * (y1-y0+1)
+        self.pages[pagenum][y0:y1+1, x0:x1+1] = array
+
+
+class ShadowInterface(object):
+    """Interface that runs a ShadowPlugin on a separate thread."""
+
+    def __init__(self, shared_framebuffer=False):
+        """Set up queues and start the plugin thread."""
+        self.shared_framebuffer = shared_framebuffer
+        self.inputs, self.video, self.audio = Queue.Queue(), Queue.Queue(), Queue.Queue()
+        self.plugin = ShadowPlugin(self.inputs, self.video)
+        thread = threading.Thread(target=self._run)
+        thread.daemon = True
+        thread.start()
+
+    def _run(self):
+        """Plugin cycle."""
+        while True:
+            self.plugin.cycle()
+            time.sleep(0.024)
+
+    def wait(self):
+        """Wait until the plugin has processed all events."""
+        self.video.join()
+        # the last event may still be in progress after join()
+        self.plugin.cycled.clear()
+        self.plugin.cycled.wait()
+
+    def get_queues(self):
+        """Video, audio and input queues."""
+        return self.inputs, self.video, None
+
+
+def run(program, coalesce, shared=False):
+    """Run a program and return time taken, number of events and whether pixels match."""
+    iface = ShadowInterface(shared)
+    with pcbasic.Session(iface, video='pcjr', video_memory=65536, input_streams=None, output_streams=None) as s:
+        s.execute(program)
+        iface.wait()
+        if not coalesce:
+            s._impl.queues.video = iface.video
+        iface.plugin.events = 0
+        start = time.time()
+        s.execute(b'RUN')
+        iface.wait()
+        elapsed = time.time() - start
+        pixels = s._impl.display.pixels
+        match = all(
+            (ours.buffer == theirs).all()
+            for ours, theirs in zip(pixels.pages, iface.plugin.pages)
+        )
+    return elapsed, iface.plugin.events, match
+
+
+def main():
+    failed = []
+    for name, program in sorted(PROGRAMS.iteritems()):
+        plain_time, plain_events, plain_match = run(program, False)
+        coalesced_time, coalesced_events, coalesced_match = run(program, True)
+        shared_time, shared_events, shared_match = run(program, True, shared=True)
+        print '%-8s  plain %6.3fs %7d events  coalesced %6.3fs %7d events  %5.1fx  shared %6.3fs' % (
+            name, plain_time, plain_events, coalesced_time, coalesced_events,
+            plain_time / coalesced_time, shared_time
+        )
+        if not plain_match or not coalesced_match or not shared_match:
+            print '    FAILED: pixels differ'
+            failed.append(name)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python2
+
+""" PC-BASIC composite artifacts check
+Checks composite colour artifacts, rendered in full, incrementally on dirty areas
+and through the headless framebuffer interface, pixel for pixel against the
+original whole-screen transformation.
+
+(c) 2018 Rob Hagemans
+This file is released under the GNU GPL version 3 or later.
+"""
+
+import sys
+import os
+import io
+import random
+import shutil
+import tempfile
+
+import numpy
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, '..'))
+
+import pcbasic
+from pcbasic.basic.display import modes
+from pcbasic.interface import Interface
+from pcbasic.interface import window
+from framebuffer import read_ppm
+
+# colorburst is switched on through the CGA mode control register
+PROGRAMS = {
+    'stripes': (
+        b'SCREEN 2: OUT &H3D8, &H1A: '
+        b'FOR I = 0 TO 63: LINE (I*10, 0)-(I*10 + I MOD 7, 199), 1, BF: NEXT'
+    ),
+    'shapes': (
+        b'SCREEN 2: OUT &H3D8, &H1A: CIRCLE (320, 100), 150, 1: '
+        b'PAINT (320, 100), CHR$(&H33) + CHR$(&H99), 1: PRINT "hello"'
+    ),
+}
+
+
+def reference_artifacts(src_array, pixels=4):
+    """Original whole-screen composite transformation of an array [x][y]."""
+    width, _ = src_array.shape
+    s = [None] * pixels
+    for p in range(pixels):
+        s[p] = src_array[p:width:pixels] & (4//pixels)
+    for p in range(1,pixels):
+        s[0] = s[0]*2 + s[p]
+    return numpy.repeat(s[0], pixels, axis=0)
+
+
+def random_page(width, height, bitsperpixel):
+    """Random attributes in an array [x][y]."""
+    return numpy.random.randint(0, 1 << bitsperpixel, (width, height)).astype(numpy.uint8)
+
+
+def check_arrays():
+    """Check full, incremental and RGB rendering on random pages; return names of failures."""
+    failed = []
+    lookup = numpy.array(modes.COMPOSITE['cga'], dtype=numpy.uint8)
+    for bitsperpixel, width in ((1, 640), (2, 320)):
+        pixels = 4 // bitsperpixel
+        page = random_page(width, 200, bitsperpixel)
+        full = window.apply_composite_artifacts(page, pixels)
+        if not (full == reference_artifacts(page, pixels)).all():
+            failed.append('full %dbpp' % bitsperpixel)
+        if not (
+                window.apply_composite_rgb(page.T, lookup, pixels)
+                == lookup[reference_artifacts(page, pixels).T]
+            ).all():
+            failed.append('rgb %dbpp' % bitsperpixel)
+        # change random areas, not aligned to pixel groups, and update only those
+        shown = reference_artifacts(page, pixels)
+        for _ in range(50):
+            rects = []
+            for _ in range(random.randint(1, 4)):
+                x, y = random.randrange(width), random.randrange(200)
+                w, h = random.randint(1, width - x), random.randint(1, 200 - y)
+                page[x:x+w, y:y+h] = random_page(w, h, bitsperpixel)
+                rects.append((x, y, w, h))
+            widened = window.update_composite_artifacts(shown, page, rects, pixels)
+            ok = (shown == reference_artifacts(page, pixels)).all()
+            ok = ok and all(
+                _x % pixels == 0 and _w % pixels == 0 and _x + _w <= width
+                for _x, _, _w, _ in widened
+            )
+            if not ok:
+                failed.append('incremental %dbpp' % bitsperpixel)
+                break
+    return failed
+
+
+def capture(program, workdir):
+    """Run a program on a composite monitor; return the frame and the expected frame."""
+    result = {}
+    def target(interface, guard):
+        with pcbasic.Session(
+                interface, video='cga', monitor='composite', input_streams=None, output_streams=None
+            ) as s:
+            s.execute(program)
+            s.capture_frame(os.path.join(workdir, 'frame.ppm'))
+            display = s._impl.display
+            page = numpy.array(display.pixels.pages[display.vpagenum].buffer, dtype=numpy.uint8)
+            lookup = numpy.array(modes.COMPOSITE['cga'], dtype=numpy.uint8)
+            pixels = 4 // display.mode.bitsperpixel
+            result['expected'] = lookup[reference_artifacts(page.T, pixels).T]
+    iface = Interface(try_interfaces=('framebuffer',))
+    iface.launch(target)
+    with io.open(os.path.join(workdir, 'frame.ppm'), 'rb') as f:
+        return read_ppm(f), result['expected']
+
+
+def main():
+    failed = check_arrays()
+    for name, program in sorted(PROGRAMS.iteritems()):
+        workdir = tempfile.mkdtemp(prefix='pcbasic-composite-')
+        try:
+            frame, expected = capture(program, workdir)
+        finally:
+            shutil.rmtree(workdir)
+        # the composite palette has colours that are not on the RGB palette
+        ok = len(set(frame.reshape(-1, 3).dot([65536, 256, 1]))) > 2
+        ok = ok and frame.shape == expected.shape and (frame == expected).all()
+        print '%-10s %dx%d  %s' % (name, frame.shape[1], frame.shape[0], 'ok' if ok else 'FAILED')
+        if not ok:
+            failed.append(name)
+    if failed:
+        print 'FAILED: %s' % ', '.join(failed)
+        return 1
+    print 'passed.'
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
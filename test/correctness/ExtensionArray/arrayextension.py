@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+
+def total(seq):
+    if isinstance(seq, (list, tuple)):
+        return sum(total(x) for x in seq)
+    try:
+        return int(seq.sum())
+    except AttributeError:
+        return seq
+
+def rows(seq):
+    return len(seq)
+
+def output(*args):
+    with open('python-output.txt', 'a') as g:
+        for arg in args:
+            try:
+                arg = arg.tolist()
+            except AttributeError:
+                pass
+            g.write(repr(arg) + '\n')
+
+def join(seq):
+    return u'-'.join(s.decode('ascii') for s in seq)
+
+def big():
+    return 2**40
+
+def twice(x):
+    return 2*x
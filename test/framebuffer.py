@@ -0,0 +1,104 @@
+#!/usr/bin/env python2
+
+""" PC-BASIC framebuffer capture check
+Runs programs on the headless framebuffer interface, captures the screen
+and checks the images against the interpreter's screen.
+
+(c) 2018 Rob Hagemans
+This file is released under the GNU GPL version 3 or later.
+"""
+
+import sys
+import os
+import io
+import shutil
+import tempfile
+
+import numpy
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, '..'))
+
+import pcbasic
+from pcbasic.interface import Interface
+
+PROGRAMS = {
+    'screen 1': b'SCREEN 1: CIRCLE (160, 100), 50, 2: LINE (0, 0)-(319, 199), 3, B: PRINT "hello"',
+    'screen 2': b'SCREEN 2: FOR I = 0 TO 15: LINE (I*40, 0)-(I*40+19, 199), 1, BF: NEXT: PRINT "hello"',
+    'screen 0': b'COLOR 14, 1: CLS: PRINT "hello": COLOR 7, 0',
+}
+
+
+def read_ppm(stream):
+    """Read a binary PPM image into an array [y][x][rgb]; None at end of stream."""
+    magic = stream.readline()
+    if not magic:
+        return None
+    assert magic == b'P6\n'
+    width, height = (int(_x) for _x in stream.readline().split())
+    assert stream.readline() == b'255\n'
+    data = stream.read(width * height * 3)
+    return numpy.fromstring(data, dtype=numpy.uint8).reshape(height, width, 3)
+
+
+def capture(program, workdir):
+    """Run a program and capture the screen; return the screen attributes."""
+    result = {}
+    def target(interface, guard):
+        with pcbasic.Session(interface, input_streams=None, output_streams=None) as s:
+            s.execute(program)
+            s.capture_frame(os.path.join(workdir, 'frame.ppm'))
+            s.capture_frame(os.path.join(workdir, 'frame.png'))
+            s.capture_frame()
+            display = s._impl.display
+            if display.mode.is_text_mode:
+                result['attrs'] = None
+            else:
+                page = display.pixels.pages[display.vpagenum].buffer
+                result['attrs'] = numpy.array(page, dtype=numpy.uint8)
+    iface = Interface(
+        try_interfaces=('framebuffer',),
+        capture_file=os.path.join(workdir, 'frame%d.ppm')
+    )
+    iface.launch(target)
+    return result['attrs']
+
+
+def main():
+    failed = []
+    for name, program in sorted(PROGRAMS.iteritems()):
+        workdir = tempfile.mkdtemp(prefix='pcbasic-framebuffer-')
+        try:
+            attrs = capture(program, workdir)
+            with io.open(os.path.join(workdir, 'frame.ppm'), 'rb') as f:
+                frame = read_ppm(f)
+            # explicit capture to the capture file and final capture on exit
+            with io.open(os.path.join(workdir, 'frame0.ppm'), 'rb') as f:
+                first = read_ppm(f)
+            with io.open(os.path.join(workdir, 'frame1.ppm'), 'rb') as f:
+                last = read_ppm(f)
+            with io.open(os.path.join(workdir, 'frame.png'), 'rb') as f:
+                is_png = f.read(8) == b'\x89PNG\r\n\x1a\n'
+            ok = is_png and (frame == first).all() and (frame == last).all()
+            if attrs is not None:
+                # each attribute maps to a single colour and equal colours mean equal attributes
+                colours = frame.astype(int).dot([65536, 256, 1])
+                pairs = set(zip(attrs.ravel(), colours.ravel()))
+                ok = ok and frame.shape[:2] == attrs.shape
+                ok = ok and len(pairs) == len(set(attrs.ravel())) == len(set(colours.ravel()))
+            else:
+                ok = ok and len(set(frame.reshape(-1, 3).dot([65536, 256, 1]))) > 1
+            print '%-10s %dx%d  %s' % (name, frame.shape[1], frame.shape[0], 'ok' if ok else 'FAILED')
+            if not ok:
+                failed.append(name)
+        finally:
+            shutil.rmtree(workdir)
+    if failed:
+        print 'FAILED: %s' % ', '.join(failed)
+        return 1
+    print 'passed.'
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,172 @@
+#!/usr/bin/env python2
+
+""" PC-BASIC import time check
+Reports module import times in the style of python3 -X importtime
+and checks that optional modules stay unloaded for one-shot runs.
+
+(c) 2018 Rob Hagemans
+This file is released under the GNU GPL version 3 or later.
+"""
+
+import __builtin__
+import sys
+import os
+import time
+import subprocess
+import tempfile
+import shutil
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, '..'))
+
+# modules that should only be loaded if the relevant option or device is used
+DEFERRED = (
+    'pcbasic.interface.video_',
+    'pcbasic.interface.audio_',
+    'pcbasic.interface.synthesiser',
+    'pcbasic.interface.sdl2',
+    'pcbasic.interface.clipboard',
+    'pcbasic.basic.debug',
+    'pcbasic.basic.devices.cassette',
+    'pygame',
+    'pyaudio',
+    'curses',
+    'serial',
+    'parallel',
+)
+
+# one-shot runs to check
+SCENARIOS = ('import', 'convert', 'none')
+
+# test program for conversion and execution
+PROGRAM = b'10 PRINT "hello"\r\n20 SYSTEM\r\n'
+
+
+class ImportTimer(object):
+    """Record self and cumulative time of each module import."""
+
+    def __init__(self):
+        """Set up the timer."""
+        self.records = []
+        self._stack = []
+        self._import = __builtin__.__import__
+
+    def __enter__(self):
+        """Replace the import hook."""
+        __builtin__.__import__ = self._timed_import
+        return self
+
+    def __exit__(self, dummy_1, dummy_2, dummy_3):
+        """Restore the import hook."""
+        __builtin__.__import__ = self._import
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=None, level=-1):
+        """Import hook that times the import."""
+        before = set(sys.modules)
+        # time spent in nested imports
+        self._stack.append(0.)
+        index = len(self.records)
+        start = time.time()
+        try:
+            return self._import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.time() - start
+            nested = self._stack.pop()
+            loaded = [m for m in set(sys.modules) - before if sys.modules[m] is not None]
+            if loaded:
+                # name the record after the module that was asked for, if we can find it
+                wanted = [name] if name else list(fromlist or ())
+                matches = [
+                    m for m in loaded
+                    if any(m == w or m.endswith('.' + w) for w in wanted)
+                ]
+                label = min(matches or loaded, key=lambda m: (m.count('.'), len(m)))
+                self.records.insert(index, (len(self._stack), label, elapsed - nested, elapsed))
+                if self._stack:
+                    self._stack[-1] += elapsed
+
+    def report(self, stream):
+        """Write import times in -X importtime format."""
+        stream.write('import time: self [us] | cumulative | imported package\n')
+        for depth, label, own, total in self.records:
+            stream.write('import time: %9d | %10d | %s%s\n' % (
+                own*1e6, total*1e6, '  '*depth, label))
+
+    @property
+    def total(self):
+        """Total time spent in top-level imports."""
+        return sum(total for depth, _, _, total in self.records if depth == 0)
+
+
+def run_scenario(scenario, workdir):
+    """Run a one-shot PC-BASIC scenario."""
+    import pcbasic
+    if scenario == 'convert':
+        pcbasic.run(
+            os.path.join(workdir, 'PROG.BAS'), os.path.join(workdir, 'PROG.ASC'),
+            '--convert=A'
+        )
+    elif scenario == 'none':
+        pcbasic.run(os.path.join(workdir, 'PROG.BAS'), '--interface=none', '--quit')
+
+
+def child(scenario, workdir, verbose):
+    """Run and time a scenario in this process; report deferred modules loaded."""
+    # keep our own copy of stdout, PC-BASIC may close it
+    stdout = os.fdopen(os.dup(sys.stdout.fileno()), 'w')
+    with ImportTimer() as timer:
+        start = time.time()
+        run_scenario(scenario, workdir)
+        wall = time.time() - start
+    if verbose:
+        timer.report(sys.stderr)
+    loaded = sorted(
+        m for m in sys.modules if sys.modules[m] is not None
+        and any(m == d or m.startswith(d) for d in DEFERRED)
+    )
+    stdout.write('%f %f %s\n' % (timer.total, wall, ' '.join(loaded)))
+    stdout.close()
+
+
+def main(args):
+    """Run all scenarios in fresh interpreters and check results."""
+    verbose = '--verbose' in args
+    budget = None
+    for arg in args:
+        if arg.startswith('--budget='):
+            budget = float(arg.split('=', 1)[1])
+    workdir = tempfile.mkdtemp(prefix='pcbasic-importtime-')
+    failed = []
+    try:
+        with open(os.path.join(workdir, 'PROG.BAS'), 'wb') as f:
+            f.write(PROGRAM)
+        for scenario in SCENARIOS:
+            cmd = [sys.executable, os.path.abspath(__file__), '--child', scenario, workdir]
+            if verbose:
+                cmd.append('--verbose')
+            with open(os.devnull, 'r+b') as null:
+                output = subprocess.check_output(cmd, stdin=null)
+            fields = output.splitlines()[-1].split()
+            imports, wall, loaded = float(fields[0]), float(fields[1]), fields[2:]
+            print '%-8s imports %6.3fs   total %6.3fs' % (scenario, imports, wall)
+            if loaded:
+                print '    deferred modules loaded: %s' % ' '.join(loaded)
+                failed.append(scenario)
+            if budget is not None and imports > budget:
+                print '    import time exceeds budget of %.3fs' % (budget,)
+                failed.append(scenario)
+    finally:
+        shutil.rmtree(workdir)
+    if failed:
+        print 'FAILED: %s' % ' '.join(failed)
+        return 1
+    print 'passed.'
+    return 0
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--child']:
+        child(sys.argv[2], sys.argv[3], '--verbose' in sys.argv)
+    else:
+        sys.exit(main(sys.argv[1:]))
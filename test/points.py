@@ -0,0 +1,105 @@
+#!/usr/bin/env python2
+
+""" PC-BASIC batch POINT check
+Reads points through Session.get_points under viewports and logical windows
+and checks them against POINT, including points off the screen.
+
+(c) 2018 Rob Hagemans
+This file is released under the GNU GPL version 3 or later.
+"""
+
+import sys
+import os
+
+import numpy
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, '..'))
+
+import pcbasic
+from pcbasic.basic import BASICError
+from pcbasic.basic.base import error
+
+# diagonal stripes, so that neighbouring pixels differ in both directions
+STRIPES = b'SCREEN 1: FOR X = -199 TO 319: LINE (X, 0)-(X + 199, 199), (X + 200) MOD 4: NEXT'
+SETUPS = {
+    'physical': b'',
+    'view': b'VIEW (20, 10)-(299, 189)',
+    'view screen': b'VIEW SCREEN (20, 10)-(299, 189)',
+    'window': b'WINDOW (-1, -1)-(1, 1)',
+    'window screen': b'WINDOW SCREEN (0, 0)-(638, 398)',
+    'view+window': b'VIEW (20, 10)-(299, 189): WINDOW (-1, -1)-(1, 1)',
+    'view+window screen': b'VIEW (20, 10)-(299, 189): WINDOW SCREEN (-1, -1)-(1, 1)',
+}
+# physical bounds of the grid relative to the viewport, reaching past all screen edges
+GRID = -40, 360, -30, 230
+# grid points in each direction; not a divisor of the pixel size, to hit varying fractions
+STEPS = 61
+
+
+def grid(session):
+    """Logical coordinates on a grid covering the screen and beyond."""
+    drawing = session._impl.display.drawing
+    x0, x1, y0, y1 = GRID
+    xs, ys = [], []
+    for y in numpy.linspace(y0, y1, STEPS):
+        for x in numpy.linspace(x0, x1, STEPS):
+            fx, fy = drawing.get_window_logical(x, y)
+            xs.append(fx)
+            ys.append(fy)
+    return xs, ys
+
+
+def check(setup):
+    """Compare batch points with POINT; return whether they match, in both forms."""
+    with pcbasic.Session(input_streams=None, output_streams=None) as s:
+        s.execute(STRIPES)
+        s.execute(SETUPS[setup])
+        xs, ys = grid(s)
+        expected = []
+        for x, y in zip(xs, ys):
+            s.set_variable(b'X#', x)
+            s.set_variable(b'Y#', y)
+            expected.append(s.evaluate(b'POINT(X#, Y#)'))
+        points = s.get_points(xs, ys)
+        array = s.get_points(numpy.array(xs), numpy.array(ys), as_numpy=True)
+        return (
+            # off-screen points and all attributes occur
+            set(expected) == {-1, 0, 1, 2, 3}
+            and points == expected
+            and all(type(_p) == int for _p in points)
+            and isinstance(array, numpy.ndarray) and array.tolist() == expected
+        )
+
+
+def check_text_mode():
+    """Check that reading points in text mode raises Illegal function call, as POINT does."""
+    with pcbasic.Session(input_streams=None, output_streams=None) as s:
+        s.execute(b'SCREEN 0')
+        try:
+            s.get_points([0], [0])
+        except BASICError as e:
+            return e.err == error.IFC
+        return False
+
+
+def main():
+    failed = []
+    for setup in sorted(SETUPS):
+        ok = check(setup)
+        print '%-20s %s' % (setup, 'ok' if ok else 'FAILED')
+        if not ok:
+            failed.append(setup)
+    ok = check_text_mode()
+    print '%-20s %s' % ('text mode', 'ok' if ok else 'FAILED')
+    if not ok:
+        failed.append('text mode')
+    if failed:
+        print 'FAILED: %s' % ', '.join(failed)
+        return 1
+    print 'passed.'
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
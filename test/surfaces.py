@@ -0,0 +1,153 @@
+#!/usr/bin/env python2
+
+""" PC-BASIC interface surface check
+Runs the SDL2 and pygame interfaces through mode switches and window resizes
+and checks their screen pages against the interpreter's screen.
+
+(c) 2018 Rob Hagemans
+This file is released under the GNU GPL version 3 or later.
+"""
+
+import sys
+import os
+import time
+import ctypes
+import logging
+
+import numpy
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, '..'))
+
+# run without a display or sound device if none is set
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pcbasic
+from pcbasic import data
+from pcbasic.interface import Interface, InitFailed
+
+INTERFACES = ('sdl2', 'pygame')
+# pairs of statements to switch between
+SETUPS = {
+    'screen 0/9': ((b'SCREEN 0', b'SCREEN 9'), 'ega'),
+    'screen 7/9': ((b'SCREEN 7', b'SCREEN 9'), 'ega'),
+    'width 40/80': ((b'WIDTH 40', b'WIDTH 80'), 'cga'),
+}
+# times to switch back and forth
+ROUNDS = 3
+# initial window size; the dummy display has no size to fit to
+DIMENSIONS = 720, 400
+# border width, in per cent of the screen
+BORDER = 5
+# window sizes to resize to between switches
+WINDOW_SIZES = ((800, 600), (640, 480), (1024, 768))
+# put something on the screen after switching
+DRAW_TEXT = b'COLOR 7, 0: PRINT "hello"'
+DRAW_GRAPHICS = b'PRINT "hello": LINE (0, 20)-(99, 99), 1, BF: CIRCLE (150, 100), 40, 2'
+# time for the interface to draw what it has taken from the queue
+SETTLE = 0.2
+# EGA modes need a 14-pixel font
+FONTS = data.read_fonts(data.read_codepage(u'437'), [u'freedos'], warn=False)
+
+
+class ErrorCounter(logging.Handler):
+    """Count logged errors and warnings."""
+
+    def __init__(self):
+        logging.Handler.__init__(self, logging.WARNING)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record.getMessage())
+
+
+def get_page(plugin, pagenum, text_mode):
+    """Get the attributes on a screen page of the interface as [y][x]."""
+    if hasattr(plugin, 'pixels'):
+        # sdl2 draws text on its canvas and shows graphics from the interpreter's pixels
+        # through the work surface; its pixels are [x][y]
+        return numpy.array(plugin.pixels[pagenum] if text_mode else plugin._work_pixels).T
+    import pygame
+    return pygame.surfarray.array2d(plugin.canvas[pagenum]).T
+
+
+def resize(name, width, height):
+    """Ask the interface to resize its window, as if by the user."""
+    if name == 'sdl2':
+        import sdl2
+        event = sdl2.SDL_Event()
+        event.type = sdl2.SDL_WINDOWEVENT
+        event.window.event = sdl2.SDL_WINDOWEVENT_RESIZED
+        event.window.data1, event.window.data2 = width, height
+        sdl2.SDL_PushEvent(ctypes.byref(event))
+    else:
+        import pygame
+        pygame.event.post(pygame.event.Event(
+            pygame.VIDEORESIZE, size=(width, height), w=width, h=height
+        ))
+
+
+def check_page(session, plugin):
+    """Check the visible page of the interface against the interpreter."""
+    display = session._impl.display
+    page = get_page(plugin, display.vpagenum, display.mode.is_text_mode)
+    if page.shape != (display.mode.pixel_height, display.mode.pixel_width):
+        return False
+    if display.mode.is_text_mode:
+        # text on the first row only, nothing left of the previous mode below it
+        return page[:display.mode.font_height].any() and not page[display.mode.font_height:].any()
+    return (page == display.pixels.pages[display.vpagenum].buffer.astype(numpy.uint8)).all()
+
+
+def run(name, statements, video):
+    """Switch modes and resize the window; return number of mismatches and log messages."""
+    result = {'mismatches': 0}
+    counter = ErrorCounter()
+    def target(interface, guard):
+        plugin = interface._video
+        # ignore messages on starting up, such as those about the clipboard
+        logging.getLogger().addHandler(counter)
+        with pcbasic.Session(
+                interface, video=video, font=FONTS, input_streams=None, output_streams=None
+            ) as s:
+            for i in range(2 * ROUNDS):
+                s.execute(statements[i % 2])
+                s.execute(DRAW_TEXT if s._impl.display.mode.is_text_mode else DRAW_GRAPHICS)
+                interface._video_queue.join()
+                time.sleep(SETTLE)
+                if not check_page(s, plugin):
+                    result['mismatches'] += 1
+                resize(name, *WINDOW_SIZES[i % len(WINDOW_SIZES)])
+                time.sleep(SETTLE)
+    try:
+        Interface(try_interfaces=(name,), dimensions=DIMENSIONS, border_width=BORDER).launch(target)
+    finally:
+        logging.getLogger().removeHandler(counter)
+    return result['mismatches'], counter.records
+
+
+def main():
+    failed = []
+    for name in INTERFACES:
+        for setup, (statements, video) in sorted(SETUPS.iteritems()):
+            try:
+                mismatches, messages = run(name, statements, video)
+            except InitFailed:
+                print '%-7s %-12s skipped: interface not available' % (name, setup)
+                break
+            ok = not mismatches and not messages
+            print '%-7s %-12s %s' % (name, setup, 'ok' if ok else 'FAILED')
+            for message in messages:
+                print '    %s' % (message,)
+            if not ok:
+                failed.append('%s %s' % (name, setup))
+    if failed:
+        print 'FAILED: %s' % ', '.join(failed)
+        return 1
+    print 'passed.'
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
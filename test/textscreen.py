@@ -0,0 +1,88 @@
+#!/usr/bin/env python2
+
+""" PC-BASIC text screen check
+Writes known characters and attributes to the screen and checks the rows
+returned by Session.get_text_screen, as lists and as NumPy arrays.
+
+(c) 2018 Rob Hagemans
+This file is released under the GNU GPL version 3 or later.
+"""
+
+import sys
+import os
+
+import numpy
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, '..'))
+
+import pcbasic
+
+# fill rows 1 to 24 with one character each, in letters and in the upper half of the codepage,
+# and one colour each, blinking for foreground colours of 16 and over
+FILL = (
+    b'10 KEY OFF: CLS: FOR I = 1 TO 24: LOCATE I, 1: COLOR I MOD 32, I MOD 8\n'
+    b'20 C = 64 + I: IF I MOD 2 = 0 THEN C = 160 + I\n'
+    b'30 PRINT STRING$(%d, C);: NEXT: COLOR 7, 0\n'
+)
+SETUPS = {
+    'width 80': (b'WIDTH 80', 80),
+    'width 40': (b'WIDTH 40', 40),
+    # write to another page than the visible one after filling it
+    'visible page': (b'SCREEN 0, , 0, 0', 80),
+}
+OTHER_PAGE = b'SCREEN 0, , 1, 0: CLS: PRINT "not on the visible page"'
+
+
+def expected_rows(width):
+    """Rows of characters and attributes the fill program puts on the screen."""
+    chars, attrs = [], []
+    for row in range(1, 25):
+        char = 160 + row if row % 2 == 0 else 64 + row
+        fore, back = row % 32, row % 8
+        attr = (fore & 0x10) << 3 | back << 4 | fore & 0xf
+        chars.append(chr(char) * width)
+        attrs.append([attr] * width)
+    # the key line is off and blank
+    chars.append(b' ' * width)
+    attrs.append([7] * width)
+    return chars, attrs
+
+
+def check(setup):
+    """Fill the screen; return whether both forms of the rows are as expected."""
+    statement, width = SETUPS[setup]
+    with pcbasic.Session(input_streams=None, output_streams=None) as s:
+        s.execute(statement)
+        s.execute(FILL % width + b'RUN')
+        if setup == 'visible page':
+            s.execute(OTHER_PAGE)
+        chars, attrs = s.get_text_screen()
+        array_chars, array_attrs = s.get_text_screen(as_numpy=True)
+    expected_chars, expected_attrs = expected_rows(width)
+    return (
+        chars == expected_chars and attrs == expected_attrs
+        and all(type(_row) == bytes for _row in chars)
+        and array_chars.dtype == array_attrs.dtype == numpy.uint8
+        and array_chars.shape == array_attrs.shape == (25, width)
+        and array_chars.tolist() == [list(bytearray(_row)) for _row in expected_chars]
+        and array_attrs.tolist() == expected_attrs
+    )
+
+
+def main():
+    failed = []
+    for setup in sorted(SETUPS):
+        ok = check(setup)
+        print '%-14s %s' % (setup, 'ok' if ok else 'FAILED')
+        if not ok:
+            failed.append(setup)
+    if failed:
+        print 'FAILED: %s' % ', '.join(failed)
+        return 1
+    print 'passed.'
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())